@@ -0,0 +1,303 @@
+"""
+Opening-guess analysis over a whole dictionary.
+
+Every word is evaluated as the first guess against every word as the
+answer. Partition statistics (expected candidates left, bucket count,
+largest bucket) come from vectorized feedback blocks; the average and
+worst solve depth come from playing out the current letter-frequency
+strategy after the opener::
+
+    python analysis.py openers --top 25
+    python analysis.py openers --workers 16 --csv openers.csv
+    python analysis.py openers --openers crane slate arose --no-depth
+
+The strategy picks the highest-scoring remaining candidate, which depends
+only on the candidate set, so the solve tree below a set is computed once
+and cached by its contents; the many small buckets different openers share
+are never re-solved. Candidates are narrowed by exact feedback, i.e. what a
+perfect filter keeps.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from solver import (
+    DEFAULT_LENGTH,
+    LetterFrequencyAnalyzer,
+    WordIndex,
+    dictionary_path,
+    feedback_matrix,
+    load_words,
+    score_feedback,
+    solved_code,
+)
+
+BLOCK_SIZE = 64
+VECTOR_MIN = 64  # buckets at least this large are partitioned with numpy
+MAX_ATTEMPTS = 6
+# Entries each per-process cache may hold before it is dropped and refilled
+# (roughly 250 bytes per solve tree and 100 bytes per feedback score)
+TREE_CACHE_LIMIT = 2_000_000
+SCORE_CACHE_LIMIT = 5_000_000
+
+COLUMNS = ("word", "expected", "buckets", "largest", "avg_depth", "worst_depth", "failures")
+SORT_KEYS = {
+    "expected": lambda r: (r["expected"], -r["buckets"]),
+    "buckets": lambda r: (-r["buckets"], r["expected"]),
+    "largest": lambda r: (r["largest"], r["expected"]),
+    "depth": lambda r: (r["avg_depth"], r["worst_depth"], r["expected"]),
+    "worst": lambda r: (r["worst_depth"], r["avg_depth"], r["expected"]),
+}
+
+# Per-process state, set by _init_worker
+_index = None
+_rank = None
+_rank_of = None
+_win = None
+_trees = {}
+_scores = {}
+
+
+def strategy_rank(words, analyzer):
+    """
+    Position of every word in the letter-frequency strategy's preference order.
+
+    The strategy plays the lowest-ranked remaining candidate, exactly as
+    LetterFrequencyAnalyzer.suggest_best_words(top_n=1) does on a candidate
+    list in dictionary order (ties go to the earlier word).
+    """
+    frequency = analyzer.frequencies.get
+    scores = [sum(frequency(ch, 0) for ch in set(w)) for w in words]
+    order = sorted(range(len(words)), key=lambda i: (-scores[i], i))
+    rank = np.empty(len(words), dtype=np.int64)
+    rank[order] = np.arange(len(words))
+    return rank
+
+
+def _init_worker(path, length):
+    global _index, _rank, _rank_of, _win
+    words = load_words(length, path)
+    analyzer = LetterFrequencyAnalyzer(path)
+    analyzer.analyze()
+    _index = WordIndex(words)
+    _rank = strategy_rank(words, analyzer)
+    _rank_of = _rank.tolist().__getitem__
+    _win = solved_code(length)
+    _trees.clear()
+    _scores.clear()
+
+
+def _split(guess, positions):
+    """
+    Partition sorted word ``positions`` by the feedback ``guess`` gets.
+
+    Large sets are numpy arrays split with one vectorized feedback row;
+    small ones are tuples scored in Python, with every (guess, answer)
+    score cached because the same small buckets recur under many openers.
+    """
+    if len(positions) >= VECTOR_MIN:
+        row = _index.letter_matrix[guess][None, :]
+        codes = feedback_matrix(row, _index.letter_matrix[positions])[0]
+        return _buckets(codes, positions)
+    words = _index.words
+    word = words[guess]
+    base = guess * len(words)
+    groups = {}
+    for p in positions:
+        code = _scores.get(base + p)
+        if code is None:
+            code = _scores[base + p] = score_feedback(word, words[p])
+        groups.setdefault(code, []).append(p)
+    return {code: tuple(group) for code, group in groups.items()}
+
+
+def _buckets(codes, positions):
+    order = np.argsort(codes, kind="stable")
+    codes, positions = codes[order], positions[order]
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    starts = [0] + bounds.tolist()
+    return {
+        int(codes[s]): chunk if len(chunk) >= VECTOR_MIN else tuple(chunk.tolist())
+        for s, chunk in zip(starts, np.split(positions, bounds))
+    }
+
+
+def solve_tree(positions):
+    """
+    Play the strategy against every answer in ``positions`` (a sorted tuple
+    or, for large sets, a numpy array of word positions).
+
+    Returns:
+        tuple[int, ...]: How many answers need 1, 2, 3, ... more guesses.
+    """
+    n = len(positions)
+    if n == 1:
+        return (1,)
+    if n == 2:
+        return (1, 1)  # the preferred word wins at once; the other is known after it
+    key = positions if type(positions) is tuple else positions.tobytes()
+    cached = _trees.get(key)
+    if cached is not None:
+        return cached
+    if type(positions) is tuple:
+        guess = min(positions, key=_rank_of)
+    else:
+        guess = int(positions[np.argmin(_rank[positions])])
+    result = _merge(_split(guess, positions))
+    _trees[key] = result
+    return result
+
+
+def _merge(buckets):
+    """Depth histogram one guess above the subtrees of ``buckets``."""
+    histogram = [0]
+    for code, bucket in buckets.items():
+        if code == _win:
+            histogram[0] += 1
+            continue
+        sub = solve_tree(bucket)
+        if len(sub) >= len(histogram):
+            histogram += [0] * (len(sub) + 1 - len(histogram))
+        for d, count in enumerate(sub, 1):
+            histogram[d] += count
+    return tuple(histogram)
+
+
+def _analyze_block(openers, depth):
+    all_positions = np.arange(len(_index), dtype=np.int64)
+    matrix = _index.letter_matrix
+    codes = feedback_matrix(matrix[openers], matrix)
+    n = len(_index)
+    rows = []
+    for opener, row in zip(openers, codes):
+        if len(_trees) > TREE_CACHE_LIMIT:
+            _trees.clear()
+        if len(_scores) > SCORE_CACHE_LIMIT:
+            _scores.clear()
+        counts = np.bincount(row, minlength=3**_index.length)
+        counts = counts[counts > 0]
+        result = {
+            "word": _index.words[opener],
+            "expected": float((counts.astype(np.float64) ** 2).sum() / n),
+            "buckets": int(len(counts)),
+            "largest": int(counts.max()),
+        }
+        if depth:
+            histogram = _merge(_buckets(row, all_positions))
+            result.update(
+                avg_depth=sum(d * c for d, c in enumerate(histogram, 1)) / n,
+                worst_depth=len(histogram),
+                failures=sum(histogram[MAX_ATTEMPTS:]),
+            )
+        rows.append(result)
+    return rows
+
+
+def analyze_openers(path=None, length=DEFAULT_LENGTH, openers=None, depth=True, workers=None, progress=None):
+    """
+    Evaluate first guesses against every answer in the dictionary.
+
+    Parameters:
+        path (str, optional): Dictionary file (default: the bundled list).
+        openers (list[str], optional): Words to evaluate (default: all).
+        depth (bool): Also simulate the strategy for average/worst depth.
+        workers (int, optional): Processes (default: CPU count).
+        progress (callable, optional): Called with (done, total) openers.
+
+    Returns:
+        list[dict]: One row per opener with the keys in COLUMNS (the depth
+        columns only when ``depth`` is set).
+    """
+    path = path or dictionary_path(length)
+    words = load_words(length, path)
+    position = {w: i for i, w in enumerate(words)}
+    if openers is None:
+        selected = list(range(len(words)))
+    else:
+        missing = [w for w in openers if w not in position]
+        if missing:
+            raise ValueError(f"Not in the dictionary: {', '.join(missing)}")
+        selected = [position[w] for w in openers]
+    # Interleave blocks so every worker gets a mix of strong and weak openers
+    blocks = [selected[i :: max(1, len(selected) // BLOCK_SIZE)] for i in range(max(1, len(selected) // BLOCK_SIZE))]
+    blocks = [b for b in blocks if b]
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    rows = []
+    if workers == 1 or len(blocks) == 1:
+        _init_worker(path, length)
+        for block in blocks:
+            rows += _analyze_block(block, depth)
+            if progress:
+                progress(len(rows), len(selected))
+        return rows
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path, length)) as pool:
+        for part in pool.map(_analyze_block, blocks, [depth] * len(blocks)):
+            rows += part
+            if progress:
+                progress(len(rows), len(selected))
+    return rows
+
+
+def print_rows(rows, top):
+    depth = "avg_depth" in rows[0]
+    header = f"{'rank':>4}  {'word':<8} {'expected':>9} {'buckets':>8} {'largest':>8}"
+    if depth:
+        header += f" {'avg depth':>10} {'worst':>6} {'> ' + str(MAX_ATTEMPTS):>5}"
+    print(header)
+    for n, r in enumerate(rows[:top], 1):
+        line = f"{n:>4}  {r['word']:<8} {r['expected']:>9.2f} {r['buckets']:>8} {r['largest']:>8}"
+        if depth:
+            line += f" {r['avg_depth']:>10.4f} {r['worst_depth']:>6} {r['failures']:>5}"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze opening guesses over the dictionary.")
+    parser.add_argument("--words", help="dictionary file (default: bundled list for --length)")
+    parser.add_argument("--length", type=int, default=DEFAULT_LENGTH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("openers", help="rank every word as a first guess")
+    p.add_argument("--openers", nargs="+", metavar="WORD", help="only evaluate these words")
+    p.add_argument("--sort", choices=sorted(SORT_KEYS), default=None, help="ranking column (default: depth)")
+    p.add_argument("--top", type=int, default=20, help="rows to print")
+    p.add_argument("--csv", metavar="PATH", help="write every row to a CSV file")
+    p.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    p.add_argument("--no-depth", action="store_true", help="partition statistics only (much faster)")
+
+    args = parser.parse_args(argv)
+    sort = args.sort or ("expected" if args.no_depth else "depth")
+    if sort in ("depth", "worst") and args.no_depth:
+        parser.error(f"--sort {sort} needs the depth simulation")
+    start = time.perf_counter()
+
+    def progress(done, total):
+        print(f"\r{done}/{total} openers, {time.perf_counter() - start:.0f} s", end="", file=sys.stderr, flush=True)
+
+    try:
+        rows = analyze_openers(
+            args.words, args.length, args.openers, depth=not args.no_depth, workers=args.workers, progress=progress
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    print(file=sys.stderr)
+    rows.sort(key=SORT_KEYS[sort])
+    print_rows(rows, args.top)
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=[c for c in COLUMNS if c in rows[0]])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Wrote {len(rows)} rows to {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
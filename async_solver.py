@@ -0,0 +1,206 @@
+"""
+asyncio API for advancing many games at once.
+
+Each game is a coroutine that awaits its feedback source (a browser, a
+remote service, a simulator). Whenever games ask for their next guess, the
+GuessScheduler collects every request made during the same event-loop tick
+(or while the previous batch was computing) and evaluates them together on a
+worker thread against one shared WordIndex:
+
+- games in the same state share one guess computation, and
+- games that played the same guess from the same state share one feedback
+  partition, which yields every game's new candidate set at once.
+
+Example::
+
+    scheduler = GuessScheduler()
+    results = asyncio.run(run_games(scheduler, [offline_feedback(a) for a in answers]))
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+
+from solver import (
+    DEFAULT_LENGTH,
+    LetterFrequencyAnalyzer,
+    choose_guess,
+    dictionary_path,
+    load_index,
+    score_feedback,
+    solved_code,
+)
+
+logger = logging.getLogger(__name__)
+
+# Guesses remembered per scheduler; one entry per distinct candidate set seen
+GUESS_CACHE_SIZE = 4096
+
+
+class GuessScheduler:
+    """
+    Batches next-guess and narrowing requests from concurrent games.
+
+    A batch is computed on a worker thread (``loop.run_in_executor``), so the
+    event loop keeps serving feedback while a slow guess is chosen; requests
+    made meanwhile are collected into the next batch.
+
+    Parameters:
+        length (int): Word length of every game handled by this scheduler.
+        search (LookaheadSearch, optional): Strategy to use instead of the
+            letter-frequency heuristic.
+        path (str, optional): Dictionary file for the index and the analyzer
+            (default: the bundled list for ``length``).
+        cache_size (int): Number of guesses kept, least recently used first out.
+    """
+
+    def __init__(self, length=DEFAULT_LENGTH, search=None, path=None, cache_size=GUESS_CACHE_SIZE):
+        self.length = length
+        self.index = search.index if search else load_index(length, path=path)
+        self.analyzer = LetterFrequencyAnalyzer(path or dictionary_path(length))
+        self.analyzer.analyze()
+        self.search = search
+        self.cache_size = cache_size
+        self.batches = 0
+        self.requests = 0
+        self._guesses = OrderedDict()  # candidate mask -> guess; only touched by the running batch
+        self._pending_guesses = []
+        self._pending_narrow = []
+        self._flush_scheduled = False
+        self._running = False
+
+    def _schedule(self):
+        if not self._flush_scheduled and not self._running:
+            self._flush_scheduled = True
+            # call_soon runs after every coroutine already woken this tick,
+            # so all of their requests end up in the same batch
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    async def next_guess(self, mask):
+        """Return the next guess for a game whose candidates are ``mask``."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending_guesses.append((mask, future))
+        self._schedule()
+        return await future
+
+    async def narrow(self, mask, guess, code):
+        """Return ``mask`` narrowed by the feedback ``code`` received for ``guess``."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending_narrow.append((mask, guess, code, future))
+        self._schedule()
+        return await future
+
+    def _flush(self):
+        self._flush_scheduled = False
+        guesses, self._pending_guesses = self._pending_guesses, []
+        narrows, self._pending_narrow = self._pending_narrow, []
+        self.batches += 1
+        self.requests += len(guesses) + len(narrows)
+        self._running = True
+        batch = asyncio.get_running_loop().run_in_executor(
+            None, self._compute, [n[:3] for n in narrows], [mask for mask, _ in guesses]
+        )
+        futures = [n[3] for n in narrows] + [future for _, future in guesses]
+        batch.add_done_callback(lambda done: self._finish(futures, done))
+
+    def _finish(self, futures, batch):
+        """Resolve the futures of a finished batch and start the next one (event loop)."""
+        self._running = False
+        try:
+            outcomes = batch.result()
+        except BaseException as e:  # the executor itself failed (e.g. shut down)
+            outcomes = [(None, e)] * len(futures)
+        for future, (result, exception) in zip(futures, outcomes):
+            _resolve(future, result, exception)
+        if self._pending_guesses or self._pending_narrow:
+            self._schedule()
+
+    def _compute(self, narrows, guesses):
+        """
+        Evaluate one batch (worker thread).
+
+        Returns a (result, exception) pair per request, narrowing requests
+        first. A failing computation fails only the games waiting on it;
+        every future is resolved one way or the other, so no game hangs.
+        """
+        index = self.index
+        outcomes = []
+        partitions = {}
+        for mask, guess, code in narrows:
+            key = (mask, guess)
+            try:
+                if key not in partitions:
+                    partitions[key] = index.partition_masks(mask, guess)
+                outcomes.append((partitions[key].get(code, 0), None))
+            except Exception as e:
+                logger.exception("Failed to narrow by %r", guess)
+                outcomes.append((None, e))
+
+        cache = self._guesses
+        for mask in guesses:
+            try:
+                if mask in cache:
+                    cache.move_to_end(mask)
+                else:
+                    candidates = index.words_of(mask)
+                    cache[mask] = choose_guess(candidates, self.analyzer, self.search) if candidates else None
+                    if len(cache) > self.cache_size:
+                        cache.popitem(last=False)
+                outcomes.append((cache[mask], None))
+            except Exception as e:
+                logger.exception("Failed to choose a guess")
+                outcomes.append((None, e))
+        return outcomes
+
+
+def _resolve(future, result=None, exception=None):
+    if future.done():  # cancelled while waiting
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+async def play(scheduler, feedback, max_attempts=6):
+    """
+    Play one game, awaiting ``feedback`` after every guess.
+
+    Parameters:
+        scheduler (GuessScheduler): Shared scheduler.
+        feedback (callable): ``async feedback(guess) -> int`` returning the
+            feedback code for the guess.
+        max_attempts (int): Guess limit.
+
+    Returns:
+        tuple[list[str], bool]: The guesses played and whether the game was won.
+    """
+    index = scheduler.index
+    win = solved_code(scheduler.length)
+    mask = index.full_mask
+    guesses = []
+    for _ in range(max_attempts):
+        guess = await scheduler.next_guess(mask)
+        if guess is None:
+            break
+        guesses.append(guess)
+        code = await feedback(guess)
+        if code == win:
+            return guesses, True
+        mask = await scheduler.narrow(mask, guess, code)
+    return guesses, False
+
+
+def offline_feedback(answer, delay=0.0):
+    """Feedback source that scores guesses against a known answer."""
+
+    async def feedback(guess):
+        await asyncio.sleep(delay)
+        return score_feedback(guess, answer)
+
+    return feedback
+
+
+async def run_games(scheduler, feedbacks, max_attempts=6):
+    """Play one game per feedback source concurrently; returns play() results in order."""
+    return await asyncio.gather(*(play(scheduler, f, max_attempts) for f in feedbacks))
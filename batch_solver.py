@@ -0,0 +1,291 @@
+"""
+Solve several Wordle pages concurrently (archive days, practice boards).
+
+Each worker thread owns one browser from a small driver pool and plays one
+puzzle at a time; all workers share a single WordIndex, solver and
+analyzer, so the solver data is loaded once. Every puzzle has its own
+deadline, and a failing puzzle only costs its own driver, which is replaced
+before the worker's next puzzle::
+
+    python batch_solver.py URL [URL ...] --workers 3 --timeout 60
+    python batch_solver.py --mock 12 --workers 4    # against mock_site.py
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from browser import (
+    PLAY_BUTTON_XPATH,
+    Cancelled,
+    CancelToken,
+    block_urls,
+    chrome_options,
+    install_overlay_watcher,
+    read_board,
+)
+from solver import (
+    DEFAULT_LENGTH,
+    GameState,
+    LetterFrequencyAnalyzer,
+    WordleSolver,
+    choose_guess,
+    dictionary_path,
+    load_index,
+)
+
+
+class PuzzleTimeout(Exception):
+    """Raised when a puzzle runs past its deadline."""
+
+
+@dataclass(slots=True)
+class PuzzleResult:
+    url: str
+    solved: bool = False
+    guesses: list = field(default_factory=list)
+    resumed_rows: int = 0
+    error: str = None
+    elapsed: float = 0.0
+
+
+def _check(deadline, token):
+    token.check()
+    if time.monotonic() > deadline:
+        raise PuzzleTimeout("puzzle timed out")
+
+
+def _wait_for(driver, deadline, predicate, token):
+    """Poll ``predicate(driver)`` until it returns a truthy value, the deadline passes or ``token`` is cancelled."""
+    while True:
+        value = predicate(driver)
+        if value:
+            return value
+        _check(deadline, token)
+        token.sleep(token.poll_interval)
+
+
+def play_page(driver, url, solver, analyzer, timeout=60.0, max_attempts=6, token=None):
+    """
+    Open ``url`` in ``driver`` and play the puzzle to the end.
+
+    Rows already on the board are kept and the game continues after them.
+
+    Parameters:
+        token (CancelToken, optional): Ends the game early (``error`` "cancelled").
+
+    Returns:
+        PuzzleResult: Outcome; ``error`` is set instead of raising.
+    """
+    token = token or CancelToken()
+    start = time.monotonic()
+    deadline = start + timeout
+    result = PuzzleResult(url)
+    length = solver.length
+    try:
+        # A pooled driver keeps this setting, so it must not outlive the puzzle's deadline
+        driver.set_page_load_timeout(max(deadline - time.monotonic(), 0.001))
+        driver.get(url)
+        play = _wait_for(driver, deadline, lambda d: d.find_elements(By.XPATH, PLAY_BUTTON_XPATH), token)
+        driver.execute_script("arguments[0].click();", play[0])
+
+        played = read_board(driver, length)
+        result.resumed_rows = len(played)
+        state = GameState(length)
+        candidates = solver.words
+        for guess, states in played:
+            result.guesses.append(guess)
+            if all(s == "correct" for s in states):
+                result.solved = True
+                return result
+            state.update([{"letter": l, "state": s} for l, s in zip(guess, states)])
+            candidates = solver.candidates_for(state)
+
+        body = driver.find_element(By.TAG_NAME, "body")
+        body.send_keys(Keys.BACKSPACE * length)
+        for attempt in range(len(played), max_attempts):
+            _check(deadline, token)
+            guess = choose_guess(candidates, analyzer)
+            if not guess:
+                result.error = "no candidates left"
+                return result
+            body.send_keys(guess + Keys.ENTER)
+            result.guesses.append(guess)
+
+            def revealed(d):
+                rows = read_board(d, length)
+                return rows if len(rows) > attempt else None
+
+            states = _wait_for(driver, deadline, revealed, token)[attempt][1]
+            if all(s == "correct" for s in states):
+                result.solved = True
+                return result
+            state.update([{"letter": l, "state": s} for l, s in zip(guess, states)])
+            candidates = solver.candidates_for(state)
+        return result
+    except Cancelled:
+        result.error = "cancelled"
+        return result
+    except Exception as e:
+        result.error = str(e).splitlines()[0] if str(e) else type(e).__name__
+        return result
+    finally:
+        result.elapsed = time.monotonic() - start
+
+
+class DriverPool:
+    """
+    One lazily started browser per worker thread.
+
+    Parameters:
+        driver_path (str, optional): chromedriver to use (default: Selenium Manager).
+        headless (bool): Run the browsers without windows.
+        lean (bool): Use the lean profile with ad/tracker blocking.
+    """
+
+    def __init__(self, driver_path=None, headless=True, lean=True):
+        self.driver_path = driver_path
+        self.headless = headless
+        self.lean = lean
+        self._local = threading.local()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def _start(self):
+        options = chrome_options(lean=self.lean, headless=self.headless)
+        service = Service(self.driver_path) if self.driver_path else None
+        driver = webdriver.Chrome(service=service, options=options)
+        if self.lean:
+            block_urls(driver)
+        install_overlay_watcher(driver)
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def get(self):
+        """This thread's driver, started on first use."""
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            driver = self._local.driver = self._start()
+        return driver
+
+    def discard(self):
+        """Quit this thread's driver; the next get() starts a fresh one."""
+        driver = getattr(self._local, "driver", None)
+        self._local.driver = None
+        if driver is not None:
+            with self._lock:
+                self._drivers.remove(driver)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def close(self):
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+def solve_many(urls, pool, workers=2, timeout=60.0, length=DEFAULT_LENGTH, on_result=None, token=None):
+    """
+    Play every URL with ``workers`` concurrent browsers.
+
+    Parameters:
+        urls (list[str]): Puzzle pages.
+        pool (DriverPool): Source of per-worker drivers.
+        timeout (float): Seconds allowed per puzzle.
+        on_result (callable, optional): Called with each PuzzleResult as it finishes.
+        token (CancelToken, optional): Cancels the batch; puzzles not yet
+            finished report ``error`` "cancelled".
+
+    Returns:
+        list[PuzzleResult]: One result per URL, in input order.
+    """
+    index = load_index(length)
+    solver = WordleSolver(index.words, index=index)
+    index.warm()  # build the shared bitsets once, before the workers start
+    analyzer = LetterFrequencyAnalyzer(dictionary_path(length))
+    analyzer.analyze()
+
+    token = token or CancelToken()
+
+    def run(url):
+        if token.cancelled:
+            result = PuzzleResult(url, error="cancelled")
+        else:
+            try:
+                driver = pool.get()
+            except Exception as e:
+                result = PuzzleResult(url, error=f"could not start browser: {e}")
+            else:
+                result = play_page(driver, url, solver, analyzer, timeout=timeout, token=token)
+                if result.error:
+                    pool.discard()  # the page or session may be in any state now
+        if on_result:
+            on_result(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="puzzle") as executor:
+        try:
+            return list(executor.map(run, urls))
+        except BaseException:
+            token.cancel()  # e.g. Ctrl+C: end the running games before the pool shuts down
+            raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve several Wordle pages concurrently.")
+    parser.add_argument("urls", nargs="*", help="puzzle pages")
+    parser.add_argument("--mock", type=int, metavar="N", help="solve N random puzzles on a local mock site")
+    parser.add_argument("--workers", type=int, default=2, help="concurrent browsers")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds per puzzle")
+    parser.add_argument("--driver", help="chromedriver path (default: Selenium Manager)")
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    server = None
+    urls = list(args.urls)
+    if args.mock:
+        import mock_site
+
+        server, base_url = mock_site.start_in_background(third_party_delay=0.2)
+        answers = random.Random(args.seed).sample(load_index().words, args.mock)
+        urls += [mock_site.page_url(base_url, answer, reveal_ms=150) for answer in answers]
+    if not urls:
+        parser.error("give puzzle URLs or --mock N")
+
+    def report(result):
+        status = "solved" if result.solved else f"FAILED ({result.error})" if result.error else "lost"
+        print(f"{status:>8} in {len(result.guesses)} guesses, {result.elapsed:5.1f} s  {result.url}")
+
+    pool = DriverPool(args.driver, headless=not args.headed)
+    start = time.perf_counter()
+    try:
+        results = solve_many(urls, pool, workers=args.workers, timeout=args.timeout, on_result=report)
+    finally:
+        pool.close()
+        if server:
+            server.shutdown()
+    elapsed = time.perf_counter() - start
+    solved = sum(r.solved for r in results)
+    print(f"{solved}/{len(results)} solved in {elapsed:.1f} s with {args.workers} workers")
+    return 0 if all(not r.error for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
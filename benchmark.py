@@ -0,0 +1,668 @@
+"""
+Offline benchmarks for the solver core.
+
+Run ``python benchmark.py <command> --help`` for the options of each command.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from solver import (
+    FILTER_BACKENDS,
+    SUPPORTED_LENGTHS,
+    FilterConstraints,
+    GameState,
+    GuessScorer,
+    LetterFrequencyAnalyzer,
+    LookaheadSearch,
+    MultiBoardSolver,
+    WordIndex,
+    WordleSolver,
+    auto_filter_backend,
+    dictionary_path,
+    load_index,
+    load_words,
+    percentile,
+    play_game,
+    score_feedback,
+    states_from_feedback,
+    states_to_string,
+)
+
+
+def feedback_rows(answer, guesses):
+    """Build service-style feedback rows for ``guesses`` against ``answer``."""
+    return [
+        {"guess": g, "feedback": states_to_string(states_from_feedback(score_feedback(g, answer), len(g)))}
+        for g in guesses
+    ]
+
+
+def bench_multiboard(args):
+    """Play random multi-board games and report per-move latency."""
+    index = load_index(path=args.words)
+    rng = random.Random(args.seed)
+    move_times = []
+    guesses_used = []
+
+    for _ in range(args.games):
+        answers = rng.sample(index.words, args.boards)
+        solver = MultiBoardSolver(index, boards=args.boards)
+        guesses = 0
+        while not all(solver.solved) and guesses < args.max_guesses:
+            start = time.perf_counter()
+            guess = solver.suggest()
+            if guess is None:
+                break
+            solver.apply_feedback(guess, [score_feedback(guess, a) for a in answers])
+            move_times.append(time.perf_counter() - start)
+            guesses += 1
+        guesses_used.append(guesses if all(solver.solved) else None)
+
+    solved = [g for g in guesses_used if g is not None]
+    print(f"boards={args.boards} games={args.games} solved={len(solved)}")
+    if solved:
+        print(f"guesses: avg {sum(solved) / len(solved):.2f}, max {max(solved)}")
+    print(
+        f"move latency: p50 {percentile(move_times, 50) * 1e3:.1f} ms, "
+        f"p95 {percentile(move_times, 95) * 1e3:.1f} ms, max {max(move_times) * 1e3:.1f} ms"
+    )
+
+
+def bench_simulate(args):
+    """Simulate full games with the GUI strategy for each requested word length."""
+    for length in args.lengths:
+        custom = args.words if length == 5 else None
+        path = custom or dictionary_path(length)
+        if not os.path.exists(path):
+            print(f"length={length}: skipped (no dictionary at {path})")
+            continue
+
+        start = time.perf_counter()
+        index = load_index(length, custom)
+        load_time = time.perf_counter() - start
+
+        analyzer = LetterFrequencyAnalyzer(path)
+        analyzer.analyze()
+        solver = WordleSolver(index.words, index=index)
+        search = None
+        if args.lookahead:
+            search = LookaheadSearch(index, objective=args.objective, time_budget=args.time_budget)
+
+        rng = random.Random(args.seed)
+        answers = rng.sample(index.words, min(args.games, len(index.words)))
+        game_times = []
+        results = []
+        for answer in answers:
+            start = time.perf_counter()
+            guesses = play_game(
+                answer, solver, analyzer, max_attempts=args.max_attempts, search=search, hard_mode=args.hard
+            )
+            game_times.append(time.perf_counter() - start)
+            results.append(len(guesses) if guesses and guesses[-1] == answer else None)
+
+        won = [r for r in results if r is not None]
+        avg = sum(won) / len(won) if won else 0.0
+        print(
+            f"length={length}: words={len(index)} load={load_time * 1e3:.0f} ms "
+            f"games={len(results)} won={len(won)} avg_guesses={avg:.2f} max_guesses={max(won, default=0)} "
+            f"game p50={percentile(game_times, 50) * 1e3:.1f} ms p95={percentile(game_times, 95) * 1e3:.1f} ms"
+        )
+
+
+def bench_scoring(args):
+    """Time full guess scoring (all guesses x sampled candidates) serial vs parallel."""
+    index = load_index(path=args.words)
+    rng = random.Random(args.seed)
+    guesses = list(range(len(index)))[: args.guesses]
+    candidates = sorted(rng.sample(range(len(index)), min(args.candidates, len(index))))
+    cells = len(guesses) * len(candidates)
+    print(f"guesses={len(guesses)} candidates={len(candidates)} cells={cells}")
+
+    runs = [("serial", 1), (f"parallel x{args.workers}", args.workers)]
+    if args.python:
+        runs.insert(0, ("pure python", None))
+    reference = None
+    for label, workers in runs:
+        scorer = GuessScorer(index, workers=workers or 1, threshold=0)
+        start = time.perf_counter()
+        if workers is None:
+            top = scorer._top_python(guesses, candidates, args.top)
+        else:
+            top = scorer.top(guesses, candidates, args.top)
+        elapsed = time.perf_counter() - start
+        scorer.close()
+        words = [index.words[g] for _, g in top]
+        reference = reference or words
+        same = "" if words == reference else " (different ranking!)"
+        print(f"{label:>14}: {elapsed * 1e3:8.1f} ms  {cells / elapsed / 1e6:6.2f} Mcells/s  top={words[:3]}{same}")
+
+
+def bench_service(args):
+    """Load-test the solver service (an in-process one unless --url is given)."""
+    from service import SolverClient, SolverService, make_server
+
+    server = None
+    url = args.url
+    if not url:
+        service = SolverService()
+        service.engine()
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    # Realistic queries: prefixes of games played with the GUI strategy
+    index = load_index()
+    analyzer = LetterFrequencyAnalyzer(dictionary_path())
+    analyzer.analyze()
+    solver = WordleSolver(index.words, index=index)
+    rng = random.Random(args.seed)
+    games = []
+    for answer in rng.sample(index.words, args.games):
+        guesses = play_game(answer, solver, analyzer)
+        games.append(feedback_rows(answer, guesses[:-1] if guesses[-1] == answer else guesses))
+    queries = [g[: rng.randint(0, len(g))] for g in (rng.choice(games) for _ in range(args.requests))]
+
+    local = threading.local()
+    latencies = []
+
+    def send(rows):
+        client = getattr(local, "client", None) or SolverClient(url)
+        local.client = client
+        start = time.perf_counter()
+        client.next_guess(rows, strategy=args.strategy)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(send, queries))
+    elapsed = time.perf_counter() - start
+
+    print(f"requests={len(queries)} concurrency={args.concurrency} strategy={args.strategy}")
+    print(f"client throughput: {len(queries) / elapsed:.1f} req/s")
+    print(
+        f"client latency: p50 {percentile(latencies, 50) * 1e3:.1f} ms, "
+        f"p95 {percentile(latencies, 95) * 1e3:.1f} ms, max {max(latencies) * 1e3:.1f} ms"
+    )
+    print(f"server stats: {SolverClient(url).stats()}")
+    if server:
+        server.shutdown()
+
+
+def bench_async(args):
+    """Games per second: one game at a time (play_game) vs the batched asyncio scheduler."""
+    from async_solver import GuessScheduler, offline_feedback, run_games
+
+    # Both sides use the --words dictionary for their index and letter frequencies
+    scheduler = GuessScheduler(path=args.words)
+    index = scheduler.index
+    solver = WordleSolver(index.words, index=index)
+    analyzer = LetterFrequencyAnalyzer(args.words or dictionary_path())
+    analyzer.analyze()
+    rng = random.Random(args.seed)
+    answers = rng.sample(index.words, min(args.games, len(index.words)))
+    delay = args.feedback_ms / 1000
+
+    def sequential():
+        results = []
+        for answer in answers:
+            guesses = play_game(answer, solver, analyzer)
+            time.sleep(delay * len(guesses))  # one feedback wait per guess, one game after another
+            results.append((guesses, bool(guesses) and guesses[-1] == answer))
+        return results
+
+    start = time.perf_counter()
+    seq = sequential()
+    seq_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    conc = asyncio.run(run_games(scheduler, [offline_feedback(a, delay) for a in answers]))
+    conc_time = time.perf_counter() - start
+
+    for label, results, elapsed in (("sequential", seq, seq_time), ("asyncio batch", conc, conc_time)):
+        won = sum(1 for _, ok in results if ok)
+        print(f"{label:>14}: {len(results) / elapsed:8.1f} games/s  ({elapsed:.2f} s, won {won}/{len(results)})")
+    differ = sum(1 for (a, _), (b, _) in zip(seq, conc) if a != b)
+    print(f"batches={scheduler.batches} avg_requests_per_batch={scheduler.requests / scheduler.batches:.1f}")
+    if differ:
+        print(f"{differ} games played different guesses than play_game")
+        return 1
+    return 0
+
+
+def _state_after(answer, guesses):
+    """GameState after playing ``guesses`` against ``answer``."""
+    state = GameState(len(answer))
+    for guess in guesses:
+        state.update_from_feedback(guess, score_feedback(guess, answer))
+    return state
+
+
+def micro_cases(words_path):
+    """Named callables covering the solver hot paths across representative states."""
+    words = load_words(path=words_path)
+    solver = WordleSolver(words)
+    analyzer = LetterFrequencyAnalyzer(words_path)
+    analyzer.analyze()
+
+    states = {
+        "first_move": GameState(),
+        "mid_game": _state_after("sling", ["aeros"]),
+        "duplicate_letters": _state_after("eerie", ["geese"]),
+        "near_solved": _state_after("might", ["light", "night"]),
+    }
+    cases = {}
+    for name, state in states.items():
+        cases[f"filter_candidates[{name}]"] = lambda s=state: solver.candidates_for(s)
+        candidates = solver.candidates_for(state)
+        cases[f"suggest_best_words[{name}]"] = lambda c=candidates: analyzer.suggest_best_words(word_list=c, top_n=1)
+
+    def analyze():
+        LetterFrequencyAnalyzer(words_path).analyze()
+
+    cases["analyze"] = analyze
+    cases["load_words"] = lambda: load_words(path=words_path)
+    return cases
+
+
+def measure(fn, min_time=0.5, repeats=7):
+    """
+    Return ``(ops_per_sec, peak_alloc_bytes)`` for ``fn``.
+
+    The loop count doubles until one run takes ``min_time / repeats``; the
+    fastest of ``repeats`` runs is kept. Allocation is the tracemalloc peak
+    of a single call.
+    """
+    fn()  # warm-up
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_time / repeats:
+            break
+        loops *= 2
+
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return 1 / best, peak - base
+
+
+def bench_micro(args):
+    """Micro-benchmarks with baseline save/compare and regression thresholds."""
+    cases = micro_cases(args.words or dictionary_path())
+    selected = {n: f for n, f in cases.items() if not args.only or any(o in n for o in args.only)}
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["cases"]
+
+    results = {}
+    regressions = []
+    print(f"{'case':<40} {'ops/s':>12} {'alloc KiB':>10}  vs baseline")
+    for name, fn in selected.items():
+        ops, alloc = measure(fn, min_time=args.min_time)
+        note = ""
+        if name in baseline:
+            base = baseline[name]
+
+            def regressed():
+                growth = (alloc - base["alloc_bytes"]) / max(base["alloc_bytes"], 1)
+                return ops / base["ops_per_sec"] - 1 < -args.threshold or growth > args.threshold
+
+            # Confirm apparent regressions before failing; timing noise is one-sided
+            for _ in range(args.confirm):
+                if not regressed():
+                    break
+                retry_ops, alloc = measure(fn, min_time=args.min_time)
+                ops = max(ops, retry_ops)
+            speed = ops / base["ops_per_sec"] - 1
+            growth = (alloc - base["alloc_bytes"]) / max(base["alloc_bytes"], 1)
+            note = f"speed {speed:+.0%}, alloc {growth:+.0%}"
+            if regressed():
+                regressions.append(name)
+                note += "  REGRESSION"
+        results[name] = {"ops_per_sec": ops, "alloc_bytes": alloc}
+        print(f"{name:<40} {ops:>12.1f} {alloc / 1024:>10.1f}  {note}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "cases": results}, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def _best_time(fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_filters(args):
+    """Time every filter backend on the same constraints, per candidate-set size."""
+    words = load_words(path=args.words)
+    index = WordIndex(words)
+    index.warm()
+    backends = {name: cls(index) for name, cls in FILTER_BACKENDS.items()}
+    rng = random.Random(args.seed)
+
+    cases = []
+    for _ in range(args.games):
+        answer = rng.choice(words)
+        state = GameState(len(answer))
+        for _ in range(4):
+            guess = rng.choice(words)
+            state.update_from_feedback(guess, score_feedback(guess, answer))
+            cases.append(FilterConstraints.from_clues(state.known_pattern, state.unknowns, list(state.excluded_letters)))
+
+    def report(label, times, auto):
+        means = {name: sum(t) / len(t) for name, t in times.items()}
+        winner = min(means, key=means.get)
+        cells = "".join(f"{means[name] * 1e6:9.0f}" for name in backends)
+        flag = "" if auto == winner else f"  (auto picks {auto})"
+        print(f"{label:<22}{cells}   {winner}{flag}")
+
+    header = "".join(f"{name:>9}" for name in backends)
+    print(f"{'whole list, result':<22}{header}   winner (mean us)")
+    buckets = {}
+    for constraints in cases:
+        size = len(backends["bitset"].filter(constraints))
+        bucket = next((b for b in (10, 100, 1000) if size <= b), None)
+        times = buckets.setdefault(bucket, {name: [] for name in backends})
+        for name, backend in backends.items():
+            times[name].append(_best_time(lambda: backend.filter(constraints)))
+    for bucket in sorted(buckets, key=lambda b: b or len(words) + 1):
+        report(f"  <= {bucket}" if bucket else "  > 1000", buckets[bucket], auto_filter_backend())
+
+    print(f"{'subset of size':<22}{header}")
+    for size in args.sizes:
+        times = {name: [] for name in backends}
+        for constraints in cases[: args.subset_cases]:
+            among = sorted(rng.sample(words, min(size, len(words))), key=index.position.__getitem__)
+            for name, backend in backends.items():
+                times[name].append(_best_time(lambda: backend.filter(constraints, among)))
+        report(f"  {size}", times, auto_filter_backend(size))
+
+
+def peak_rss_mib():
+    """Peak resident set size of this process in MiB, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def bench_memory(args):
+    """Memory held by the solver resources and allocated per game."""
+    path = args.words or dictionary_path()
+    tracemalloc.start()
+    try:
+        words = load_words(path=path)
+        analyzer = LetterFrequencyAnalyzer(path)
+        analyzer.analyze()
+        solver = WordleSolver(words)
+        solver.candidates_for(_state_after(words[0], words[-1:]))  # build the index and its bitsets
+        resident, _ = tracemalloc.get_traced_memory()
+
+        peaks = []
+        answers = random.Random(args.seed).sample(words, args.games)
+        start = time.perf_counter()
+        for answer in answers:
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            play_game(answer, solver, analyzer)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        elapsed = time.perf_counter() - start
+    finally:
+        tracemalloc.stop()
+
+    print(f"resources: {resident / 2**20:.2f} MiB traced ({len(words)} words)")
+    print(
+        f"per game:  peak alloc avg {sum(peaks) / len(peaks) / 1024:.1f} KiB, "
+        f"p95 {percentile(peaks, 95) / 1024:.1f} KiB, max {max(peaks) / 1024:.1f} KiB"
+    )
+    print(f"games:     {len(answers)} in {elapsed:.2f} s (timed under tracemalloc)")
+    rss = peak_rss_mib()
+    print(f"peak RSS:  {rss:.1f} MiB" if rss is not None else "peak RSS:  n/a on this platform")
+
+    # Same --games and --seed on both sides, so the per-game figures cover the same answers
+    results = {
+        "resident_bytes": resident,
+        "game_alloc_avg_bytes": sum(peaks) / len(peaks),
+        "game_alloc_p95_bytes": percentile(peaks, 95),
+    }
+    regressions = []
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        print("vs baseline:")
+        for name, value in results.items():
+            if name not in baseline:
+                continue
+            growth = (value - baseline[name]) / max(baseline[name], 1)
+            note = "  REGRESSION" if growth > args.threshold else ""
+            if note:
+                regressions.append(name)
+            print(f"  {name:<22} {baseline[name] / 1024:>10.1f} -> {value / 1024:>10.1f} KiB  {growth:+.0%}{note}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "games": args.games, "results": results}, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if regressions:
+        print(f"{len(regressions)} figure(s) grew beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def bench_page(args):
+    """Page-ready time on the local mock site: default vs lean browser profile."""
+    import shutil
+    import tempfile
+
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    import mock_site
+    from browser import PLAY_BUTTON_XPATH, block_urls, chrome_options
+
+    server, base_url = mock_site.start_in_background(third_party_delay=args.third_party_ms / 1000)
+    profile_dir = tempfile.mkdtemp(prefix="wordle-bench-profile-")
+    try:
+        for label, lean in (("default", False), ("lean", True)):
+            options = chrome_options(lean=lean, profile_dir=profile_dir if lean else None, headless=not args.headed)
+            driver = webdriver.Chrome(options=options)
+            server.hits.clear()
+            try:
+                if lean:
+                    block_urls(driver)
+                times = []
+                for _ in range(args.loads):
+                    start = time.perf_counter()
+                    driver.get(mock_site.page_url(base_url))
+                    WebDriverWait(driver, 30).until(lambda d: d.find_elements(By.XPATH, PLAY_BUTTON_XPATH))
+                    times.append(time.perf_counter() - start)
+            finally:
+                driver.quit()
+            third_party = sum(n for path, n in server.hits.items() if path.startswith("/3p/"))
+            print(
+                f"{label:>8}: page ready p50 {percentile(times, 50) * 1e3:7.1f} ms  "
+                f"p95 {percentile(times, 95) * 1e3:7.1f} ms  third-party requests {third_party}"
+            )
+    finally:
+        server.shutdown()
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+def bench_stop(args):
+    """Stop-to-idle latency: cancel a game on the mock page at random points and time the worker's exit."""
+    from selenium import webdriver
+
+    import mock_site
+    from batch_solver import play_page
+    from browser import CancelToken, block_urls, chrome_options, install_overlay_watcher
+
+    index = load_index()
+    solver = WordleSolver(index.words, index=index)
+    index.warm()
+    analyzer = LetterFrequencyAnalyzer(dictionary_path())
+    analyzer.analyze()
+    rng = random.Random(args.seed)
+
+    server, base_url = mock_site.start_in_background(third_party_delay=0.2)
+    driver = webdriver.Chrome(options=chrome_options(lean=True, headless=not args.headed))
+    latencies = []
+    try:
+        block_urls(driver)
+        install_overlay_watcher(driver)
+        for _ in range(args.trials):
+            url = mock_site.page_url(base_url, rng.choice(index.words), reveal_ms=args.reveal_ms)
+            token = CancelToken()
+            results = []
+            worker = threading.Thread(
+                target=lambda: results.append(play_page(driver, url, solver, analyzer, timeout=30, token=token))
+            )
+            worker.start()
+            worker.join(rng.uniform(0.2, args.max_delay))
+            if not worker.is_alive():
+                continue  # the game ended before the stop; nothing to measure
+            token.cancel()
+            worker.join()
+            latencies.append(time.monotonic() - token.cancelled_at)
+    finally:
+        driver.quit()
+        server.shutdown()
+
+    if not latencies:
+        print("Every game finished before it was stopped; raise --max-delay or --reveal-ms.")
+        return 1
+    p95 = percentile(latencies, 95) * 1e3
+    print(
+        f"stop-to-idle over {len(latencies)} stops: p50 {percentile(latencies, 50) * 1e3:.1f} ms  "
+        f"p95 {p95:.1f} ms  max {max(latencies) * 1e3:.1f} ms"
+    )
+    if p95 > args.limit_ms:
+        print(f"p95 above the {args.limit_ms:.0f} ms limit")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", default=None, help="5-letter dictionary file (default: bundled list)")
+    parser.add_argument("--seed", type=int, default=1)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("micro", help="hot-path micro-benchmarks with regression thresholds")
+    p.add_argument("--save-baseline", metavar="PATH", help="write results as the new baseline")
+    p.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    p.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown / alloc growth (fraction)")
+    p.add_argument("--min-time", type=float, default=0.5, help="seconds of timing per case")
+    p.add_argument("--confirm", type=int, default=2, help="re-measurements before reporting a regression")
+    p.add_argument("--only", nargs="*", help="substrings selecting cases")
+    p.set_defaults(func=bench_micro)
+
+    p = commands.add_parser("filters", help="candidate filter backends per candidate-set size")
+    p.add_argument("--games", type=int, default=200)
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000, 15000])
+    p.add_argument("--subset-cases", type=int, default=200, help="constraint sets timed per subset size")
+    p.set_defaults(func=bench_filters)
+
+    p = commands.add_parser("memory", help="resident memory and per-game allocations")
+    p.add_argument("--games", type=int, default=100)
+    p.add_argument("--save-baseline", metavar="PATH", help="write results as the new baseline")
+    p.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    p.add_argument("--threshold", type=float, default=0.10, help="allowed growth of any figure (fraction)")
+    p.set_defaults(func=bench_memory)
+
+    p = commands.add_parser("page", help="page-ready time with and without the lean browser profile")
+    p.add_argument("--loads", type=int, default=10)
+    p.add_argument("--third-party-ms", type=float, default=800, help="latency of each mock ad/tracker request")
+    p.add_argument("--headed", action="store_true", help="show the browser window")
+    p.set_defaults(func=bench_page)
+
+    p = commands.add_parser("stop", help="stop-to-idle latency of a cancelled game on the mock page")
+    p.add_argument("--trials", type=int, default=30)
+    p.add_argument("--max-delay", type=float, default=3.0, help="latest stop, seconds into the game")
+    p.add_argument("--reveal-ms", type=int, default=300, help="tile flip delay on the mock page")
+    p.add_argument("--limit-ms", type=float, default=100, help="fail if p95 latency is above this")
+    p.add_argument("--headed", action="store_true", help="show the browser window")
+    p.set_defaults(func=bench_stop)
+
+    p = commands.add_parser("multiboard", help="multi-board solver latency")
+    p.add_argument("--boards", type=int, default=8)
+    p.add_argument("--games", type=int, default=10)
+    p.add_argument("--max-guesses", type=int, default=21)
+    p.set_defaults(func=bench_multiboard)
+
+    p = commands.add_parser("scoring", help="parallel vs serial guess scoring")
+    p.add_argument("--guesses", type=int, default=15000)
+    p.add_argument("--candidates", type=int, default=2000)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--top", type=int, default=5)
+    p.add_argument("--python", action="store_true", help="also time the pure-Python scorer")
+    p.set_defaults(func=bench_scoring)
+
+    p = commands.add_parser("service", help="load-test the solver service")
+    p.add_argument("--url", help="running service (default: start one in-process)")
+    p.add_argument("--requests", type=int, default=500)
+    p.add_argument("--concurrency", type=int, default=16)
+    p.add_argument("--games", type=int, default=50, help="distinct games the queries are drawn from")
+    p.add_argument("--strategy", choices=("frequency", "lookahead"), default="frequency")
+    p.set_defaults(func=bench_service)
+
+    p = commands.add_parser("async", help="asyncio batched games vs sequential")
+    p.add_argument("--games", type=int, default=1000)
+    p.add_argument("--feedback-ms", type=float, default=2.0, help="simulated feedback latency per guess")
+    p.set_defaults(func=bench_async)
+
+    p = commands.add_parser("simulate", help="full-game simulation per word length")
+    p.add_argument("--lengths", type=int, nargs="+", default=list(SUPPORTED_LENGTHS))
+    p.add_argument("--games", type=int, default=200)
+    p.add_argument("--max-attempts", type=int, default=6)
+    p.add_argument("--lookahead", action="store_true", help="use LookaheadSearch instead of letter frequency")
+    p.add_argument("--objective", choices=("expected", "worst"), default="expected")
+    p.add_argument("--time-budget", type=float, default=1.0, help="lookahead seconds per move")
+    p.add_argument("--hard", action="store_true", help="play by the Hard Mode rules")
+    p.set_defaults(func=bench_simulate)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
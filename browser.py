@@ -0,0 +1,424 @@
+"""
+Browser-side helpers for the GUI solver.
+
+Nothing here touches Tk: results are reported through callbacks so the app
+can hand them to its UI thread.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, wait
+
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from urllib3.exceptions import MaxRetryError, ProtocolError
+from urllib3.exceptions import TimeoutError as HTTPTimeoutError
+
+from solver import DEFAULT_LENGTH, FEEDBACK_STATES
+
+logger = logging.getLogger(__name__)
+
+# "Continue" is shown instead of "Play" when today's game is already in progress
+PLAY_BUTTON_XPATH = "//button[contains(text(),'Play') or contains(text(),'Continue')]"
+TILE_SELECTOR = "div.Tile-module_tile__UWEHN"
+
+# Network.setBlockedURLs patterns for the lean profile: ad, analytics and
+# tracking hosts plus resource types the solver never needs (fonts, media)
+BLOCKED_URL_PATTERNS = [
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*googletagservices.com*",
+    "*googletagmanager.com*",
+    "*google-analytics.com*",
+    "*adservice.google.com*",
+    "*amazon-adsystem.com*",
+    "*adnxs.com*",
+    "*criteo.com*",
+    "*criteo.net*",
+    "*pubmatic.com*",
+    "*rubiconproject.com*",
+    "*casalemedia.com*",
+    "*openx.net*",
+    "*moatads.com*",
+    "*doubleverify.com*",
+    "*adsafeprotected.com*",
+    "*chartbeat.com*",
+    "*chartbeat.net*",
+    "*optimizely.com*",
+    "*scorecardresearch.com*",
+    "*facebook.net*",
+    "*connect.facebook.com*",
+    "*bounceexchange.com*",
+    "*brandmetrics.com*",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.mp4",
+    "*.webm",
+]
+
+
+def chrome_options(window_size=None, lean=False, profile_dir=None, headless=False):
+    """
+    Build ChromeOptions for the solver window.
+
+    Parameters:
+        window_size (tuple[int, int], optional): Window width and height; the
+            window is placed at the top-left corner.
+        lean (bool): Use the lean profile: ``eager`` page loads (return at
+            DOMContentLoaded instead of waiting for ads and trackers), images
+            and background services off. Pair with block_urls() once the
+            driver is up.
+        profile_dir (str, optional): Persistent user-data directory so the
+            HTTP cache and cookies (e.g. the accepted consent banner) survive
+            between runs.
+        headless (bool): Run without a window (benchmarks).
+    """
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    if window_size:
+        options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
+        options.add_argument("--window-position=0,0")
+    if lean:
+        options.page_load_strategy = "eager"
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--disable-component-update")
+        options.add_argument("--no-first-run")
+        options.add_argument("--no-default-browser-check")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        options.add_argument(f"--user-data-dir={profile_dir}")
+    return options
+
+
+def block_urls(driver, patterns=None):
+    """Block requests matching ``patterns`` (default BLOCKED_URL_PATTERNS) via the DevTools protocol."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns or BLOCKED_URL_PATTERNS)})
+
+
+# Overlays the page-side watcher dismisses as soon as they appear, in the
+# order they are tried: (name, CSS selector, action). "click" presses the
+# element (retried while it stays on the page), "remove" deletes it and
+# "hide" sets display:none.
+OVERLAY_RULES = [
+    (
+        "consent_banner",
+        "#fides-button-group > div.fides-banner-button-group.fides-banner-primary-actions"
+        " > button.fides-banner-button.fides-banner-button-primary.fides-accept-all-button",
+        "click",
+    ),
+    ("consent_overlay", ".fides-modal-overlay", "remove"),
+    ("help_dialog", "#help-dialog > div > div > button", "click"),
+    ("ad_container", "div[class^='Ad-module_adContainer__']", "hide"),
+    (
+        "login_prompt",
+        "#loginPromptCongrats-dialog > div > div > div.Modal-module_fullscreenStatsExit__DpWAs > div > button",
+        "click",
+    ),
+    (
+        "regiwall",
+        "#regiwallCongrats-dialog > div > div > div.Modal-module_fullscreenStatsExit__DpWAs > div > button",
+        "click",
+    ),
+    ("regiwall_dialog", "#regiwallCongrats-dialog", "remove"),
+    ("lire_ui", "[id^='lire-ui-']", "remove"),
+]
+
+OVERLAY_WATCHER_JS = """
+(function (rules) {
+  if (window.__overlayWatcher) return;
+  const watcher = window.__overlayWatcher = {log: []};
+  const done = new WeakSet(), clicks = new WeakMap();
+  function record(rule, extra) {
+    watcher.log.push(Object.assign({name: rule.name, action: rule.action, ms: Math.round(performance.now())}, extra));
+  }
+  function apply() {
+    for (const rule of rules) {
+      for (const el of document.querySelectorAll(rule.selector)) {
+        if (done.has(el)) continue;
+        done.add(el);
+        try {
+          if (rule.action === "click") {
+            const n = (clicks.get(el) || 0) + 1;
+            clicks.set(el, n);
+            el.click();
+            record(rule, {attempt: n});
+            // handlers may attach late: click again if it is still there
+            if (n < 5) setTimeout(() => { if (el.isConnected) { done.delete(el); apply(); } }, 500);
+          } else if (rule.action === "remove") {
+            el.remove();
+            record(rule);
+          } else {
+            el.style.setProperty("display", "none", "important");
+            record(rule);
+          }
+        } catch (e) {
+          record(rule, {error: String(e)});
+        }
+      }
+    }
+  }
+  new MutationObserver(apply).observe(document, {childList: true, subtree: true});
+  apply();
+})(%s);
+"""
+
+
+def install_overlay_watcher(driver, rules=None):
+    """
+    Inject the overlay watcher into the current page and every page loaded after it.
+
+    One MutationObserver applies ``rules`` (default OVERLAY_RULES) as soon as
+    a matching element is added; see overlay_report() for what it did.
+    """
+    table = [{"name": n, "selector": sel, "action": a} for n, sel, a in (rules or OVERLAY_RULES)]
+    source = OVERLAY_WATCHER_JS % json.dumps(table)
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+    driver.execute_script(source)
+
+
+def overlay_report(driver):
+    """
+    Return what the watcher has handled on the current page.
+
+    Returns:
+        list[dict]: ``{"name", "action", "ms"}`` per action (``ms`` after
+        navigation start), plus ``attempt`` for clicks and ``error`` on failure.
+    """
+    return driver.execute_script("return window.__overlayWatcher ? window.__overlayWatcher.log : [];")
+
+
+READ_BOARD_JS = """
+const length = arguments[0], tileSelector = arguments[1], rows = [];
+for (let r = 1; ; r++) {
+  const row = document.querySelector("div[aria-label='Row " + r + "']");
+  if (!row) break;
+  rows.push([...row.querySelectorAll(tileSelector)].slice(0, length).map(t => {
+    let state = t.getAttribute("data-state");
+    if (!state) {
+      const aria = (t.getAttribute("aria-label") || "").toLowerCase();
+      state = ["correct", "present", "absent"].find(s => aria.includes(s)) || "";
+    }
+    return [(t.textContent || "").trim().toLowerCase(), state];
+  }));
+}
+return rows;
+"""
+
+
+def read_board(driver, length=DEFAULT_LENGTH):
+    """
+    Read every completed row of the board in one script call.
+
+    Returns:
+        list[tuple[str, list[str]]]: ``(guess, tile states)`` per row, top to
+        bottom, up to the first row that is empty or still being typed or
+        revealed.
+    """
+    played = []
+    for tiles in driver.execute_script(READ_BOARD_JS, length, TILE_SELECTOR):
+        if len(tiles) < length or not all(letter and state in FEEDBACK_STATES for letter, state in tiles):
+            break
+        played.append(("".join(letter for letter, _ in tiles), [state for _, state in tiles]))
+    return played
+
+
+class Cancelled(BaseException):
+    """
+    Raised inside a solving run once its CancelToken is cancelled.
+
+    Derived from BaseException (like asyncio.CancelledError) so the many
+    ``except Exception`` blocks around individual page steps let it through
+    to the top of the run instead of logging it and carrying on.
+    """
+
+
+class CancelToken:
+    """
+    Stop signal shared between whoever starts a solving run and the run itself.
+
+    Every sleep and wait in the run goes through the token: sleeps wake up
+    as soon as cancel() is called, and until() re-checks its condition every
+    ``poll_interval`` seconds, so a run stops after at most one poll or
+    WebDriver call instead of after the longest timeout.
+
+    Parameters:
+        poll_interval (float): Seconds between condition checks in until().
+    """
+
+    def __init__(self, poll_interval=0.1):
+        self.poll_interval = poll_interval
+        self.cancelled_at = None
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Request cancellation; safe to call from any thread, more than once."""
+        if not self._event.is_set():
+            self.cancelled_at = time.monotonic()
+            self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Raise Cancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise Cancelled("cancelled")
+
+    def sleep(self, seconds):
+        """time.sleep() that raises Cancelled as soon as the token is cancelled."""
+        if self._event.wait(seconds):
+            raise Cancelled("cancelled")
+
+    def until(self, driver, condition, timeout, message=""):
+        """
+        Cancellable ``WebDriverWait(driver, timeout).until(condition)``.
+
+        ``condition(driver)`` is polled until it returns a truthy value, which
+        is returned; NoSuchElementException counts as not yet.
+
+        Raises:
+            Cancelled: The token was cancelled while waiting.
+            TimeoutException: ``timeout`` seconds passed first.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            self.check()
+            try:
+                value = condition(driver)
+            except NoSuchElementException:
+                value = None
+            if value:
+                return value
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            self.sleep(min(self.poll_interval, remaining))
+
+
+class DriverMonitor(threading.Thread):
+    """
+    Background liveness monitor for a WebDriver session.
+
+    Each check first asks whether the chromedriver process is still running
+    (no HTTP round trip); only if it is does it make one cheap WebDriver call
+    (``window_handles``). The call runs on its own daemon thread and the
+    check waits at most ``slow_after`` seconds for it, so a hung probe is
+    reported instead of stalling the monitor; no new probe starts while one
+    is still in flight. Checks back off while the browser stays healthy and
+    tighten again as soon as it looks slow, so a busy or hung Chrome never
+    blocks the caller.
+
+    States passed to ``on_change(state, detail)``:
+
+    - ``"alive"``: the last probe answered within ``slow_after`` seconds.
+    - ``"unresponsive"``: the process is up but the probe was slow, is
+      still pending or timed out.
+    - ``"closed"``: the window, session or driver connection is gone; the
+      monitor stops.
+
+    Parameters:
+        driver: Selenium WebDriver to watch.
+        on_change (callable): Called from the monitor thread on every state change.
+        min_interval (float): Seconds between checks after a change.
+        max_interval (float): Upper bound the interval backs off to.
+        slow_after (float): Probe latency treated as unresponsive.
+    """
+
+    def __init__(self, driver, on_change, min_interval=0.5, max_interval=5.0, slow_after=1.0):
+        super().__init__(name="driver-monitor", daemon=True)
+        self.driver = driver
+        self.on_change = on_change
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.slow_after = slow_after
+        self.state = None
+        self.checks = 0
+        self._stop_event = threading.Event()
+        self._probe = None  # (Future, start time) of the probe in flight
+
+    def stop(self):
+        """Stop checking; safe to call from any thread."""
+        self._stop_event.set()
+
+    def _process_alive(self):
+        service = getattr(self.driver, "service", None)
+        process = getattr(service, "process", None)
+        return process is None or process.poll() is None
+
+    def _start_probe(self):
+        future = Future()
+
+        def probe():
+            try:
+                future.set_result((self.driver.window_handles, time.perf_counter()))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=probe, name="driver-probe", daemon=True).start()
+        return future
+
+    @staticmethod
+    def _is_timeout(error):
+        if isinstance(error, MaxRetryError):
+            error = error.reason
+        return isinstance(error, (TimeoutError, HTTPTimeoutError, TimeoutException))
+
+    @staticmethod
+    def _is_gone(error):
+        # TimeoutException is a WebDriverException too; _is_timeout is asked first
+        return isinstance(error, (WebDriverException, MaxRetryError, ProtocolError, ConnectionError))
+
+    def check(self):
+        """Run one check and return ``(state, detail)``."""
+        self.checks += 1
+        if not self._process_alive():
+            return "closed", "chromedriver process exited"
+        if self._probe is None:
+            self._probe = (self._start_probe(), time.perf_counter())
+        future, start = self._probe
+        wait([future], max(0.0, start + self.slow_after - time.perf_counter()))
+        if not future.done():
+            return "unresponsive", f"no answer for {time.perf_counter() - start:.1f}s"
+        self._probe = None
+        error = future.exception()
+        if error is not None:
+            detail = str(error).splitlines()[0] if str(error) else type(error).__name__
+            if self._is_timeout(error) or not self._is_gone(error):
+                return "unresponsive", detail  # busy, not gone: keep the run going
+            return "closed", detail
+        handles, finished = future.result()
+        if not handles:
+            return "closed", "no browser windows left"
+        elapsed = finished - start
+        if elapsed > self.slow_after:
+            return "unresponsive", f"probe took {elapsed:.1f}s"
+        return "alive", None
+
+    def run(self):
+        interval = self.min_interval
+        while not self._stop_event.wait(interval):
+            state, detail = self.check()
+            if self._stop_event.is_set():
+                break
+            if state != self.state:
+                logger.debug("Driver state %s -> %s (%s)", self.state, state, detail)
+                self.state = state
+                interval = self.min_interval
+                self.on_change(state, detail)
+            elif state == "alive":
+                interval = min(self.max_interval, interval * 1.5)
+            if state == "closed":
+                break
@@ -0,0 +1,259 @@
+"""
+Game trace recording and deterministic replay.
+
+Every live run can be written to a small gzip'd JSON trace holding the
+guesses, the tile states read from the page, the candidate count after each
+row and per-phase timings. Replaying a trace feeds the recorded feedback
+back through the solver (no browser) to check that it still makes the same
+decisions and to time the compute path, so a directory of traces doubles as
+a regression benchmark corpus::
+
+    python game_trace.py replay traces/ --repeat 5
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+from solver import (
+    DEFAULT_LENGTH,
+    GameState,
+    HardModeGuesses,
+    LetterFrequencyAnalyzer,
+    LookaheadSearch,
+    WordleSolver,
+    choose_guess,
+    dictionary_path,
+    load_index,
+    states_from_string,
+    states_to_string,
+)
+
+TRACE_VERSION = 1
+TRACE_SUFFIX = ".trace.json.gz"
+
+
+class GameTrace:
+    """
+    Record of one game.
+
+    Parameters:
+        word_length (int): Board width.
+        strategy (dict): How guesses were chosen, e.g. ``{"name": "frequency"}``
+            or ``{"name": "lookahead", "objective": "expected", "time_budget": 1.0}``,
+            with ``"hard_mode": True`` for games played by the Hard Mode rules.
+        meta (dict, optional): Free-form context (app version, browser, ...).
+    """
+
+    def __init__(self, word_length=DEFAULT_LENGTH, strategy=None, meta=None):
+        self.version = TRACE_VERSION
+        self.started = time.time()
+        self.word_length = word_length
+        self.strategy = strategy or {"name": "frequency"}
+        self.meta = meta or {}
+        self.phases = {}
+        self.rows = []
+        self.solution = None
+        self.solved = False
+        self.error = None
+        self._last_mark = time.perf_counter()
+
+    def mark(self, name, timings=None):
+        """
+        Close a phase: add the time since the previous mark to ``name``.
+
+        Parameters:
+            name (str): Phase name.
+            timings (dict, optional): Where to accumulate (default: game phases).
+        """
+        now = time.perf_counter()
+        timings = self.phases if timings is None else timings
+        timings[name] = timings.get(name, 0.0) + now - self._last_mark
+        self._last_mark = now
+
+    def add_row(self, guess, states, candidates=None, timings=None):
+        """
+        Append one played row.
+
+        Parameters:
+            guess (str): Word played.
+            states (list[str | None]): Tile states read from the page.
+            candidates (int, optional): Candidates left after applying the row.
+            timings (dict, optional): Seconds spent per phase of this row.
+        """
+        self.rows.append(
+            {
+                "guess": guess,
+                "feedback": states_to_string(states),
+                "candidates": candidates,
+                "timings": {k: round(v, 6) for k, v in (timings or {}).items()},
+            }
+        )
+
+    def to_dict(self):
+        return {
+            "version": self.version,
+            "started": self.started,
+            "word_length": self.word_length,
+            "strategy": self.strategy,
+            "meta": self.meta,
+            "phases": {k: round(v, 6) for k, v in self.phases.items()},
+            "rows": self.rows,
+            "solution": self.solution,
+            "solved": self.solved,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version: {data.get('version')}")
+        trace = cls(data["word_length"], data.get("strategy"), data.get("meta"))
+        trace.started = data.get("started", 0.0)
+        trace.phases = data.get("phases", {})
+        trace.rows = data.get("rows", [])
+        trace.solution = data.get("solution")
+        trace.solved = data.get("solved", False)
+        trace.error = data.get("error")
+        return trace
+
+    def save(self, directory):
+        """Write the trace into ``directory`` and return its path."""
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        path = os.path.join(directory, f"{stamp}-{int(self.started * 1000) % 1000:03d}{TRACE_SUFFIX}")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        return path
+
+
+def load_trace(path):
+    """Read a trace written by GameTrace.save."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return GameTrace.from_dict(json.load(f))
+
+
+def find_traces(paths):
+    """Expand files and directories into a sorted list of trace files."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(os.path.join(path, n) for n in os.listdir(path) if n.endswith(TRACE_SUFFIX))
+        else:
+            found.append(path)
+    return sorted(found)
+
+
+class Replayer:
+    """
+    Feed recorded traces back through the solver.
+
+    Resources are loaded once per word length and reused across traces.
+
+    Frequency traces replay deterministically. Lookahead traces do not: the
+    search is anytime and stops at its wall-clock ``time_budget``, so how far
+    it got depends on the machine and its load, both when recording and when
+    replaying. A mismatch on such a trace may come from timing alone.
+    """
+
+    def __init__(self):
+        self._resources = {}
+
+    def _resources_for(self, length):
+        if length not in self._resources:
+            index = load_index(length)
+            analyzer = LetterFrequencyAnalyzer(dictionary_path(length))
+            analyzer.analyze()
+            self._resources[length] = (WordleSolver(index.words, index=index), analyzer, index)
+        return self._resources[length]
+
+    def replay(self, trace):
+        """
+        Replay one trace.
+
+        Returns:
+            dict: ``{"rows", "mismatches", "compute_s", "deterministic"}`` where
+            mismatches lists the rows whose guess or candidate count differs
+            from the recording, and deterministic is False for budgeted
+            lookahead traces.
+        """
+        solver, analyzer, index = self._resources_for(trace.word_length)
+        search = None
+        if trace.strategy.get("name") == "lookahead":
+            search = LookaheadSearch(
+                index,
+                objective=trace.strategy.get("objective", "expected"),
+                time_budget=trace.strategy.get("time_budget", 1.0),
+            )
+
+        state = GameState(trace.word_length)
+        hard_mode = HardModeGuesses(index) if trace.strategy.get("hard_mode") else None
+        candidates = solver.words
+        mismatches = []
+        # Rows found already on the board when the run started were not the solver's choice
+        resumed = trace.meta.get("resumed_rows", 0)
+        start = time.perf_counter()
+        for number, row in enumerate(trace.rows, 1):
+            guess = choose_guess(candidates, analyzer, search, hard_mode) if number > resumed else row["guess"]
+            if guess != row["guess"]:
+                mismatches.append({"row": number, "recorded": row["guess"], "replayed": guess})
+            states = states_from_string(row["feedback"])
+            if all(s == "correct" for s in states):
+                break
+            row_results = [{"letter": l, "state": s} for l, s in zip(row["guess"], states)]
+            state.update(row_results)
+            if hard_mode is not None:
+                hard_mode.update(row_results)
+            candidates = solver.candidates_for(state)
+            if row.get("candidates") is not None and row["candidates"] != len(candidates):
+                mismatches.append({"row": number, "recorded_candidates": row["candidates"], "replayed": len(candidates)})
+        return {
+            "rows": len(trace.rows),
+            "mismatches": mismatches,
+            "compute_s": time.perf_counter() - start,
+            "deterministic": search is None,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded game traces without a browser.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("replay", help="check decisions and time the compute path")
+    p.add_argument("paths", nargs="+", help="trace files or directories")
+    p.add_argument("--repeat", type=int, default=1, help="replays per trace for timing")
+    args = parser.parse_args(argv)
+
+    replayer = Replayer()
+    failures = 0
+    budgeted = 0
+    total = 0.0
+    paths = find_traces(args.paths)
+    for path in paths:
+        trace = load_trace(path)
+        timings = []
+        for _ in range(max(1, args.repeat)):
+            result = replayer.replay(trace)
+            timings.append(result["compute_s"])
+        best = min(timings)
+        total += best
+        status = "ok" if not result["mismatches"] else f"MISMATCH {result['mismatches']}"
+        if not result["deterministic"]:
+            budgeted += 1
+            status += " (budgeted lookahead)"
+        failures += bool(result["mismatches"])
+        print(f"{os.path.basename(path)}: rows={result['rows']} compute={best * 1e3:.1f} ms {status}")
+
+    print(f"{len(paths)} traces, {failures} mismatched, total compute {total * 1e3:.1f} ms")
+    if budgeted:
+        print(
+            f"note: {budgeted} lookahead trace(s) were searched under a wall-clock time budget; "
+            "their replays are not deterministic and a mismatch there may be timing, not a changed decision"
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Local run history in SQLite, plus an analytics CLI.
+
+The app hands every finished GameTrace to RunHistory.record(), which only
+queues it; a background thread writes queued runs in batched transactions,
+so recording never adds I/O to the solve loop::
+
+    python history.py stats --days 30
+    python history.py runs --limit 20
+    python history.py import "%LOCALAPPDATA%\\Wordle Auto-Solver\\traces"
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from queue import Empty, Queue
+
+from game_trace import find_traces, load_trace
+from solver import percentile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB = os.path.join(
+    os.getenv("LOCALAPPDATA", os.getenv("HOME", "/tmp")), "Wordle Auto-Solver", "history.sqlite3"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    app_version TEXT,
+    browser_version TEXT,
+    driver_version TEXT,
+    strategy TEXT,
+    word_length INTEGER,
+    solution TEXT,
+    solved INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    resumed_rows INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS guesses (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    row INTEGER NOT NULL,
+    guess TEXT NOT NULL,
+    feedback TEXT NOT NULL,
+    candidates INTEGER
+);
+-- row is NULL for game-level phases (page load, driver start, ...)
+CREATE TABLE IF NOT EXISTS phases (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    row INTEGER,
+    phase TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+-- a run is identified by its start time, so re-importing traces adds nothing
+CREATE UNIQUE INDEX IF NOT EXISTS runs_started ON runs(started);
+"""
+
+
+def connect(path=DEFAULT_DB):
+    """Open (and create if needed) the history database."""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def insert_run(conn, run):
+    """
+    Insert one run given as GameTrace.to_dict() output.
+
+    Returns:
+        int | None: The new run id, or None if the run was already stored.
+    """
+    meta = run.get("meta", {})
+    cursor = conn.execute(
+        "INSERT OR IGNORE INTO runs (started, app_version, browser_version, driver_version, strategy,"
+        " word_length, solution, solved, guesses, resumed_rows, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            run["started"],
+            meta.get("app_version"),
+            meta.get("browser_version"),
+            meta.get("driver_version"),
+            json.dumps(run.get("strategy"), sort_keys=True),
+            run.get("word_length"),
+            run.get("solution"),
+            int(bool(run.get("solved"))),
+            len(run.get("rows", [])),
+            meta.get("resumed_rows", 0),
+            run.get("error"),
+        ),
+    )
+    if not cursor.rowcount:
+        return None
+    run_id = cursor.lastrowid
+    rows = run.get("rows", [])
+    conn.executemany(
+        "INSERT INTO guesses (run_id, row, guess, feedback, candidates) VALUES (?, ?, ?, ?, ?)",
+        [(run_id, n, r["guess"], r["feedback"], r.get("candidates")) for n, r in enumerate(rows, 1)],
+    )
+    phases = [(run_id, None, name, s) for name, s in run.get("phases", {}).items()]
+    phases += [(run_id, n, name, s) for n, r in enumerate(rows, 1) for name, s in r.get("timings", {}).items()]
+    conn.executemany("INSERT INTO phases (run_id, row, phase, seconds) VALUES (?, ?, ?, ?)", phases)
+    return run_id
+
+
+class RunHistory:
+    """
+    Asynchronous, batched writer for the run history.
+
+    Parameters:
+        path (str): SQLite database file.
+        batch_size (int): Most runs written in one transaction.
+        flush_interval (float): Seconds to wait for more runs before writing a batch.
+    """
+
+    def __init__(self, path=DEFAULT_DB, batch_size=50, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._queue = Queue()
+        self._thread = threading.Thread(target=self._writer, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def record(self, trace):
+        """Queue a finished GameTrace; returns immediately."""
+        self._queue.put(trace.to_dict())
+
+    def close(self, timeout=5.0):
+        """Write everything still queued and stop the writer."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while batch[-1] is not None and len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _writer(self):
+        try:
+            conn = connect(self.path)
+        except sqlite3.Error as e:
+            logger.error("Run history disabled, cannot open %s: %s", self.path, e)
+            return
+        try:
+            while True:
+                batch = self._next_batch()
+                runs = [run for run in batch if run is not None]
+                if runs:
+                    try:
+                        with conn:
+                            for run in runs:
+                                insert_run(conn, run)
+                        self.written += len(runs)
+                    except sqlite3.Error as e:
+                        logger.error("Could not write %d run(s) to history: %s", len(runs), e)
+                if batch[-1] is None:
+                    break
+        finally:
+            conn.close()
+
+
+def _where(days, version):
+    clauses, params = [], []
+    if days:
+        clauses.append("started >= ?")
+        params.append(time.time() - days * 86400)
+    if version:
+        clauses.append("app_version = ?")
+        params.append(version)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def print_stats(conn, days=None, version=None):
+    """Print guess distribution, phase latencies and per-release trends."""
+    where, params = _where(days, version)
+    query = f"SELECT id, solved, guesses, error, app_version FROM runs{where} ORDER BY started"
+    runs = conn.execute(query, params).fetchall()
+    if not runs:
+        print("No runs recorded.")
+        return
+    ids = {r[0] for r in runs}
+
+    solved = [r for r in runs if r[1]]
+    print(f"Runs: {len(runs)}  solved: {len(solved)} ({len(solved) / len(runs):.0%})  errors: {sum(1 for r in runs if r[3])}")
+    print("\nGuess distribution (solved runs):")
+    distribution = Counter(r[2] for r in solved)
+    widest = max(distribution.values(), default=1)
+    for n in range(1, max(distribution, default=6) + 1):
+        count = distribution.get(n, 0)
+        print(f"  {n}: {'#' * round(30 * count / widest):<30} {count}")
+
+    game_phases, row_phases = defaultdict(list), defaultdict(list)
+    for run_id, row, phase, seconds in conn.execute("SELECT run_id, row, phase, seconds FROM phases"):
+        if run_id in ids:
+            (game_phases if row is None else row_phases)[phase].append(seconds)
+    for title, phases in (("Game phases", game_phases), ("Per-row phases", row_phases)):
+        if phases:
+            print(f"\n{title} (ms):      p50      p95")
+            for phase, values in phases.items():
+                print(f"  {phase:<16} {percentile(values, 50) * 1e3:8.1f} {percentile(values, 95) * 1e3:8.1f}")
+
+    print("\nBy release:      runs  solved  avg guesses  p50 total s")
+    totals = defaultdict(float)
+    for run_id, seconds in conn.execute("SELECT run_id, seconds FROM phases WHERE row IS NULL"):
+        totals[run_id] += seconds
+    releases = defaultdict(list)
+    for run in runs:
+        releases[run[4] or "?"].append(run)
+    for release, group in releases.items():  # in order of first use
+        won = [r for r in group if r[1]]
+        avg = sum(r[2] for r in won) / len(won) if won else 0.0
+        p50 = percentile([totals[r[0]] for r in group], 50)
+        print(f"  {release:<14} {len(group):5d} {len(won) / len(group):7.0%} {avg:12.2f} {p50:12.1f}")
+
+
+def print_runs(conn, limit=20):
+    """Print the most recent runs."""
+    query = "SELECT id, started, solution, solved, guesses, error FROM runs ORDER BY started DESC LIMIT ?"
+    for run_id, started, solution, solved, guesses, error in conn.execute(query, (limit,)):
+        stamp = time.strftime("%Y-%m-%d %H:%M", time.localtime(started))
+        status = "solved" if solved else "error" if error else "failed"
+        print(f"{run_id:5d} {stamp} {solution or '-':<8} {status:<7} {guesses} guesses  {error or ''}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect the local run history.")
+    parser.add_argument("--db", default=DEFAULT_DB, help="history database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("stats", help="guess distribution, phase latencies and trends")
+    p.add_argument("--days", type=float, help="only runs from the last N days")
+    p.add_argument("--version", help="only runs of this app version")
+
+    p = commands.add_parser("runs", help="list recent runs")
+    p.add_argument("--limit", type=int, default=20)
+
+    p = commands.add_parser("import", help="backfill from saved game traces")
+    p.add_argument("paths", nargs="+", help="trace files or directories")
+
+    args = parser.parse_args(argv)
+    conn = connect(args.db)
+    try:
+        if args.command == "stats":
+            print_stats(conn, args.days, args.version)
+        elif args.command == "runs":
+            print_runs(conn, args.limit)
+        else:
+            added = 0
+            with conn:
+                for path in find_traces(args.paths):
+                    added += insert_run(conn, load_trace(path).to_dict()) is not None
+            print(f"Imported {added} new run(s).")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
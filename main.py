@@ -1,5 +1,28 @@
-from solver import WordleSolver, LetterFrequencyAnalyzer
+from browser import (
+    PLAY_BUTTON_XPATH,
+    TILE_SELECTOR,
+    Cancelled,
+    CancelToken,
+    DriverMonitor,
+    block_urls,
+    chrome_options,
+    install_overlay_watcher,
+    overlay_report,
+    read_board,
+)
+from game_trace import GameTrace
+from history import RunHistory
+from single_instance import SingleInstance
+from solver import (
+    GameState,
+    HardModeGuesses,
+    LookaheadSearch,
+    ResourcePreloader,
+    choose_guess,
+    dictionary_path,
+)
 import os
+import logging
 import threading
 import time
 import requests
@@ -15,7 +38,7 @@ import tkinter as tk
 import chromedriver_autoinstaller
 
 from selenium import webdriver
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -23,49 +46,67 @@ from selenium.webdriver.common.keys import Keys
 
 APP_VERSION = "1.9.0"
 APP_NAME = "Wordle Auto-Solver"
+WORD_LENGTH = 5  # NYT Wordle board width
 
-# --- Single Instance Logic START with Timeout ---
-APP_LOCK_DIR = os.path.join(os.getenv("LOCALAPPDATA", os.getenv("HOME", "/tmp")), APP_NAME)
-LOCK_FILE = os.path.join(APP_LOCK_DIR, "app.lock")
-LOCK_TIMEOUT_SECONDS = 60
+# Optional multi-step lookahead: fewer guesses on hard boards for more CPU per move
+USE_LOOKAHEAD = False
+LOOKAHEAD_OBJECTIVE = "expected"  # or "worst"
+LOOKAHEAD_TIME_BUDGET = 1.0  # seconds per move
+# Match the site's Hard Mode setting: every revealed hint must be used in later guesses
+HARD_MODE = False
 
-os.makedirs(APP_LOCK_DIR, exist_ok=True)
-IS_LOCK_CREATED = False
+APP_DATA_DIR = os.path.join(os.getenv("LOCALAPPDATA", os.getenv("HOME", "/tmp")), APP_NAME)
 
-if os.path.exists(LOCK_FILE):
-    try:
-        lock_age = time.time() - os.path.getmtime(LOCK_FILE)
+# Every game is recorded for `python game_trace.py replay`
+RECORD_TRACES = True
+TRACE_DIR = os.path.join(APP_DATA_DIR, "traces")
 
-        if lock_age > LOCK_TIMEOUT_SECONDS:
-            os.remove(LOCK_FILE)
-            print(f"Removed stale lock file (Age: {int(lock_age)}s).")
-        else:
-            try:
-                temp_root = tk.Tk()
-                temp_root.withdraw()
-                messagebox.showwarning(
-                    f"{APP_NAME} v{APP_VERSION}",
-                    f"{APP_NAME} is already running.\nOnly one instance is allowed.",
-                )
-                temp_root.destroy()
-            except Exception:
-                print("Application is already running.")
+# Every run is also added to a local SQLite history (`python history.py stats`)
+RECORD_HISTORY = True
+HISTORY_DB = os.path.join(APP_DATA_DIR, "history.sqlite3")
+
+# Lean browser profile: eager page loads, ads/trackers blocked, persistent cache.
+# Only measured against mock_site so far; off until verified on the live page.
+USE_LEAN_PROFILE = False
+BROWSER_PROFILE_DIR = os.path.join(APP_DATA_DIR, "chrome-profile")
+
+# Worker threads hand UI updates to the Tk thread through a queue polled this often
+UI_POLL_MS = 100
+
+# Longest a run waits for the background-loaded word list and index
+RESOURCE_TIMEOUT = 60.0
+
+# Stop: seconds the solver thread gets to leave its current wait before its
+# Chrome is quit (which aborts a WebDriver call stuck on a hung page), and the
+# longest the thread is then waited for
+STOP_GRACE = 0.5
+STOP_TIMEOUT = 5.0
 
-            sys.exit(0)
+# --- Single Instance Logic START ---
+# A loopback socket instead of a lock file: the OS frees it when this process
+# exits (even on a crash), and a second launch uses it to show our window.
+INSTANCE_GUARD = SingleInstance(APP_NAME)
 
-    except Exception as e:
-        print(f"Error checking lock file: {e}. Exiting.")
+if not INSTANCE_GUARD.acquire():
+    if INSTANCE_GUARD.notify_running():
         sys.exit(0)
+    # The port is held by something else; better to run unguarded than not at all
+    print("Could not reach the running instance; starting anyway.")
+# --- Single Instance Logic END ---
 
-try:
-    with open(LOCK_FILE, "w") as f:
-        f.write(str(os.getpid()))
-    IS_LOCK_CREATED = True
-except Exception as e:
-    print(f"Could not create lock file: {e}")
-    sys.exit(1)
 
-# --- Single Instance Logic END with Timeout ---
+class TkLogHandler(logging.Handler):
+    """Forwards records from the ``solver`` logger to the app's debug log box."""
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+
+    def emit(self, record):
+        try:
+            self.app.add_log(self.format(record), debug_message=True)
+        except Exception:
+            self.handleError(record)
 
 
 class WordleApp(tk.Tk):
@@ -95,10 +136,22 @@ class WordleApp(tk.Tk):
         # self.theme_combo.bind("<<ComboboxSelected>>", self.change_theme)
 
         self.driver = None
+        self.driver_monitor = None
         self.running = False
         self.thread = None
+        self.cancel_token = None
         self.last_solution = None
 
+        self.history = RunHistory(HISTORY_DB) if RECORD_HISTORY else None
+
+        # Word list, analyzer and index are loaded once in the background and
+        # reused by every run until the dictionary file changes
+        self.resources = ResourcePreloader(dictionary_path(WORD_LENGTH, self.resource_path("assets")), WORD_LENGTH)
+        self.resources.start()
+
+        self.ui_queue = Queue()
+        self.after(UI_POLL_MS, self._drain_ui_queue)
+
         self.tts_queue = Queue()
         self.tts_thread = threading.Thread(target=self._tts_worker, daemon=True)
         self.tts_thread.start()
@@ -164,8 +217,14 @@ class WordleApp(tk.Tk):
         # Debug Log toggle logic
         self.debug = False
 
+        # Solver diagnostics are only formatted when the Debug Log is enabled
+        self.solver_logger = logging.getLogger("solver")
+        self.solver_logger.addHandler(TkLogHandler(self))
+        self.solver_logger.setLevel(logging.WARNING)
+
         def toggle_debug():
             self.debug = bool(self.debug_var.get())
+            self.solver_logger.setLevel(logging.DEBUG if self.debug else logging.WARNING)
 
         self.debug_var = tk.IntVar(value=0)
 
@@ -179,13 +238,8 @@ class WordleApp(tk.Tk):
         # This packs the checkbutton in the middle of the container
         self.debug_check.pack(expand=True)
 
-        # --- Lock Updater Control START ---
-        self.lock_refresh_active = True
-        if "IS_LOCK_CREATED" in globals() and IS_LOCK_CREATED:
-            self.lock_thread = threading.Thread(target=self._lock_updater, daemon=True)
-            self.lock_thread.start()
-            self.add_log("Started lock refresh thread.", debug_message=True)
-        # --- Lock Updater Control END ---
+        # Later launches ask this instance to come to the front
+        INSTANCE_GUARD.serve(lambda: self.post_to_ui(self.bring_to_front))
 
         self.deiconify()
 
@@ -230,26 +284,13 @@ class WordleApp(tk.Tk):
         self.tts_queue.put(self.last_solution)
         self.add_log(f"Added '{self.last_solution}' to TTS queue.", debug_message=True)
 
-    def _lock_updater(self):
-        """
-        Periodically updates the lock file timestamp to keep the lock fresh.
-        Runs in a separate thread.
-        """
-        global IS_LOCK_CREATED
-        if not IS_LOCK_CREATED:
-            return
-
-        while self.lock_refresh_active:
-            try:
-                os.utime(LOCK_FILE, None)
-                self.add_log("Lock file timestamp updated.", debug_message=True)
-            except Exception as e:
-                self.add_log(f"Error refreshing lock: {e}", debug_message=True)
-                break
-
-            time.sleep(LOCK_TIMEOUT_SECONDS / 2)
-
-        self.add_log("Lock refresh thread stopped.", debug_message=True)
+    def bring_to_front(self):
+        """Restores, raises and focuses the window (requested by a second launch)."""
+        self.deiconify()
+        self.lift()
+        self.attributes("-topmost", True)
+        self.after(200, lambda: self.attributes("-topmost", False))
+        self.focus_force()
 
     def show_log_menu(self, event):
         """Shows the context menu on right-click."""
@@ -272,57 +313,57 @@ class WordleApp(tk.Tk):
 
     def on_close(self):
         """Stops the solver, closes the Chrome window, and exits the app."""
-        if self.driver:
-            try:
-                self.driver.execute_script("window.stop();")  # stop loading
-            except Exception:
-                pass
-            try:
-                self.driver.quit()  # close the Chrome window
-            except Exception:
-                pass
-            self.driver = None
-        self.running = False
+        self.stop_solver(wait=True)
 
-        # --- Single Instance Cleanup START ---
-        global IS_LOCK_CREATED
-        if "IS_LOCK_CREATED" in globals() and IS_LOCK_CREATED:
-            self.lock_refresh_active = False
-            try:
-                os.remove(LOCK_FILE)
-            except Exception as e:
-                self.add_log(f"Warning: Could not remove lock file: {e}", debug_message=True)
-        # --- Single Instance Cleanup END ---
+        if self.history:
+            self.history.close()
+
+        INSTANCE_GUARD.release()
 
         self.destroy()
 
-    def check_driver(self):
-        """Periodically checks if the Chrome window is still open. If it was closed,
-        stops the solver and resets the UI."""
+    def post_to_ui(self, func, *args):
+        """Queue ``func(*args)`` to run on the Tk thread; safe to call from any thread."""
+        self.ui_queue.put((func, args))
 
-        if self.driver:
+    def _drain_ui_queue(self):
+        while not self.ui_queue.empty():
+            func, args = self.ui_queue.get_nowait()
             try:
-                self.driver.title
-            except Exception:
-                self.add_log("Chrome window was closed unexpectedly.", debug_message=True)
-                self.running = False
-                self.start_button.config(text="Start")
-                try:
-                    self.driver.quit()
-                except:
-                    pass
-                self.driver = None
-
-    def start_driver_watcher(self):
-        """Periodically checks if the Chrome window is still open. If it was closed,
-        stops the solver and resets the UI."""
-
-        def loop():
-            self.check_driver()
-            if self.running:
-                self.after(2000, loop)
-
-        loop()
+                func(*args)
+            except Exception as e:
+                self.add_log(f"UI update failed: {e}", debug_message=True)
+        self.after(UI_POLL_MS, self._drain_ui_queue)
+
+    def start_driver_monitor(self):
+        """Starts watching the current driver in the background. If the Chrome
+        window is closed, the solver is stopped and the UI reset."""
+        self.stop_driver_monitor()
+        driver = self.driver
+        self.driver_monitor = DriverMonitor(
+            driver, lambda state, detail: self.post_to_ui(self._on_driver_state, driver, state, detail)
+        )
+        self.driver_monitor.start()
+
+    def stop_driver_monitor(self):
+        if self.driver_monitor:
+            self.driver_monitor.stop()
+            self.driver_monitor = None
+
+    def _on_driver_state(self, driver, state, detail):
+        """Applies a driver state change reported by the monitor (Tk thread)."""
+        if driver is not self.driver:
+            return  # report about a session that was already replaced or closed
+
+        if state == "unresponsive":
+            self.add_log(f"Chrome is not responding ({detail}).", debug_message=True)
+        elif state == "alive":
+            self.add_log("Chrome is responsive.", debug_message=True)
+        elif state == "closed":
+            self.add_log(f"Chrome window was closed unexpectedly ({detail}).", debug_message=True)
+            # Same path as Stop: cancel the run, join its thread and quit the
+            # driver off the UI thread; Start stays disabled until that is done
+            self.stop_solver()
 
     def resource_path(self, relative_path):
         """Returns the absolute path to a file in the same directory as the script.
@@ -377,26 +418,52 @@ class WordleApp(tk.Tk):
             self.log_box.config(state=tk.NORMAL)
             self.log_box.delete("1.0", tk.END)
             self.log_box.config(state=tk.DISABLED)
-            self.thread = threading.Thread(target=self.run_solver, daemon=True)
+            self.cancel_token = CancelToken()
+            self.thread = threading.Thread(target=self.run_solver, args=(self.cancel_token,), daemon=True)
             self.thread.start()
         else:
             self.add_log("Stop requested by user.", debug_message=True)
-            self.running = False
+            self.stop_solver()
 
-            if self.driver:
-                try:
-                    self.driver.execute_script("window.stop();")
-                except Exception:
-                    pass
-                try:
-                    self.driver.quit()
-                except Exception:
-                    pass
-                self.driver = None
+    def stop_solver(self, wait=False):
+        """Cancels the running solve, waits for its thread and closes Chrome.
 
-            self.start_button.config(text="Start")
+        The waiting happens on a helper thread (the Start button is disabled
+        until it is done) unless wait is True, as when the app is closing."""
+        self.running = False
+        self.stop_driver_monitor()
+        if self.cancel_token:
+            self.cancel_token.cancel()
+        thread, self.thread = self.thread, None
+        stopper = threading.Thread(target=self._finish_stop, args=(thread, not wait), name="solver-stop", daemon=True)
+        if not wait:
+            self.start_button.config(text="Stopping...", state=tk.DISABLED)
+        stopper.start()
+        if wait:
+            stopper.join()
+
+    def _finish_stop(self, thread, notify):
+        """Joins the cancelled solver thread and quits its driver (helper thread)."""
+        if thread:
+            thread.join(STOP_GRACE)
+        self._quit_driver()  # also unblocks a WebDriver call the thread is stuck in
+        if thread:
+            thread.join(STOP_TIMEOUT)
+            self._quit_driver()  # in case the thread was still starting Chrome
+            if thread.is_alive() and notify:
+                self.post_to_ui(self.add_log, "Solver thread did not stop in time.", True)
+        if notify:
+            self.post_to_ui(self.start_button.config, {"text": "Start", "state": tk.NORMAL})
+
+    def _quit_driver(self):
+        driver, self.driver = self.driver, None
+        if driver:
+            try:
+                driver.quit()
+            except Exception:
+                pass
 
-    def run_solver(self):
+    def run_solver(self, token):
         """
         Starts the Chrome driver, loads the Wordle game page, and begins the solving loop.
 
@@ -405,8 +472,16 @@ class WordleApp(tk.Tk):
         game is solved or the maximum number of attempts is reached.
 
         The function is also responsible for displaying the game page and handling any errors that
-        occur during the solving loop.
+        occur during the solving loop. Every wait and pause goes through ``token`` (a CancelToken),
+        so Stop ends the run within about one poll interval.
         """
+        strategy = {"name": "frequency"}
+        if USE_LOOKAHEAD:
+            strategy = {"name": "lookahead", "objective": LOOKAHEAD_OBJECTIVE, "time_budget": LOOKAHEAD_TIME_BUDGET}
+        if HARD_MODE:
+            strategy["hard_mode"] = True
+        trace = GameTrace(WORD_LENGTH, strategy=strategy, meta={"app_version": APP_VERSION})
+        self.resources.start()  # reloads in parallel with the browser if the dictionary changed
         try:
             # === prepare assets/chromedriver.exe path ===
             local_appdata = os.getenv("LOCALAPPDATA")
@@ -491,27 +566,41 @@ class WordleApp(tk.Tk):
             # final sanity check
             if not chromedriver_path or not os.path.exists(chromedriver_path):
                 raise RuntimeError("No usable chromedriver found/installed.")
+            trace.mark("driver_check")
+            token.check()
 
             # === start real driver using chromedriver_path ===
-            service = Service(chromedriver_path)
-            options = webdriver.ChromeOptions()
-            # keep browser visible (do not use headless)
-            screen_width = self.winfo_screenwidth()
-            screen_height = self.winfo_screenheight()
-
-            # set window size
-            target_width = int(screen_width / 3)
-            target_height = int(screen_height)
-
-            # options.add_argument("--headless=new") # run headless
-            options.add_argument("--disable-gpu")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument(f"--window-size={target_width},{target_height}")
-            options.add_argument("--window-position=0,0")
-
-            self.driver = webdriver.Chrome(service=service, options=options)
-            self.start_driver_watcher()
+            # keep browser visible (do not use headless), one third of the screen wide
+            window_size = (int(self.winfo_screenwidth() / 3), int(self.winfo_screenheight()))
+
+            if USE_LEAN_PROFILE:
+                try:
+                    options = chrome_options(window_size, lean=True, profile_dir=BROWSER_PROFILE_DIR)
+                    self.driver = webdriver.Chrome(service=Service(chromedriver_path), options=options)
+                    block_urls(self.driver)
+                    trace.meta["profile"] = "lean"
+                    self.add_log("Started Chrome with the lean profile.", debug_message=True)
+                except Exception as ex_lean:
+                    # e.g. the profile directory is still held by a crashed Chrome
+                    self.add_log(f"Lean profile unavailable, using default: {ex_lean}", debug_message=True)
+                    if self.driver:
+                        try:
+                            self.driver.quit()
+                        except Exception:
+                            pass
+                        self.driver = None
+            if not self.driver:
+                self.driver = webdriver.Chrome(service=Service(chromedriver_path), options=chrome_options(window_size))
+                trace.meta["profile"] = "default"
+            self.start_driver_monitor()
+            capabilities = self.driver.capabilities
+            trace.meta["browser_version"] = capabilities.get("browserVersion")
+            trace.meta["driver_version"] = (capabilities.get("chrome") or {}).get("chromedriverVersion", "").split(" ")[0]
+            try:
+                install_overlay_watcher(self.driver)
+            except Exception as ex_watch:
+                self.add_log(f"Could not install overlay watcher: {ex_watch}", debug_message=True)
+            trace.mark("driver_start")
 
             self.driver.set_page_load_timeout(10)
             try:
@@ -524,135 +613,135 @@ class WordleApp(tk.Tk):
                     self.add_log("Forced stop sent to browser.", debug_message=True)
                 except Exception as e2:
                     self.add_log(f"Failed to force stop: {e2}", debug_message=True)
+            trace.mark("page_load")
+            token.check()
 
-            # if user pressed Stop meanwhile, stop
-            if not self.running:
-                self.add_log("Stopped by user before clicking buttons.", debug_message=True)
-                return
-
-            # 1) Click "Accept all" (cookie consent) if present
-            try:
-                accept_btn = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable(
-                        (
-                            By.CSS_SELECTOR,
-                            "#fides-button-group > div.fides-banner-button-group.fides-banner-primary-actions > button.fides-banner-button.fides-banner-button-primary.fides-accept-all-button",
-                        )
-                    )
-                )
-                accept_btn.click()
-                self.add_log("Clicked 'Accept all' button.", debug_message=True)
-            except Exception as ex:
-                self.add_log(f"'Accept all' button not found or not clickable: {ex}", debug_message=True)
-
-            # 2) Click "Play" button (start the game) if present
-            play_xpath = "//button[contains(text(),'Play')]"
+            # Consent banner, help dialog, overlays and ads are handled by the overlay watcher.
+            # Click "Play" button (start the game) if present
             try:
-                btn_play = WebDriverWait(self.driver, 15).until(EC.presence_of_element_located((By.XPATH, play_xpath)))
-                # remove overlay via JS
-                self.driver.execute_script(
-                    """
-                    let overlay = document.querySelector('.fides-modal-overlay');
-                    if(overlay) overlay.remove();
-                """
+                btn_play = token.until(
+                    self.driver, EC.presence_of_element_located((By.XPATH, PLAY_BUTTON_XPATH)), 15
                 )
-                # now click via JS
+                # click via JS so a late overlay cannot intercept it
                 self.driver.execute_script("arguments[0].click();", btn_play)
                 self.add_log("Clicked 'Play' button via JS.", debug_message=True)
             except Exception as ex:
                 self.add_log(f"'Play' button not found or not clickable: {ex}", debug_message=True)
                 return
 
-            # Close modal
-            try:
-                close_btn = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "#help-dialog > div > div > button"))
-                )
-                close_btn.click()
-                self.add_log("Clicked 'Close' button.", debug_message=True)
-            except Exception as ex:
-                self.add_log(f"'Close' button not found or not clickable: {ex}", debug_message=True)
-                return
-
-            try:
-                self.driver.execute_script(
-                    """
-                    let ad = document.querySelector("div[class^='Ad-module_adContainer__']");
-                    if(ad) { ad.style.display = 'none'; }
-                """
-                )
-                self.add_log("Ad element hidden (dynamic class handled).", debug_message=True)
-            except Exception as ex:
-                self.add_log(f"Error hiding ad: {ex}", debug_message=True)
+            trace.mark("page_prepare")
 
             # === prepare analyzer and words ===
             try:
-                words_file = self.resource_path(os.path.join("assets", "words_sorted.txt"))
-                with open(words_file, "r", encoding="utf-8") as f:
-                    words = [w.strip() for w in f if w.strip()]
-
-                analyzer = LetterFrequencyAnalyzer(words_file)
-                analyzer.analyze()
+                wait_start = time.perf_counter()
+                future = self.resources.start()
+                token.until(future, lambda f: f.done(), RESOURCE_TIMEOUT, "solver resources not loaded")
+                resources = future.result()
+                waited = time.perf_counter() - wait_start
+                if waited > 0.05:
+                    self.add_log(f"Waited {waited:.2f}s for solver resources.", debug_message=True)
+                words, analyzer, index, solver = resources.words, resources.analyzer, resources.index, resources.solver
 
                 # --- start of replacement loop ---
-                solver = WordleSolver(words)
-                known_pattern = [None] * 5
-                present_letters = set()
-                excluded_letters = set()
-                unknowns = []  # list of (index, letter) accumulated across attempts
-                current_candidates = words[:]  # start with all words
+                search = None
+                if USE_LOOKAHEAD:
+                    search = LookaheadSearch(index, objective=LOOKAHEAD_OBJECTIVE, time_budget=LOOKAHEAD_TIME_BUDGET)
+                game_state = GameState(WORD_LENGTH)
+                hard_mode = HardModeGuesses(index) if HARD_MODE else None
+                current_candidates = words  # start with all words (never mutated)
                 max_attempts = 6
                 solved = False
-                time.sleep(0.2)
+                trace.mark("resources")
+                token.sleep(0.2)
+
+                # Continue from whatever the board already shows (earlier manual
+                # guesses or a run interrupted by Stop)
+                played = []
+                try:
+                    played = read_board(self.driver, WORD_LENGTH)
+                except Exception as ex_board:
+                    self.add_log(f"Could not read the board, starting from Row 1: {ex_board}", debug_message=True)
+                for guess, states in played:
+                    self.add_log(f"Row {len(trace.rows) + 1} already played: '{guess}' {states}", debug_message=True)
+                    if all(s == "correct" for s in states):
+                        self.add_log(f"🎉 Already solved! The word is '{guess}'.")
+                        trace.add_row(guess, states, 1)
+                        trace.solved = True
+                        trace.solution = guess
+                        solved = True
+                        self.translate_button.configure(state=tk.NORMAL)
+                        self.pronounce_button.configure(state=tk.NORMAL)
+                        self.last_solution = guess
+                        break
+                    row_results = [{"letter": l, "state": st} for l, st in zip(guess, states)]
+                    game_state.update(row_results)
+                    if hard_mode is not None:
+                        hard_mode.update(row_results)
+                    current_candidates = solver.candidates_for(game_state)
+                    trace.add_row(guess, states, len(current_candidates))
+                if played and not solved:
+                    self.add_log(f"Resuming at Row {len(played) + 1}, {len(current_candidates)} candidates left.")
+                trace.meta["resumed_rows"] = len(played)
+                trace.mark("resume")
+
+                remaining = range(len(played) + 1, max_attempts + 1) if not solved else range(0)
+                for attempt in remaining:
+                    trace.mark("pauses")
+                    row_timings = {}
 
-                for attempt in range(1, max_attempts + 1):
                     # choose best guess from current candidates using analyzer
-                    top = analyzer.suggest_best_words(word_list=current_candidates, top_n=1)
-                    if not top:
+                    guess = choose_guess(current_candidates, analyzer, search, hard_mode)
+                    trace.mark("choose", row_timings)
+                    if not guess:
                         self.add_log("No candidate for guessing. Stopping.")
                         break
-                    guess = top[0][0]
                     self.add_log(f"Attempt {attempt}: guessing '{guess}'")
 
                     # send guess
                     try:
                         body = self.driver.find_element(By.TAG_NAME, "body")
+                        if attempt == len(played) + 1:
+                            # clear letters left half-typed by an interrupted run
+                            body.send_keys(Keys.BACKSPACE * WORD_LENGTH)
                         for ch in guess:
                             body.send_keys(ch)
-                            time.sleep(0.12)
+                            token.sleep(0.12)
                         body.send_keys(Keys.ENTER)
                         self.add_log(f"Sent '{guess}' to page (typed into body).", debug_message=True)
                     except Exception as e_send:
                         self.add_log(f"Failed to send guess '{guess}': {e_send}", debug_message=True)
                         break
+                    trace.mark("send", row_timings)
 
                     # wait for row element to appear
                     row_selector = f"div[aria-label='Row {attempt}']"
                     try:
-                        row_elem = WebDriverWait(self.driver, 12).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, row_selector))
+                        row_elem = token.until(
+                            self.driver, EC.presence_of_element_located((By.CSS_SELECTOR, row_selector)), 12
                         )
                     except Exception as e:
                         self.add_log(f"Row {attempt} element not found: {e}", debug_message=True)
                         break
 
                     # wait until all tiles in this row have a final state (not 'tbd' or empty)
-                    wait_start = time.time()
-                    tiles = []
-                    while time.time() - wait_start < 12:
-                        tiles = row_elem.find_elements(By.CSS_SELECTOR, "div.Tile-module_tile__UWEHN")
-                        if len(tiles) >= 5:
-                            states = [t.get_attribute("data-state") or "" for t in tiles[:5]]
+                    def row_revealed(driver, row_elem=row_elem):
+                        tiles = row_elem.find_elements(By.CSS_SELECTOR, TILE_SELECTOR)
+                        if len(tiles) >= WORD_LENGTH:
+                            states = [t.get_attribute("data-state") or "" for t in tiles[:WORD_LENGTH]]
                             if all(s and ("tbd" not in s.lower()) for s in states):
-                                break
-                        time.sleep(0.18)
-                    else:
+                                return tiles
+                        return None
+
+                    try:
+                        tiles = token.until(self.driver, row_revealed, 12)
+                    except TimeoutException:
                         self.add_log(f"Row {attempt} not ready (timeout).", debug_message=True)
                         break
+                    trace.mark("wait_row", row_timings)
 
                     # read results
                     results = []
-                    for t in tiles[:5]:
+                    for t in tiles[:WORD_LENGTH]:
                         letter = (t.text or "").strip().lower()
                         state = t.get_attribute("data-state")
                         if not state:
@@ -664,12 +753,16 @@ class WordleApp(tk.Tk):
                             elif "absent" in aria:
                                 state = "absent"
                         results.append({"letter": letter, "state": state})
+                    trace.mark("read", row_timings)
 
                     self.add_log(f"Row {attempt} states: {results}", debug_message=True)
 
                     # check win
                     if all(item["state"] == "correct" for item in results):
                         self.add_log(f"🎉 Solved! The word is '{guess}'.")
+                        trace.add_row(guess, [item["state"] for item in results], 1, row_timings)
+                        trace.solved = True
+                        trace.solution = guess
                         solved = True
                         self.translate_button.configure(state=tk.NORMAL)
                         self.pronounce_button.configure(state=tk.NORMAL)
@@ -677,35 +770,20 @@ class WordleApp(tk.Tk):
                         break
 
                     # update knowledge: known_pattern, present_letters, excluded_letters, unknowns (accumulate)
-                    # row_present = {item["letter"] for item in results if item["state"] == "present"}  # check this late TODO
-
-                    for idx, item in enumerate(results):
-                        l = item["letter"]
-                        s = item["state"]
-                        if not l:
-                            continue
-
-                        if s == "correct":
-                            known_pattern[idx] = l
-                            present_letters.add(l)
-                        elif s == "present":
-                            present_letters.add(l)
-                            if (idx, l) not in unknowns:
-                                unknowns.append((idx, l))
-                        elif s == "absent":
-                            # ALWAYS add to excluded_letters.
-                            # The WordleSolver.filter_candidates will handle the logic
-                            # of whether it means "zero instances" or "no MORE instances".
-                            excluded_letters.add(l)
+                    game_state.update(results)
+                    if hard_mode is not None:
+                        hard_mode.update(results)
 
                     # Log the current state
-                    self.add_log(f"known_pattern: {known_pattern}", debug_message=True)
-                    self.add_log(f"present_letters: {sorted(list(present_letters))}", debug_message=True)
-                    self.add_log(f"excluded_letters: {sorted(list(excluded_letters))}", debug_message=True)
-                    self.add_log(f"unknowns (accumulated): {unknowns}", debug_message=True)
+                    self.add_log(f"known_pattern: {game_state.known_pattern}", debug_message=True)
+                    self.add_log(f"present_letters: {sorted(list(game_state.present_letters))}", debug_message=True)
+                    self.add_log(f"excluded_letters: {sorted(list(game_state.excluded_letters))}", debug_message=True)
+                    self.add_log(f"unknowns (accumulated): {game_state.unknowns}", debug_message=True)
 
                     # filter candidates using updated logic
-                    current_candidates = solver.filter_candidates(known_pattern, unknowns, list(excluded_letters))
+                    current_candidates = solver.candidates_for(game_state)
+                    trace.mark("filter", row_timings)
+                    trace.add_row(guess, [item["state"] for item in results], len(current_candidates), row_timings)
                     self.add_log(f"Candidates left: {len(current_candidates)}")
 
                     if not current_candidates:
@@ -713,18 +791,21 @@ class WordleApp(tk.Tk):
                         break
 
                     # small delay before next attempt
-                    time.sleep(0.4)
+                    token.sleep(0.4)
 
                 # end of attempts
                 if not solved:
                     try:
                         # wait for toast
-                        toast_elem = WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "div.Toast-module_toast__iiVsN"))
+                        toast_elem = token.until(
+                            self.driver,
+                            EC.presence_of_element_located((By.CSS_SELECTOR, "div.Toast-module_toast__iiVsN")),
+                            5,
                         )
                         solution_word = (toast_elem.text or "").strip()
                         if solution_word:
                             self.last_solution = solution_word.lower()
+                            trace.solution = self.last_solution
                             self.add_log(f"❌ Solver failed. The correct word was: '{solution_word}'")
                             self.translate_button.configure(state=tk.NORMAL)
                             self.pronounce_button.configure(state=tk.NORMAL)
@@ -733,107 +814,14 @@ class WordleApp(tk.Tk):
                     except Exception as ex:
                         self.add_log(f"Solver finished (failed to find solution word). Error: {ex}", debug_message=True)
 
-                # --- click on loginPromptCongrats-dialog ---
-                try:
-                    WebDriverWait(self.driver, 20).until(
-                        lambda d: d.execute_script("return document.readyState") == "complete"
-                    )
-
-                    btn1_selector = "#loginPromptCongrats-dialog > div > div > div.Modal-module_fullscreenStatsExit__DpWAs > div > button"
-                    wait = WebDriverWait(self.driver, 15)
-
-                    for attempt in range(3):
-                        try:
-                            btn1 = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, btn1_selector)))
-                            self.driver.execute_script("arguments[0].scrollIntoView(true);", btn1)
-                            self.driver.execute_script("arguments[0].click();", btn1)
-                            self.add_log(
-                                f"[Attempt {attempt+1}] Clicked 'Exit/Continue' button in loginPromptCongrats-dialog.",
-                                debug_message=True,
-                            )
-                            break
-                        except Exception as click_ex:
-                            self.add_log(
-                                f"[Attempt {attempt+1}] loginPromptCongrats-dialog not ready yet: {click_ex}",
-                                debug_message=True,
-                            )
-                            time.sleep(2)
-                    else:
-                        self.add_log(
-                            "Failed to click 'Exit/Continue' in loginPromptCongrats-dialog after 3 attempts.",
-                            debug_message=True,
-                        )
-
-                except Exception as ex:
-                    self.add_log(f"LoginPromptCongrats-dialog click failed: {ex}", debug_message=True)
-
-                # --- wait for next dialog (regiwallCongrats-dialog) ---
-                try:
-                    btn2_selector = "#regiwallCongrats-dialog > div > div > div.Modal-module_fullscreenStatsExit__DpWAs > div > button"
-                    wait = WebDriverWait(self.driver, 20)
-
-                    # Wait for regiwall dialog to appear
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, btn2_selector)))
-                    self.add_log(
-                        "regiwallCongrats-dialog detected, waiting for it to be clickable...", debug_message=True
-                    )
-
-                    for attempt in range(3):
-                        try:
-                            btn2 = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, btn2_selector)))
-                            self.driver.execute_script("arguments[0].scrollIntoView(true);", btn2)
-                            self.driver.execute_script("arguments[0].click();", btn2)
-                            self.add_log(
-                                f"[Attempt {attempt+1}] Clicked 'Exit/Continue' button in regiwallCongrats-dialog.",
-                                debug_message=True,
-                            )
-                            break
-                        except Exception as click_ex:
-                            self.add_log(
-                                f"[Attempt {attempt+1}] regiwallCongrats-dialog not ready yet: {click_ex}",
-                                debug_message=True,
-                            )
-                            time.sleep(2)
-                    else:
-                        self.add_log(
-                            "Failed to click 'Exit/Continue' in regiwallCongrats-dialog after 3 attempts.",
-                            debug_message=True,
-                        )
-
-                except Exception as ex:
-                    self.add_log(f"RegiwallCongrats-dialog click failed: {ex}", debug_message=True)
-
-                finally:
-                    try:
-                        # Remove the entire dialog element if it exists
-                        self.driver.execute_script(
-                            """
-                            const dlg = document.querySelector('#regiwallCongrats-dialog');
-                            if (dlg) dlg.remove();
-                        """
-                        )
-                        self.add_log("regiwallCongrats-dialog element removed from DOM.", debug_message=True)
-                    except Exception as cleanup_ex:
-                        self.add_log(f"Failed to remove regiwallCongrats-dialog: {cleanup_ex}", debug_message=True)
-
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "[id^='lire-ui-']"))
-                    )
-                    self.driver.execute_script(
-                        """
-                        document.querySelectorAll("[id^='lire-ui-']").forEach(el => el.remove());
-                    """
-                    )
-                    self.add_log("Removed all elements with id starting with 'lire-ui-'.", debug_message=True)
-                except Exception as ex:
-                    self.add_log(
-                        f"No elements with id starting with 'lire-ui-' found or could not be removed: {ex}",
-                        debug_message=True,
-                    )
+                # Post-game dialogs and widgets are dismissed by the overlay watcher
+                # whenever they appear; just report what it has done so far
+                self.log_overlays(trace)
                 # --- end of replacement loop ---
+                trace.mark("post_game")
 
             except Exception as ex_first:
+                trace.error = f"Error during solving loop: {ex_first}"
                 self.add_log(f"Error during solving loop: {ex_first}", debug_message=True)
 
                 # time.sleep(3)
@@ -842,9 +830,18 @@ class WordleApp(tk.Tk):
                 #     f.write(page_html)
                 # self.add_log("Saved debug_page.html for inspection.", debug_message=True)
 
+        except Cancelled:
+            # stop_solver() quits the driver once this thread has returned
+            trace.error = "Stopped by user"
         except Exception as ex:
+            if token.cancelled:
+                # a WebDriver call failed because Stop quit the driver under it
+                trace.error = "Stopped by user"
+                return
+            trace.error = f"Error in run_solver: {ex}"
             self.add_log(f"Error in run_solver: {ex}", debug_message=True)
             # cleanup on error
+            self.stop_driver_monitor()
             try:
                 if self.driver:
                     self.driver.quit()
@@ -854,10 +851,37 @@ class WordleApp(tk.Tk):
             self.running = False
             self.start_button.config(text="Start")
         finally:
-            self.check_driver()
+            if token.cancelled:
+                # stop-to-idle latency: from the Stop request to this thread leaving its wait
+                trace.meta["stop_ms"] = round((time.monotonic() - token.cancelled_at) * 1e3, 1)
+                self.post_to_ui(self.add_log, f"Solver stopped after {trace.meta['stop_ms']:.0f} ms.", True)
+            if RECORD_TRACES:
+                self.save_trace(trace)
+            if self.history:
+                self.history.record(trace)
 
         # do NOT quit the driver here on success — leave it open so Stop button can close it later
 
+    def log_overlays(self, trace):
+        """Logs the overlay watcher's actions on this page and stores them in the trace."""
+        try:
+            report = overlay_report(self.driver)
+        except Exception as e:
+            self.add_log(f"Could not read overlay report: {e}", debug_message=True)
+            return
+        trace.meta["overlays"] = report
+        for item in report:
+            status = f"failed: {item['error']}" if item.get("error") else item["action"]
+            self.add_log(f"Overlay '{item['name']}' {status} at {item['ms']} ms.", debug_message=True)
+
+    def save_trace(self, trace):
+        """Writes a finished game trace to TRACE_DIR; failures are only logged."""
+        try:
+            path = trace.save(TRACE_DIR)
+            self.add_log(f"Trace saved to {path}", debug_message=True)
+        except Exception as e:
+            self.add_log(f"Could not save trace: {e}", debug_message=True)
+
     def translate_word(self):
         """Shows a translation of the last solved word from English to Farsi (Persian).
         If no solution is available yet, shows a message box with an appropriate message.
@@ -0,0 +1,277 @@
+"""
+Local stand-in for the NYT Wordle page, for browser benchmarks and testing.
+
+The page reproduces the parts of the real DOM the solver touches: the
+consent banner and overlay, the Play button, the help dialog, the ad
+container, board rows with ``data-state`` tiles, the loss toast, the
+post-game congrats dialogs and the ``lire-ui-`` widgets. Third-party
+scripts, an ad frame and a web font are served under paths containing real
+ad/tracker host names with an artificial delay, so URL blocking and load
+strategies behave here as they would on the real site::
+
+    python mock_site.py --port 8766
+    # http://127.0.0.1:8766/games/wordle/index.html?answer=crane&rows=arose,lint
+
+Query parameters: ``answer`` (default "crane"), ``rows`` (comma-separated
+guesses already played, for resuming) and ``reveal_ms`` (tile flip delay).
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+DEFAULT_PORT = 8766
+PAGE_PATH = "/games/wordle/index.html"
+
+# Loaded by the page like the real site's ad, analytics and font requests
+THIRD_PARTY = [
+    ("script", "/3p/securepubads.g.doubleclick.net/tag/js/gpt.js"),
+    ("script", "/3p/www.googletagmanager.com/gtm.js"),
+    ("script", "/3p/static.chartbeat.com/js/chartbeat.js"),
+    ("script", "/3p/cdn.optimizely.com/js/optimizely.js"),
+    ("iframe", "/3p/tpc.googlesyndication.com/safeframe/ad.html"),
+    ("font", "/3p/g1.nyt.com/fonts/family/franklin/franklin-normal-500.woff2"),
+]
+
+PAGE = """<!doctype html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Wordle (mock)</title>
+<style>
+  @font-face { font-family: franklin; src: url("__FONT__"); }
+  body { font-family: franklin, sans-serif; }
+  .Row-module_row__pwpBq { display: flex; gap: 4px; margin: 4px; }
+  .Tile-module_tile__UWEHN { width: 40px; height: 40px; border: 1px solid #999; text-align: center;
+    line-height: 40px; text-transform: uppercase; }
+  [data-state=correct] { background: #6aaa64; } [data-state=present] { background: #c9b458; }
+  [data-state=absent] { background: #787c7e; }
+  .fides-modal-overlay { position: fixed; inset: 0; background: rgba(0,0,0,.3); }
+</style>
+__SCRIPTS__
+</head>
+<body>
+<div id="fides-overlay-wrapper">
+  <div class="fides-modal-overlay"></div>
+  <div id="fides-button-group">
+    <div class="fides-banner-button-group fides-banner-primary-actions">
+      <button class="fides-banner-button fides-banner-button-primary fides-accept-all-button">Accept all</button>
+    </div>
+  </div>
+</div>
+<div id="welcome"><button type="button" id="play">Play</button></div>
+<div id="app" hidden>
+  <div class="Ad-module_adContainer__mock1">__AD_FRAME__</div>
+  <div id="board"></div>
+</div>
+<script>
+const params = new URLSearchParams(location.search);
+const ANSWER = (params.get("answer") || "crane").toLowerCase();
+const PLAYED = (params.get("rows") || "").split(",").filter(Boolean).map(r => r.toLowerCase());
+const REVEAL_MS = parseInt(params.get("reveal_ms") || "300", 10);
+const ROWS = 6, LEN = ANSWER.length;
+let row = 0, typed = "", over = false;
+
+const board = document.getElementById("board");
+for (let r = 1; r <= ROWS; r++) {
+  const el = document.createElement("div");
+  el.className = "Row-module_row__pwpBq";
+  el.setAttribute("aria-label", "Row " + r);
+  for (let i = 0; i < LEN; i++) {
+    const t = document.createElement("div");
+    t.className = "Tile-module_tile__UWEHN";
+    t.setAttribute("data-state", "empty");
+    t.setAttribute("aria-label", (i + 1) + "th letter, empty");
+    el.appendChild(t);
+  }
+  board.appendChild(el);
+}
+
+function score(guess) {
+  const states = Array(LEN).fill("absent"), left = {};
+  for (let i = 0; i < LEN; i++) {
+    if (guess[i] === ANSWER[i]) states[i] = "correct";
+    else left[ANSWER[i]] = (left[ANSWER[i]] || 0) + 1;
+  }
+  for (let i = 0; i < LEN; i++) {
+    if (states[i] !== "correct" && left[guess[i]]) { states[i] = "present"; left[guess[i]]--; }
+  }
+  return states;
+}
+
+function tiles(r) { return board.children[r].children; }
+
+function paintTyped() {
+  const ts = tiles(row);
+  for (let i = 0; i < LEN; i++) {
+    ts[i].textContent = typed[i] || "";
+    ts[i].setAttribute("data-state", typed[i] ? "tbd" : "empty");
+  }
+}
+
+function showDialog(id) {
+  const d = document.createElement("div");
+  d.id = id;
+  d.innerHTML = '<div><div><div class="Modal-module_fullscreenStatsExit__DpWAs"><div><button>Exit</button></div></div></div></div>';
+  d.querySelector("button").addEventListener("click", () => {
+    d.remove();
+    if (id === "loginPromptCongrats-dialog") setTimeout(() => showDialog("regiwallCongrats-dialog"), 200);
+  });
+  document.body.appendChild(d);
+}
+
+function finish(won) {
+  over = true;
+  if (!won) {
+    const toast = document.createElement("div");
+    toast.className = "Toast-module_toast__iiVsN";
+    toast.textContent = ANSWER.toUpperCase();
+    document.body.appendChild(toast);
+  }
+  setTimeout(() => {
+    showDialog("loginPromptCongrats-dialog");
+    for (let i = 0; i < 2; i++) {
+      const w = document.createElement("div");
+      w.id = "lire-ui-" + i;
+      document.body.appendChild(w);
+    }
+  }, 500);
+}
+
+function submit(instant) {
+  const guess = typed, states = score(guess), ts = tiles(row), r = row;
+  row++; typed = "";
+  const reveal = () => {
+    for (let i = 0; i < LEN; i++) {
+      ts[i].setAttribute("data-state", states[i]);
+      ts[i].setAttribute("aria-label", (i + 1) + "th letter, " + guess[i] + ", " + states[i]);
+    }
+    if (guess === ANSWER) finish(true);
+    else if (r === ROWS - 1) finish(false);
+  };
+  if (instant) reveal(); else setTimeout(reveal, REVEAL_MS);
+}
+
+document.body.addEventListener("keydown", e => {
+  if (over || row >= ROWS || document.getElementById("app").hidden) return;
+  if (e.key === "Enter") { if (typed.length === LEN) submit(false); }
+  else if (e.key === "Backspace") { typed = typed.slice(0, -1); paintTyped(); }
+  else if (/^[a-zA-Z]$/.test(e.key) && typed.length < LEN) { typed += e.key.toLowerCase(); paintTyped(); }
+});
+
+document.querySelector(".fides-accept-all-button").addEventListener("click", () => {
+  document.getElementById("fides-button-group").remove();
+});
+
+if (PLAYED.length) document.getElementById("play").textContent = "Continue";
+document.getElementById("play").addEventListener("click", () => {
+  document.getElementById("welcome").remove();
+  document.getElementById("app").hidden = false;
+  for (const g of PLAYED) { if (!over && row < ROWS) { typed = g; submit(true); } }
+  if (over) return;
+  const help = document.createElement("div");
+  help.id = "help-dialog";
+  help.innerHTML = "<div><div><button aria-label='Close'>X</button></div></div>";
+  help.querySelector("button").addEventListener("click", () => help.remove());
+  document.body.appendChild(help);
+});
+</script>
+</body>
+</html>
+"""
+
+
+def render_page():
+    """Return the mock page HTML with its third-party references filled in."""
+    scripts = "\n".join(f'<script async src="{path}"></script>' for kind, path in THIRD_PARTY if kind == "script")
+    frame = next(path for kind, path in THIRD_PARTY if kind == "iframe")
+    font = next(path for kind, path in THIRD_PARTY if kind == "font")
+    return (
+        PAGE.replace("__SCRIPTS__", scripts)
+        .replace("__AD_FRAME__", f'<iframe src="{frame}" width="300" height="50"></iframe>')
+        .replace("__FONT__", font)
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "WordleMock/1.0"
+
+    def log_message(self, format, *args):  # keep benchmark output clean
+        pass
+
+    def _send(self, status, body, content_type):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.server.hits[url.path] = self.server.hits.get(url.path, 0) + 1
+        if url.path == PAGE_PATH:
+            self._send(200, render_page(), "text/html; charset=utf-8")
+        elif url.path.startswith("/3p/"):
+            time.sleep(self.server.third_party_delay)
+            kind = "text/html" if url.path.endswith(".html") else "application/javascript"
+            self._send(200, "/* third-party */", kind)
+        elif url.path == "/hits":
+            self._send(200, json.dumps(self.server.hits), "application/json")
+        else:
+            self._send(404, "not found", "text/plain")
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, third_party_delay=0.8):
+    """
+    Create (but do not start) the mock site server.
+
+    Parameters:
+        third_party_delay (float): Seconds each ad/tracker/font request takes.
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.third_party_delay = third_party_delay
+    server.hits = {}
+    return server
+
+
+def start_in_background(**kwargs):
+    """Start a mock server on a free port; returns ``(server, base_url)``."""
+    server = make_server(port=0, **kwargs)
+    threading.Thread(target=server.serve_forever, name="mock-site", daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def page_url(base_url, answer="crane", rows=(), **params):
+    """URL of the mock game page for ``answer`` with ``rows`` already played."""
+    query = {"answer": answer, **params}
+    if rows:
+        query["rows"] = ",".join(rows)
+    return f"{base_url}{PAGE_PATH}?" + "&".join(f"{k}={v}" for k, v in query.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the mock Wordle page.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--third-party-delay", type=float, default=0.8, help="seconds per ad/tracker request")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.third_party_delay)
+    print(f"Mock Wordle page at http://{args.host}:{args.port}{PAGE_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
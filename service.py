@@ -0,0 +1,461 @@
+"""
+Local HTTP/JSON service around the solver core.
+
+Tools that only need "given these feedback rows, what's the next guess?"
+can ask a long-running service instead of loading the dictionary and
+analyzer themselves. Start it with::
+
+    python service.py --port 8765
+
+and query it with SolverClient or any HTTP client::
+
+    POST /next-guess  {"rows": [{"guess": "arose", "feedback": "bybbg"}], "strategy": "frequency"}
+    GET  /stats
+    GET  /health
+
+Feedback is either a list of tile states ("correct"/"present"/"absent") or
+a string with one character per tile: g/c = correct, y/p = present,
+b/a/x/./- = absent.
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from solver import (
+    DEFAULT_LENGTH,
+    FEEDBACK_DIGITS,
+    SUPPORTED_LENGTHS,
+    Feedback,
+    LetterFrequencyAnalyzer,
+    LookaheadSearch,
+    choose_guess,
+    dictionary_path,
+    load_index,
+    percentile,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+STRATEGIES = ("frequency", "lookahead")
+FEEDBACK_CHARS = {
+    "g": "correct",
+    "c": "correct",
+    "y": "present",
+    "p": "present",
+    "b": "absent",
+    "a": "absent",
+    "x": "absent",
+    ".": "absent",
+    "-": "absent",
+}
+
+
+def available_lengths():
+    """Word lengths whose dictionary is present."""
+    return tuple(length for length in SUPPORTED_LENGTHS if os.path.exists(dictionary_path(length)))
+
+
+def parse_rows(rows, length=DEFAULT_LENGTH):
+    """
+    Validate feedback rows and normalise them to Feedback records.
+
+    Raises:
+        ValueError: if a row is malformed.
+    """
+    parsed = []
+    for row in rows:
+        guess = str(row.get("guess", "")).strip().lower()
+        feedback = row.get("feedback")
+        if len(guess) != length or not guess.isascii() or not guess.isalpha():
+            raise ValueError(f"Invalid guess: {guess!r}")
+        if isinstance(feedback, str):
+            try:
+                states = [FEEDBACK_CHARS[ch] for ch in feedback.strip().lower()]
+            except KeyError as e:
+                raise ValueError(f"Invalid feedback character: {e.args[0]!r}") from None
+        elif isinstance(feedback, list) and all(s in FEEDBACK_DIGITS for s in feedback):
+            states = feedback
+        else:
+            raise ValueError(f"Invalid feedback: {feedback!r}")
+        if len(states) != length:
+            raise ValueError(f"Feedback for {guess!r} must have {length} tiles")
+        parsed.append(Feedback.from_states(guess, states))
+    return tuple(parsed)
+
+
+class ServiceStats:
+    """Rolling latency and throughput counters for the service."""
+
+    def __init__(self, window=10000):
+        self.started = time.time()
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency, cached=False, error=False):
+        with self._lock:
+            self.requests += 1
+            self.cache_hits += cached
+            self.errors += error
+            self.latencies.append(latency)
+
+    def record_batch(self, size):
+        with self._lock:
+            self.batches += 1
+            self.batched_requests += size
+
+    def snapshot(self):
+        """Return the counters plus latency percentiles (milliseconds) as a dict."""
+        with self._lock:
+            latencies = list(self.latencies)
+            uptime = time.time() - self.started
+
+            def pct(p):
+                return round(percentile(latencies, p) * 1e3, 3)
+
+            return {
+                "uptime_s": round(uptime, 1),
+                "requests": self.requests,
+                "throughput_rps": round(self.requests / uptime, 2) if uptime else 0.0,
+                "cache_hits": self.cache_hits,
+                "errors": self.errors,
+                "batches": self.batches,
+                "avg_batch_size": round(self.batched_requests / self.batches, 2) if self.batches else 0.0,
+                "latency_ms": {"p50": pct(50), "p95": pct(95), "p99": pct(99)},
+            }
+
+
+class _Engine:
+    """Per-length resources: shared index, frequency analyzer and lookahead search."""
+
+    def __init__(self, length, lookahead_budget):
+        self.index = load_index(length)
+        self.analyzer = LetterFrequencyAnalyzer(dictionary_path(length))
+        self.analyzer.analyze()
+        self.search = LookaheadSearch(self.index, time_budget=lookahead_budget)
+
+
+class SolverService:
+    """
+    Answers next-guess queries from one set of preloaded indexes.
+
+    Misses are queued and a single batcher thread drains them in small
+    batches. Identical states in a batch are coalesced into one solve, and
+    all rows in a batch that extend the same state with the same guess are
+    split by one vectorized feedback pass over that state's candidates.
+    Candidate masks and guesses are kept in LRU caches (hits refresh their
+    entry), so repeated states and shared prefixes (e.g. the same opener)
+    are answered at once.
+
+    A request's engine (index, analyzer) is built on the request's thread
+    before it is queued, so the batcher never stalls on loading a
+    dictionary; lengths without one are rejected up front.
+
+    Parameters:
+        lengths (iterable[int], optional): Word lengths to serve (default:
+            every length with a dictionary present).
+        batch_window (float): Seconds the batcher waits to fill a batch.
+        max_batch (int): Upper bound on requests per batch.
+        cache_size (int): Entries kept in each LRU cache.
+        lookahead_budget (float): Time budget per lookahead decision.
+    """
+
+    def __init__(self, lengths=None, batch_window=0.002, max_batch=64, cache_size=50000, lookahead_budget=0.5):
+        self.lengths = tuple(available_lengths() if lengths is None else lengths)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.cache_size = cache_size
+        self.lookahead_budget = lookahead_budget
+        self.stats = ServiceStats()
+        self._engines = {}
+        self._engines_lock = threading.Lock()
+        self._masks = OrderedDict()
+        self._answers = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._batch_loop, name="solver-batcher", daemon=True)
+        self._worker.start()
+
+    def engine(self, length=DEFAULT_LENGTH):
+        """
+        Return the resources for ``length``, loading them on first use.
+
+        Raises:
+            ValueError: if ``length`` is not served.
+        """
+        if length not in self.lengths:
+            raise ValueError(f"Unsupported word length: {length} (available: {', '.join(map(str, self.lengths))})")
+        with self._engines_lock:
+            if length not in self._engines:
+                self._engines[length] = _Engine(length, self.lookahead_budget)
+            return self._engines[length]
+
+    def close(self):
+        """Stop the batcher thread."""
+        self._queue.put(None)
+
+    def next_guess(self, rows, length=DEFAULT_LENGTH, strategy="frequency", timeout=30):
+        """
+        Return the next guess for a board described by its feedback rows.
+
+        Parameters:
+            rows (list[dict]): ``{"guess": str, "feedback": str | list[str]}`` per row.
+            length (int): Word length.
+            strategy (str): "frequency" (the GUI heuristic) or "lookahead".
+            timeout (float): Seconds to wait for a queued request.
+
+        Returns:
+            dict: ``{"guess": str | None, "candidates": int, "cached": bool}``.
+
+        Raises:
+            ValueError: for malformed rows, an unknown strategy or a length
+                without a dictionary.
+        """
+        start = time.perf_counter()
+        try:
+            if strategy not in STRATEGIES:
+                raise ValueError(f"Unknown strategy: {strategy!r}")
+            self.engine(length)  # loads here, never on the batcher thread
+            key = (length, strategy, parse_rows(rows, length))
+            answer = self._lookup(self._answers, key)
+            if answer is None:
+                future = Future()
+                self._queue.put((key, future))
+                answer = future.result(timeout)
+                cached = False
+            else:
+                cached = True
+        except Exception:
+            self.stats.record(time.perf_counter() - start, error=True)
+            raise
+        self.stats.record(time.perf_counter() - start, cached=cached)
+        return dict(answer, cached=cached)
+
+    def _lookup(self, cache, key):
+        """Cached value for ``key`` (marked most recently used), or None."""
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _remember(self, cache, key, value):
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+
+    def _mask_for(self, length, rows):
+        """Candidate mask after ``rows``, reusing the longest cached prefix."""
+        index = self.engine(length).index
+        depth = len(rows)
+        mask = None
+        while depth:
+            mask = self._lookup(self._masks, (length, rows[:depth]))
+            if mask is not None:
+                break
+            depth -= 1
+        if not depth:
+            mask = index.full_mask
+        for i in range(depth, len(rows)):
+            mask = index.consistent_mask(mask, rows[i].guess, rows[i].code)
+            self._remember(self._masks, (length, rows[: i + 1]), mask)
+        return mask
+
+    def _split_batch(self, keys):
+        """
+        Fill the mask cache for every state in a batch, level by level.
+
+        Missing states that extend the same parent with the same guess are
+        split together by one partition_masks (vectorized feedback) pass.
+        """
+        for level in range(1, max((len(k[2]) for k in keys), default=0) + 1):
+            groups = {}
+            for length, _, rows in keys:
+                if len(rows) >= level and self._lookup(self._masks, (length, rows[:level])) is None:
+                    parent = rows[: level - 1]
+                    groups.setdefault((length, parent, rows[level - 1].guess), set()).add(rows[:level])
+            for (length, parent, guess), children in groups.items():
+                index = self.engine(length).index
+                mask = self._mask_for(length, parent)
+                buckets = index.partition_masks(mask, guess)
+                for rows in children:
+                    self._remember(self._masks, (length, rows), buckets.get(rows[-1].code, 0))
+
+    def _solve(self, key):
+        length, strategy, rows = key
+        engine = self.engine(length)
+        mask = self._mask_for(length, rows)
+        candidates = engine.index.words_of(mask)
+        search = engine.search if strategy == "lookahead" else None
+        guess = choose_guess(candidates, engine.analyzer, search) if candidates else None
+        return {"guess": guess, "candidates": len(candidates)}
+
+    def _batch_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+
+            self.stats.record_batch(len(batch))
+            pending = {}
+            for key, future in batch:
+                pending.setdefault(key, []).append(future)
+            try:
+                self._split_batch(list(pending))
+            except Exception:
+                logger.exception("Batch split failed; solving its states one by one")
+            # Shorter prefixes first so longer states reuse their masks
+            for key in sorted(pending, key=lambda k: len(k[2])):
+                try:
+                    answer = self._lookup(self._answers, key) or self._solve(key)
+                    self._remember(self._answers, key, answer)
+                    for future in pending[key]:
+                        future.set_result(answer)
+                except Exception as e:
+                    logger.exception("Failed to solve %r", key)
+                    for future in pending[key]:
+                        future.set_exception(e)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service = None  # set by make_server
+    # Keep-alive: clients reuse one connection instead of opening one per request
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._reply(200, self.service.stats.snapshot())
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        except ValueError:
+            self.close_connection = True  # the unread body would corrupt the next request
+            self._reply(400, {"error": "invalid Content-Length"})
+            return
+        if self.path != "/next-guess":
+            self._reply(404, {"error": "not found"})
+            return
+        try:
+            request = json.loads(body or b"{}")
+            result = self.service.next_guess(
+                request.get("rows", []),
+                length=int(request.get("length", DEFAULT_LENGTH)),
+                strategy=request.get("strategy", "frequency"),
+            )
+        except (ValueError, TypeError, AttributeError) as e:
+            self._reply(400, {"error": str(e)})
+        except Exception as e:
+            self._reply(500, {"error": str(e)})
+        else:
+            self._reply(200, result)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Listen backlog; the default of 5 resets connections under a burst of clients
+    request_queue_size = 128
+
+
+def make_server(service, host="127.0.0.1", port=DEFAULT_PORT):
+    """Create (but do not start) an HTTP server bound to ``service``."""
+    handler = type("SolverRequestHandler", (_Handler,), {"service": service})
+    return _Server((host, port), handler)
+
+
+class SolverClient:
+    """Minimal client for a running solver service."""
+
+    def __init__(self, base_url=f"http://127.0.0.1:{DEFAULT_PORT}", timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def next_guess(self, rows, length=DEFAULT_LENGTH, strategy="frequency"):
+        """Ask for the next guess; returns the service's JSON reply as a dict."""
+        response = self.session.post(
+            f"{self.base_url}/next-guess",
+            json={"rows": rows, "length": length, "strategy": strategy},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self):
+        """Fetch the service's latency/throughput counters."""
+        response = self.session.get(f"{self.base_url}/stats", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local solver service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--batch-window", type=float, default=0.002, help="seconds to wait to fill a batch")
+    parser.add_argument("--lookahead-budget", type=float, default=0.5, help="seconds per lookahead decision")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
+    service = SolverService(batch_window=args.batch_window, lookahead_budget=args.lookahead_budget)
+    for length in service.lengths:
+        service.engine(length)  # load every index before accepting requests
+    server = make_server(service, args.host, args.port)
+    logger.info("Solver service listening on http://%s:%d", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
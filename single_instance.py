@@ -0,0 +1,97 @@
+"""
+Single-instance guard backed by a loopback socket.
+
+The first instance binds a fixed 127.0.0.1 port and listens on it; the OS
+releases the port the moment that process exits or crashes, so there is no
+lock file to refresh or expire. A later launch that cannot bind connects
+instead, asks the running instance to show its window and exits.
+"""
+
+import logging
+import socket
+import threading
+import zlib
+
+logger = logging.getLogger(__name__)
+
+SHOW_COMMAND = b"show"
+
+
+class SingleInstance:
+    """
+    Parameters:
+        name (str): Application name; picks the port and is echoed in the
+            handshake so an unrelated program on the same port is not
+            mistaken for a running instance.
+        port (int, optional): Loopback port (default: derived from ``name``).
+    """
+
+    def __init__(self, name, port=None):
+        self.name = name
+        self.port = port or 40000 + zlib.crc32(name.encode("utf-8")) % 20000
+        self._socket = None
+
+    def acquire(self):
+        """Try to become the running instance; returns False if another one holds the port."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if hasattr(socket, "SO_EXCLUSIVEADDRUSE"):  # Windows: refuse to share the port
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+        else:  # elsewhere a second listener is refused anyway; don't trip on TIME_WAIT
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind(("127.0.0.1", self.port))
+            sock.listen(4)
+        except OSError:
+            sock.close()
+            return False
+        self._socket = sock
+        return True
+
+    def notify_running(self, timeout=2.0):
+        """
+        Ask the running instance to bring its window forward.
+
+        Returns:
+            bool: True if an instance of this application answered.
+        """
+        try:
+            with socket.create_connection(("127.0.0.1", self.port), timeout=timeout) as conn:
+                conn.sendall(SHOW_COMMAND + b"\n")
+                reply = conn.makefile("rb").readline().strip()
+        except OSError:
+            return False
+        return reply == self.name.encode("utf-8")
+
+    def serve(self, on_show):
+        """Answer later launches from a daemon thread, calling ``on_show()`` for each."""
+        threading.Thread(target=self._serve, args=(on_show,), name="single-instance", daemon=True).start()
+
+    def _serve(self, on_show):
+        sock = self._socket
+        while sock is not None:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                break  # released
+            with conn:
+                try:
+                    conn.settimeout(2.0)
+                    command = conn.makefile("rb").readline().strip()
+                    conn.sendall(self.name.encode("utf-8") + b"\n")
+                except OSError:
+                    continue
+            if command == SHOW_COMMAND:
+                try:
+                    on_show()
+                except Exception as e:
+                    logger.warning("Show request failed: %s", e)
+
+    def release(self):
+        """Give up the port (also happens automatically when the process exits)."""
+        sock, self._socket = self._socket, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)  # wakes a blocked accept() on Linux
+            except OSError:
+                pass
+            sock.close()
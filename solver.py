@@ -1,7 +1,168 @@
 import os
+import logging
 import requests
 import re
+import math
+import heapq
+import threading
+import time
+from bisect import bisect_left
 from collections import Counter
+from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # optional: vectorized scoring falls back to pure Python
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class SolverMetrics:
+    """
+    Lightweight counters for the solver's filtering stages.
+
+    Each stage keeps the number of candidates it produced on the last call
+    (``last``) and a running total across calls (``totals``), so tooling can
+    read the same numbers the debug log shows without parsing stdout.
+    Safe to update from several threads (e.g. the scorer pool).
+
+    A backend that applies all clues in one pass (the trie) has no stage
+    sizes of its own; it only works them out while ``detailed`` is True or
+    the ``solver`` logger is at DEBUG level.
+    """
+
+    def __init__(self):
+        self.detailed = False
+        self.calls = Counter()
+        self.totals = Counter()
+        self.last = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, count):
+        """Record that ``stage`` left ``count`` candidates."""
+        with self._lock:
+            self.calls[stage] += 1
+            self.totals[stage] += count
+            self.last[stage] = count
+
+    def snapshot(self):
+        """Return a plain-dict copy of all counters."""
+        with self._lock:
+            return {"calls": dict(self.calls), "totals": dict(self.totals), "last": dict(self.last)}
+
+    def want_details(self):
+        """Whether optional stage sizes should be computed."""
+        return self.detailed or logger.isEnabledFor(logging.DEBUG)
+
+    def reset(self):
+        """Clear all counters."""
+        with self._lock:
+            self.calls.clear()
+            self.totals.clear()
+            self.last.clear()
+
+
+metrics = SolverMetrics()
+
+# Tile states as used on the Wordle page, mapped to base-3 feedback digits
+FEEDBACK_DIGITS = {"absent": 0, "present": 1, "correct": 2}
+FEEDBACK_STATES = ("absent", "present", "correct")
+# Compact one-character-per-tile form used by traces and the service
+STATE_CHARS = {"correct": "g", "present": "y", "absent": "b"}
+
+DEFAULT_LENGTH = 5
+SUPPORTED_LENGTHS = range(4, 9)
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+# Guess x candidate cells below which scoring stays on the calling thread
+PARALLEL_THRESHOLD = 250000
+# Guesses per vectorized block (bounds the temporary G x C x L arrays)
+SCORING_CHUNK = 64
+
+
+def score_feedback(guess, answer):
+    """
+    Compute the Wordle feedback for ``guess`` against ``answer``.
+
+    The result is encoded as a base-3 integer with one digit per position
+    (0 = absent, 1 = present, 2 = correct, most significant digit first),
+    so a full row of greens is ``3 ** len(guess) - 1``.
+    """
+    if len(set(guess)) == len(guess):
+        # Fast path: without repeated guess letters there is no budget to track
+        code = 0
+        for g, a in zip(guess, answer):
+            code = code * 3 + (2 if g == a else 1 if g in answer else 0)
+        return code
+
+    digits = [0] * len(guess)
+    remaining = {}
+    for i, a in enumerate(answer):
+        if guess[i] == a:
+            digits[i] = 2
+        else:
+            remaining[a] = remaining.get(a, 0) + 1
+
+    code = 0
+    for i, g in enumerate(guess):
+        digit = digits[i]
+        if digit == 0 and remaining.get(g, 0):
+            digit = 1
+            remaining[g] -= 1
+        code = code * 3 + digit
+    return code
+
+
+def feedback_from_states(states):
+    """Encode a row of tile states ("correct"/"present"/"absent") as a feedback code."""
+    code = 0
+    for state in states:
+        code = code * 3 + FEEDBACK_DIGITS[state]
+    return code
+
+
+def states_from_feedback(code, length=DEFAULT_LENGTH):
+    """Decode a feedback code back into a row of tile states."""
+    states = []
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        states.append(FEEDBACK_STATES[digit])
+    return states[::-1]
+
+
+def states_to_string(states):
+    """Encode tile states as a compact string such as "gybbb" ("?" for unknown tiles)."""
+    return "".join(STATE_CHARS.get(s, "?") for s in states)
+
+
+def states_from_string(text):
+    """Decode a string produced by states_to_string (unknown tiles become None)."""
+    lookup = {c: s for s, c in STATE_CHARS.items()}
+    return [lookup.get(c) for c in text]
+
+
+def solved_code(length=DEFAULT_LENGTH):
+    """Return the feedback code of an all-green row."""
+    return 3**length - 1
+
+
+def percentile(values, pct):
+    """Return the ``pct`` percentile of ``values`` (nearest-rank)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def entropy(counts, total):
+    """Shannon entropy (in bits) of a partition given its bucket sizes."""
+    if total <= 0:
+        return 0.0
+    log2 = math.log2
+    return -sum(c / total * log2(c / total) for c in counts)
 
 
 class DictionaryDownloader:
@@ -15,46 +176,93 @@ class DictionaryDownloader:
         """Download the dictionary from the given url and save it to
         the given directory under the given filename.
 
-        Prints a message on success or failure.
+        Logs a message on success or failure.
 
         :raises requests.RequestException: if there is an error downloading
             the file.
         """
         save_path = os.path.join(self.save_dir, self.filename)
         try:
-            print(f"Downloading dictionary from {self.url} ...")
+            logger.info("Downloading dictionary from %s ...", self.url)
             response = requests.get(self.url)
             response.raise_for_status()
             with open(save_path, "wb") as f:
                 f.write(response.content)
-            print(f"Saved dictionary to {save_path}")
+            logger.info("Saved dictionary to %s", save_path)
         except requests.RequestException as e:
-            print(f"Error downloading file: {e}")
+            logger.error("Error downloading file: %s", e)
+
+
+def dictionary_path(length=DEFAULT_LENGTH, assets_dir=ASSETS_DIR):
+    """
+    Return the path of the sorted dictionary for ``length``-letter words.
+
+    The 5-letter list keeps its historical name ``words_sorted.txt``; other
+    lengths live next to it as ``words_<length>_sorted.txt``.
+    """
+    if length == DEFAULT_LENGTH:
+        return os.path.join(assets_dir, "words_sorted.txt")
+    return os.path.join(assets_dir, f"words_{length}_sorted.txt")
+
+
+def load_words(length=DEFAULT_LENGTH, path=None):
+    """Read the dictionary for ``length``-letter words, skipping blank lines."""
+    path = path or dictionary_path(length)
+    with open(path, "r", encoding="utf-8") as f:
+        return [w for w in (line.strip() for line in f) if len(w) == length]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def load_index(length=DEFAULT_LENGTH, path=None):
+    """
+    Return the shared WordIndex for ``length``-letter words.
+
+    Indexes are built on first request and cached per length, so a session
+    that only plays 5-letter games never loads the other dictionaries.
+
+    Raises:
+        ValueError: if ``length`` is outside SUPPORTED_LENGTHS.
+        FileNotFoundError: if the dictionary for that length is missing.
+    """
+    if length not in SUPPORTED_LENGTHS:
+        raise ValueError(f"Unsupported word length: {length}")
+    key = (length, path)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = WordIndex(load_words(length, path))
+            logger.info("Loaded %d-letter index (%d words)", length, len(_indexes[key]))
+        return _indexes[key]
 
 
 class WordFilter:
-    def __init__(self, input_path="dict/words.txt", output_path="dict/words_filtered.txt"):
+    def __init__(self, input_path="dict/words.txt", output_path="dict/words_filtered.txt", length=DEFAULT_LENGTH):
+        if length not in SUPPORTED_LENGTHS:
+            raise ValueError(f"Unsupported word length: {length}")
         self.input_path = input_path
         self.output_path = output_path
-        self.pattern = re.compile(r"^[a-z]{5}$")
+        self.length = length
+        self.pattern = re.compile(rf"^[a-z]{{{length}}}$")
 
     def filter_and_save(self):
         """
         Filters a list of words from the input file, keeping only those that match
-        the specified pattern (5-letter lowercase words), and saves the filtered
+        the specified pattern (lowercase words of self.length letters), and saves the filtered
         list in sorted order to the output file. If the input file is not found,
-        prints a message and exits.
+        logs a message and exits.
 
         The function ensures that the words are unique and sorted alphabetically
         before writing them to the output file.
 
-        Prints the number of words saved to the output file.
+        Logs the number of words saved to the output file.
 
         :raises FileNotFoundError: if the input file does not exist.
         """
 
         if not os.path.exists(self.input_path):
-            print(f"File {self.input_path} not found!")
+            logger.error("File %s not found!", self.input_path)
             return
 
         words_set = set()
@@ -66,24 +274,416 @@ class WordFilter:
                     words_set.add(word)
 
         sorted_words = sorted(words_set)
+        if not sorted_words:
+            # e.g. a 5-letter-only source: keep the list already there
+            logger.warning("No %d-letter words in %s; %s left unchanged.", self.length, self.input_path, self.output_path)
+            return
 
         with open(self.output_path, "w", encoding="utf-8") as outfile:
             for word in sorted_words:
                 outfile.write(word + "\n")
 
-        print(f"Filtered words saved to {self.output_path}, total {len(sorted_words)} words.")
+        logger.info("Filtered words saved to %s, total %d words.", self.output_path, len(sorted_words))
+
+
+@dataclass(frozen=True, slots=True)
+class Feedback:
+    """
+    One played row: the guess and its feedback code.
+
+    Parameters:
+        guess (str): Word played.
+        code (int): Feedback code (see score_feedback).
+    """
+
+    guess: str
+    code: int
+
+    @classmethod
+    def from_states(cls, guess, states):
+        return cls(guess, feedback_from_states(states))
+
+    @property
+    def states(self):
+        return states_from_feedback(self.code, len(self.guess))
+
+
+@dataclass(slots=True)
+class GameState:
+    """
+    Accumulated clues for a single board, in the shape filter_candidates expects.
+
+    Parameters:
+        length (int): Word length of the board.
+    """
+
+    length: int = DEFAULT_LENGTH
+    known_pattern: list = field(init=False)
+    present_letters: set = field(init=False, default_factory=set)
+    excluded_letters: set = field(init=False, default_factory=set)
+    unknowns: list = field(init=False, default_factory=list)  # (index, letter) accumulated across attempts
+
+    def __post_init__(self):
+        self.known_pattern = [None] * self.length
+
+    def update(self, results):
+        """
+        Fold one row of feedback into the clues.
+
+        Parameters:
+            results (list[dict]): One ``{"letter": str, "state": str}`` per tile.
+        """
+        for idx, item in enumerate(results[: self.length]):
+            self._add(idx, item["letter"], item["state"])
+
+    def apply(self, feedback):
+        """Fold a Feedback row into the clues."""
+        for idx, (l, s) in enumerate(zip(feedback.guess, feedback.states)):
+            self._add(idx, l, s)
+
+    def update_from_feedback(self, guess, code):
+        """Fold a guess and its feedback code into the clues."""
+        self.apply(Feedback(guess, code))
+
+    def _add(self, idx, l, s):
+        if not l:
+            return
+
+        if s == "correct":
+            self.known_pattern[idx] = l
+            self.present_letters.add(l)
+        elif s == "present":
+            self.present_letters.add(l)
+            if (idx, l) not in self.unknowns:
+                self.unknowns.append((idx, l))
+        elif s == "absent":
+            # ALWAYS add to excluded_letters.
+            # The WordleSolver.filter_candidates will handle the logic
+            # of whether it means "zero instances" or "no MORE instances".
+            self.excluded_letters.add(l)
+
+
+@dataclass(frozen=True, slots=True)
+class FilterConstraints:
+    """
+    Clues in the normalized form every filter backend consumes.
+
+    Parameters:
+        fixed (tuple[tuple[int, str], ...]): ``(position, letter)`` that must match.
+        banned (tuple[tuple[int, str], ...]): ``(position, letter)`` that must not match.
+        min_counts (dict[str, int]): Letters the word must contain at least this often.
+        max_counts (dict[str, int]): Letters the word may contain at most this often (0 = absent).
+    """
+
+    fixed: tuple = ()
+    banned: tuple = ()
+    min_counts: dict = field(default_factory=dict)
+    max_counts: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_clues(cls, known_pattern, unknowns, excluded_letters):
+        """Build constraints from filter_candidates' arguments, with the same semantics."""
+        fixed = tuple((i, ch) for i, ch in enumerate(known_pattern) if ch)
+        banned = tuple((i, ch) for i, ch in unknowns)
+        min_counts = dict.fromkeys((ch for _, ch in unknowns), 1)
+        confirmed = Counter(ch for _, ch in fixed) + Counter(ch for _, ch in unknowns)
+        # A grey tile for a confirmed letter caps its count at the number of
+        # clues naming it; any other grey letter is absent
+        max_counts = {ch: confirmed[ch] for ch in excluded_letters}
+        return cls(fixed, banned, min_counts, max_counts)
+
+    def matches(self, word):
+        """Reference check of one word against the constraints."""
+        return (
+            all(word[i] == ch for i, ch in self.fixed)
+            and all(word[i] != ch for i, ch in self.banned)
+            and all(word.count(ch) >= n for ch, n in self.min_counts.items())
+            and all(word.count(ch) <= n for ch, n in self.max_counts.items())
+        )
+
+
+class ScanFilter:
+    """
+    The original engine: one regex for the known positions, then one list
+    comprehension per remaining clue over the surviving words.
+
+    Every backend records the same stage sizes in the module-level
+    ``metrics``: ``known_positions``, then ``unknown_positions`` (if there
+    are yellow clues) and ``excluded_letters`` (if there are grey ones).
+    The trie does so only when ``metrics.want_details()``.
+    """
+
+    name = "scan"
+
+    def __init__(self, index):
+        self.index = index
+
+    def filter(self, constraints, among=None):
+        """
+        Return the words of ``among`` (default: the whole index) that satisfy
+        ``constraints``, in index order. Words of ``among`` that are not in
+        the index are ignored.
+        """
+        source = words = self.index.words if among is None else among
+        if constraints.fixed:
+            pattern = ["."] * self.index.length
+            for i, ch in constraints.fixed:
+                pattern[i] = ch
+            match = re.compile("".join(pattern)).match
+            words = [w for w in words if match(w)]
+        metrics.record("known_positions", len(words))
+        if constraints.banned or constraints.min_counts:
+            for i, ch in constraints.banned:
+                words = [w for w in words if w[i] != ch]
+            for ch, n in constraints.min_counts.items():
+                words = [w for w in words if ch in w] if n == 1 else [w for w in words if w.count(ch) >= n]
+            metrics.record("unknown_positions", len(words))
+        if constraints.max_counts:
+            for ch, n in constraints.max_counts.items():
+                words = [w for w in words if ch not in w] if n == 0 else [w for w in words if w.count(ch) <= n]
+            metrics.record("excluded_letters", len(words))
+        if among is not None:
+            # Only the survivors are sorted, which is cheap next to the scan
+            position = self.index.position
+            return sorted((w for w in words if w in position), key=position.__getitem__)
+        return list(words) if words is source else words
+
+
+class BitsetFilter:
+    """One AND (or AND NOT) per clue with the WordIndex's precomputed bitsets."""
+
+    name = "bitset"
+
+    def __init__(self, index):
+        self.index = index
+
+    def mask(self, constraints, among=None):
+        """
+        Same as filter(), but take and return candidate sets as bitsets.
+
+        Stage sizes are recorded in the module-level ``metrics``.
+        """
+        index = self.index
+        mask = index.full_mask if among is None else among
+        for i, ch in constraints.fixed:
+            mask &= index.position_mask(i, ch)
+        metrics.record("known_positions", mask.bit_count())
+        if constraints.banned or constraints.min_counts:
+            for i, ch in constraints.banned:
+                mask &= ~index.position_mask(i, ch)
+            for ch, n in constraints.min_counts.items():
+                mask &= index.count_mask(ch, n)
+            metrics.record("unknown_positions", mask.bit_count())
+        if constraints.max_counts:
+            for ch, n in constraints.max_counts.items():
+                mask &= ~index.count_mask(ch, n + 1)
+            metrics.record("excluded_letters", mask.bit_count())
+        return mask
+
+    def filter(self, constraints, among=None):
+        """See ScanFilter.filter()."""
+        index = self.index
+        return index.words_of(self.mask(constraints, None if among is None else index.mask_of_words(among)))
+
+
+class TrieFilter:
+    """
+    Prefix trie over the index's words that prunes whole subtrees.
+
+    A subtree is skipped as soon as its prefix breaks a fixed or banned
+    position, holds more of a letter than allowed, or leaves too few
+    positions for the letters still required. Every node covers a
+    contiguous run of the words in sorted order, so a candidate subset
+    (``among``) prunes subtrees that contain none of its words.
+
+    The walk applies all clues at once and has no stage sizes; when
+    ``metrics.want_details()``, they are taken from the index bitsets (a
+    few ANDs) in addition to the walk.
+    """
+
+    name = "trie"
+
+    def __init__(self, index):
+        self.index = index
+        order = sorted(range(len(index.words)), key=index.words.__getitem__)
+        self.order = order
+        self.in_order = order == list(range(len(order)))
+        self.rank = None if self.in_order else {pos: r for r, pos in enumerate(order)}
+        # node: (first rank, last rank + 1, {letter: child}); leaves have no children
+        self.root = self._build([index.words[i] for i in order], 0, len(order), 0)
+
+    def _build(self, words, lo, hi, depth):
+        if depth == self.index.length:
+            return (lo, hi, None)
+        children = {}
+        start = lo
+        while start < hi:
+            ch = words[start][depth]
+            end = start + 1
+            while end < hi and words[end][depth] == ch:
+                end += 1
+            children[ch] = self._build(words, start, end, depth + 1)
+            start = end
+        return (lo, hi, children)
+
+    def filter(self, constraints, among=None):
+        """See ScanFilter.filter()."""
+        index = self.index
+        length = index.length
+        fixed = dict(constraints.fixed)
+        banned = [set() for _ in range(length)]
+        for i, ch in constraints.banned:
+            banned[i].add(ch)
+        max_counts = constraints.max_counts
+        min_counts = constraints.min_counts
+
+        ranks = None
+        if among is not None:
+            position = index.position
+            if self.in_order:
+                ranks = sorted(position[w] for w in among if w in position)
+            else:
+                ranks = sorted(self.rank[position[w]] for w in among if w in position)
+        if metrics.want_details():
+            BitsetFilter(index).mask(constraints, None if ranks is None else index.mask_of(self._positions(ranks)))
+        if ranks is not None and not ranks:
+            return []
+
+        counts = dict.fromkeys(set(min_counts) | set(max_counts), 0)  # only letters with a count clue
+        caps = {ch: max_counts.get(ch, length) for ch in counts}
+        found = []
+        last = length - 1
+
+        def visit(node, depth, need):
+            lo, hi, children = node
+            if ranks is not None:
+                r = bisect_left(ranks, lo)
+                if r == len(ranks) or ranks[r] >= hi:
+                    return
+            if depth in fixed:
+                ch = fixed[depth]
+                items = [(ch, children[ch])] if ch in children else []
+            else:
+                items = children.items()
+            skip = banned[depth]
+            for ch, child in items:
+                if ch in skip:
+                    continue
+                left = need
+                if ch in counts:
+                    n = counts[ch]
+                    if n == caps[ch]:
+                        continue
+                    if n < min_counts.get(ch, 0):
+                        left -= 1
+                # Letters still required must fit into the positions left
+                if left > last - depth:
+                    continue
+                if depth == last:
+                    clo, chi, _ = child
+                    if ranks is None:
+                        found.extend(range(clo, chi))
+                    else:
+                        found.extend(ranks[bisect_left(ranks, clo) : bisect_left(ranks, chi)])
+                elif ch in counts:
+                    counts[ch] += 1
+                    visit(child, depth + 1, left)
+                    counts[ch] -= 1
+                else:
+                    visit(child, depth + 1, left)
+
+        visit(self.root, 0, sum(min_counts.values()))
+        return [index.words[i] for i in sorted(self._positions(found))]
+
+    def _positions(self, ranks):
+        """Word positions of sorted-order ``ranks``."""
+        if self.in_order:
+            return ranks
+        order = self.order
+        return [order[rk] for rk in ranks]
+
+
+FILTER_BACKENDS = {backend.name: backend for backend in (BitsetFilter, ScanFilter, TrieFilter)}
+
+# Largest candidate subset the scan engine is picked for; bigger subsets go
+# to the bitsets. See ``benchmark.py filters`` for the measured winners.
+FILTER_SCAN_MAX = 20000
+
+
+def auto_filter_backend(size=None):
+    """
+    Name of the fastest filter engine for a query.
+
+    Parameters:
+        size (int, optional): Size of the candidate subset being filtered;
+            None for the whole word list, which the precomputed bitsets
+            answer fastest. A subset is cheaper to scan than to turn into a
+            bitset first.
+    """
+    if size is None:
+        return "bitset"
+    return "scan" if size <= FILTER_SCAN_MAX else "bitset"
 
 
 class WordleSolver:
-    def __init__(self, words):
+    """
+    Candidate filtering over a word list.
+
+    Parameters:
+        words (list[str]): Word list (all the same length).
+        index (WordIndex, optional): Index over ``words`` to share.
+        backend (str): Filter engine from FILTER_BACKENDS, or ``"auto"`` to
+            pick one per call from the size of the candidate set.
+    """
+
+    def __init__(self, words, index=None, backend="auto"):
+        if backend != "auto" and backend not in FILTER_BACKENDS:
+            raise ValueError(f"Unknown filter backend: {backend}")
         self.words = words
+        self.length = len(words[0]) if words else DEFAULT_LENGTH
+        self.backend = backend
+        self._index = index
 
-    def filter_candidates(self, known_pattern, unknowns, excluded_letters):
+    @property
+    def index(self):
+        """WordIndex over ``words`` (built on first use unless one was passed in)."""
+        if self._index is None:
+            self._index = WordIndex(self.words)
+        return self._index
+
+    def filter_backend(self, size=None):
+        """
+        Return the filter engine for a subset of ``size`` words (None: the whole list).
+
+        Engines are built once per WordIndex and shared by every solver on it.
+        """
+        name = self.backend
+        if name == "auto":
+            name = auto_filter_backend(size)
+        backend = self.index.memo.get(("filter", name))
+        if backend is None:
+            backend = self.index.memo[("filter", name)] = FILTER_BACKENDS[name](self.index)
+        return backend
+
+    def candidates_for(self, state, among=None):
+        """
+        Filter the word list with the clues accumulated in a GameState.
+
+        Parameters:
+            among (list[str], optional): Filter only these words instead of
+                the whole list. A letter's cap grows with the clues naming
+                it, so this is not always the same as a full filter
+                restricted to ``among``.
+        """
+        return self.filter_candidates(state.known_pattern, state.unknowns, list(state.excluded_letters), among)
+
+    def filter_candidates(self, known_pattern, unknowns, excluded_letters, among=None):
         """
         Filter the list of words based on the given clues.
 
         Parameters:
-            known_pattern (list[str]): List of length 5, where each element is either
+            known_pattern (list[str]): List with one entry per letter of the word
+                length, where each element is either
                 a lowercase letter or None. If a letter is given, it must be in the
                 corresponding position in the word.
             unknowns (list[tuple[int, str]]): List of tuples, where the first element
@@ -92,51 +692,358 @@ class WordleSolver:
                 position.
             excluded_letters (list[str]): List of letters that should not appear in
                 the word.
+            among (list[str], optional): Words to filter instead of the whole list.
 
         Returns:
             list[str]: The filtered list of words.
+
+        The result size is recorded in the module-level ``metrics`` under
+        ``filter_<backend>`` and logged at DEBUG level on the ``solver`` logger.
         """
-        pattern = "".join([ch if ch else "." for ch in known_pattern])
-        print(f"Regex Pattern: {pattern}")
-        regex = re.compile(pattern)
-
-        candidates = [w for w in self.words if regex.match(w)]
-        print(f"After Known Positions: {len(candidates)} words")
-
-        for idx, letter in unknowns:
-            candidates = [w for w in candidates if letter in w and w[idx] != letter]
-        if unknowns:
-            print(f"After Unknown Positions: {len(candidates)} words")
-
-        if excluded_letters:
-            # Identify letters that are both excluded and present in knowns/unknowns
-            confirmed_letters = {ch for ch in known_pattern if ch} | {pair[1] for pair in unknowns}
-
-            filtered_candidates = []
-            for w in candidates:
-                keep = True
-                for ch in excluded_letters:
-                    if ch in confirmed_letters:
-                        # Special case: The letter is in the word, but this specific
-                        # instance was grey. This implies the word should not have
-                        # MORE occurrences of 'ch' than already confirmed.
-                        count_in_clues = list(known_pattern).count(ch) + [p[1] for p in unknowns].count(ch)
-                        if w.count(ch) > count_in_clues:
-                            keep = False
-                            break
-                    else:
-                        # Normal case: The letter is not in the word at all
-                        if ch in w:
-                            keep = False
-                            break
-                if keep:
-                    filtered_candidates.append(w)
+        constraints = FilterConstraints.from_clues(known_pattern, unknowns, excluded_letters)
+        backend = self.filter_backend(None if among is None else len(among))
+        candidates = backend.filter(constraints, among)
+        metrics.record(f"filter_{backend.name}", len(candidates))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Known Pattern: %s", "".join([ch if ch else "." for ch in known_pattern]))
+            logger.debug("Excluded Letters: %s", excluded_letters)
+            logger.debug("%s filter: %d words left", backend.name, len(candidates))
+        return candidates
 
-            candidates = filtered_candidates
-            print(f"Excluded Letters: {excluded_letters}")
-            print(f"After Excluded Letters: {len(candidates)} words")
+    def filter_mask(self, known_pattern, unknowns, excluded_letters):
+        """
+        Same as filter_candidates, but return the candidates as a WordIndex bitset.
 
-        return candidates
+        Each clue is one AND (or AND NOT) with a precomputed bitset, so no
+        intermediate word lists are built. Stage sizes are recorded in ``metrics``.
+        """
+        constraints = FilterConstraints.from_clues(known_pattern, unknowns, excluded_letters)
+        return BitsetFilter(self.index).mask(constraints)
+
+
+class WordIndex:
+    """
+    Shared, read-only index over a word list.
+
+    Words are addressed by their position in the list and candidate sets are
+    plain ``int`` bitsets over those positions, so many boards or games can
+    share one index and cheaply hold their own candidate sets.
+
+    Letters are also kept in one flat ASCII buffer (``data``, ``length``
+    bytes per word) that numpy views without copying, and each word's
+    distinct letters are stored as a string that is the word itself unless
+    it repeats a letter.
+    """
+
+    def __init__(self, words):
+        self.words = list(words)
+        self.length = len(self.words[0]) if self.words else 5
+        self.data = "".join(self.words).encode("ascii")
+        self.position = {w: i for i, w in enumerate(self.words)}
+        self.unique_letters = [w if len(set(w)) == len(w) else "".join(dict.fromkeys(w)) for w in self.words]
+        self.alphabet = frozenset(self.data.decode("ascii"))
+        self.full_mask = (1 << len(self.words)) - 1
+        # Scratch space for derived results (e.g. opening guesses) shared by
+        # every solver built on this index
+        self.memo = {}
+        self._letter_matrix = None
+        self._position_masks = None
+        self._count_masks = None
+
+    @property
+    def letter_matrix(self):
+        """``len(words) x length`` uint8 view of ``data`` (needs numpy)."""
+        if self._letter_matrix is None:
+            matrix = np.frombuffer(self.data, dtype=np.uint8).reshape(len(self.words), self.length)
+            self._letter_matrix = matrix
+        return self._letter_matrix
+
+    def _build_constraint_masks(self):
+        size = (len(self.words) + 7) // 8
+        positions = [{} for _ in range(self.length)]
+        counts = {}
+        for i, word in enumerate(self.words):
+            byte, bit = i >> 3, 1 << (i & 7)
+            for slot, ch in zip(positions, word):
+                bitmap = slot.get(ch)
+                if bitmap is None:
+                    bitmap = slot[ch] = bytearray(size)
+                bitmap[byte] |= bit
+            for ch, n in Counter(word).items():
+                levels = counts.setdefault(ch, [])
+                while len(levels) < n:
+                    levels.append(bytearray(size))
+                for bitmap in levels[:n]:
+                    bitmap[byte] |= bit
+        self._position_masks = [{ch: int.from_bytes(b, "little") for ch, b in slot.items()} for slot in positions]
+        self._count_masks = {ch: [int.from_bytes(b, "little") for b in levels] for ch, levels in counts.items()}
+
+    def warm(self):
+        """Build the filter bitsets now rather than on the first filter call."""
+        if self._position_masks is None:
+            self._build_constraint_masks()
+
+    def position_mask(self, position, letter):
+        """Bitset of the words with ``letter`` at ``position``."""
+        if self._position_masks is None:
+            self._build_constraint_masks()
+        return self._position_masks[position].get(letter, 0)
+
+    def count_mask(self, letter, n):
+        """Bitset of the words containing ``letter`` at least ``n`` times (``n >= 1``)."""
+        if self._count_masks is None:
+            self._build_constraint_masks()
+        levels = self._count_masks.get(letter, ())
+        return levels[n - 1] if n <= len(levels) else 0
+
+    def __len__(self):
+        return len(self.words)
+
+    def mask_of(self, indices):
+        """Build a bitset from an iterable of word positions."""
+        bitmap = bytearray((len(self.words) + 7) // 8)
+        for i in indices:
+            bitmap[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(bitmap, "little")
+
+    @staticmethod
+    def indices(mask):
+        """Return the word positions set in ``mask``, in ascending order."""
+        bits = bin(mask)[:1:-1]
+        result = []
+        i = bits.find("1")
+        while i != -1:
+            result.append(i)
+            i = bits.find("1", i + 1)
+        return result
+
+    def words_of(self, mask):
+        """Return the words selected by ``mask``."""
+        words = self.words
+        if mask == self.full_mask:
+            return words[:]
+        return [words[i] for i in self.indices(mask)]
+
+    def mask_of_words(self, words):
+        """Build a bitset from words, ignoring any that are not in the index."""
+        position = self.position
+        return self.mask_of(position[w] for w in words if w in position)
+
+    def rank_by_frequency(self, positions, n, among=None, split=False):
+        """
+        Return the ``n`` best word positions by letter frequency over ``positions``.
+
+        Letters are counted once per word, as in LetterFrequencyAnalyzer.
+
+        Parameters:
+            positions (list[int]): Words whose letters are counted.
+            n (int): Number of positions to return.
+            among (iterable[int], optional): Positions to rank; defaults to
+                the whole index.
+            split (bool): Weight letters by how evenly they split
+                ``positions`` (``min(f, len - f)``) instead of by raw count,
+                which favours probes over likely answers.
+        """
+        unique_letters = self.unique_letters
+        frequencies = Counter()
+        for i in positions:
+            frequencies.update(unique_letters[i])
+        if split:
+            total = len(positions)
+            frequencies = {ch: min(f, total - f) for ch, f in frequencies.items()}
+
+        weights = dict.fromkeys(self.alphabet, 0)
+        weights.update(frequencies)
+        weight = weights.__getitem__
+
+        def score(i):
+            return sum(map(weight, unique_letters[i]))
+
+        among = range(len(self.words)) if among is None else among
+        return heapq.nlargest(n, among, key=score)
+
+    def consistent_mask(self, mask, guess, code):
+        """
+        Keep only the words in ``mask`` that would give ``code`` for ``guess``.
+
+        Uses the vectorized feedback kernel when numpy is available.
+        """
+        positions = self.indices(mask)
+        if np is not None and len(positions) > 64:
+            positions = np.asarray(positions, dtype=np.int64)
+            guess_row = np.frombuffer(guess.encode("ascii"), dtype=np.uint8)[None, :]
+            codes = feedback_matrix(guess_row, self.letter_matrix[positions])[0]
+            return self.mask_of(positions[codes == code].tolist())
+        words = self.words
+        return self.mask_of(i for i in positions if score_feedback(guess, words[i]) == code)
+
+    def partition_masks(self, mask, guess):
+        """
+        Split ``mask`` by the feedback ``guess`` would receive.
+
+        Returns:
+            dict[int, int]: feedback code -> bitset of the words giving it.
+        """
+        positions = self.indices(mask)
+        if np is not None and len(positions) > 64:
+            positions = np.asarray(positions, dtype=np.int64)
+            guess_row = np.frombuffer(guess.encode("ascii"), dtype=np.uint8)[None, :]
+            codes = feedback_matrix(guess_row, self.letter_matrix[positions])[0]
+            order = np.argsort(codes, kind="stable")
+            codes, positions = codes[order], positions[order]
+            bounds = np.flatnonzero(np.diff(codes)) + 1
+            starts = [0] + bounds.tolist()
+            return {int(codes[s]): self.mask_of(chunk.tolist()) for s, chunk in zip(starts, np.split(positions, bounds))}
+        return {code: self.mask_of(bucket) for code, bucket in self.partition(guess, positions).items()}
+
+    def partition(self, guess, indices):
+        """
+        Group word positions by the feedback ``guess`` would receive.
+
+        Returns:
+            dict[int, list[int]]: feedback code -> positions producing it.
+        """
+        words = self.words
+        buckets = {}
+        for i in indices:
+            buckets.setdefault(score_feedback(guess, words[i]), []).append(i)
+        return buckets
+
+
+def feedback_matrix(guess_rows, answer_rows):
+    """
+    Vectorized score_feedback for every (guess, answer) pair.
+
+    Parameters:
+        guess_rows (numpy.ndarray): ``G x L`` uint8 letters of the guesses.
+        answer_rows (numpy.ndarray): ``C x L`` uint8 letters of the answers.
+
+    Returns:
+        numpy.ndarray: ``G x C`` int32 feedback codes.
+    """
+    length = guess_rows.shape[1]
+    green = guess_rows[:, None, :] == answer_rows[None, :, :]
+    open_answer = ~green
+    codes = np.zeros(green.shape[:2], dtype=np.int32)
+    for i in range(length):
+        letter = guess_rows[:, i][:, None]
+        # copies of this letter still unclaimed in the answer ...
+        available = np.zeros(codes.shape, dtype=np.int8)
+        for k in range(length):
+            available += (answer_rows[None, :, k] == letter) & open_answer[:, :, k]
+        # ... minus the ones claimed by earlier non-green copies in the guess
+        claimed = np.zeros(codes.shape, dtype=np.int8)
+        for j in range(i):
+            claimed += (guess_rows[:, j] == guess_rows[:, i])[:, None] & open_answer[:, :, j]
+        digit = np.where(green[:, :, i], 2, (claimed < available).astype(np.int32))
+        codes = codes * 3 + digit
+    return codes
+
+
+class GuessScorer:
+    """
+    Rank guesses by expected information over a candidate set.
+
+    Guesses are scored in blocks with numpy and the blocks are spread over a
+    thread pool; numpy releases the GIL inside the heavy array operations, so
+    every worker reads the same shared ``WordIndex.letter_matrix`` instead of
+    a copy. Each block keeps only its own top results before the final merge.
+    Small jobs (fewer than ``threshold`` guess x candidate cells) run on the
+    calling thread, and without numpy scoring falls back to pure Python.
+
+    Parameters:
+        index (WordIndex): Shared word index.
+        workers (int, optional): Thread count; defaults to the CPU count.
+        threshold (int): Cells below which scoring stays serial.
+        chunk_size (int): Guesses per vectorized block.
+    """
+
+    def __init__(self, index, workers=None, threshold=PARALLEL_THRESHOLD, chunk_size=SCORING_CHUNK):
+        self.index = index
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.threshold = threshold
+        self.chunk_size = chunk_size
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Shut down the worker threads, if any were started."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="guess-scorer")
+            return self._executor
+
+    def _top_python(self, guesses, candidates, k):
+        words = self.index.words
+        candidate_set = set(candidates)
+        scored = []
+        for g in guesses:
+            guess = words[g]
+            buckets = Counter(score_feedback(guess, words[i]) for i in candidates)
+            info = entropy(buckets.values(), len(candidates))
+            if g in candidate_set:
+                info += 1.0 / len(candidates)
+            if info > 0:
+                scored.append((info, g))
+        return heapq.nlargest(k, scored)
+
+    def _top_block(self, guesses, candidates, answer_rows, is_candidate, k):
+        matrix = self.index.letter_matrix
+        codes = feedback_matrix(matrix[guesses], answer_rows)
+        n_codes = 3**self.index.length
+        rows = len(guesses)
+        offsets = codes + (np.arange(rows, dtype=np.int64) * n_codes)[:, None]
+        counts = np.bincount(offsets.ravel(), minlength=rows * n_codes).reshape(rows, n_codes)
+        p = counts / len(candidates)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            info = -np.where(p > 0, p * np.log2(p), 0.0).sum(axis=1)
+        info += is_candidate[guesses] / len(candidates)
+        take = min(k, rows)
+        best = np.argpartition(-info, take - 1)[:take]
+        return [(float(info[b]), int(guesses[b])) for b in best if info[b] > 0]
+
+    def top(self, guesses, candidates, k=1):
+        """
+        Return the ``k`` most informative guesses.
+
+        A guess that is itself a candidate gets a ``1 / len(candidates)``
+        bonus for the chance of winning outright; guesses that cannot split
+        the candidates at all are dropped.
+
+        Parameters:
+            guesses (list[int]): Word positions to score.
+            candidates (list[int]): Word positions still possible.
+            k (int): Number of results.
+
+        Returns:
+            list[tuple[float, int]]: (score, word position), best first.
+        """
+        if not guesses or not candidates:
+            return []
+        cells = len(guesses) * len(candidates)
+        if np is None:
+            return self._top_python(guesses, candidates, k)
+
+        guess_array = np.asarray(guesses, dtype=np.int64)
+        answer_rows = self.index.letter_matrix[np.asarray(candidates, dtype=np.int64)]
+        is_candidate = np.zeros(len(self.index), dtype=np.float64)
+        is_candidate[candidates] = 1.0
+        blocks = [guess_array[i : i + self.chunk_size] for i in range(0, len(guess_array), self.chunk_size)]
+
+        if cells < self.threshold or self.workers == 1 or len(blocks) == 1:
+            partial = [self._top_block(b, candidates, answer_rows, is_candidate, k) for b in blocks]
+        else:
+            pool = self._pool()
+            futures = [pool.submit(self._top_block, b, candidates, answer_rows, is_candidate, k) for b in blocks]
+            partial = [f.result() for f in futures]
+        metrics.record("scored_cells", cells)
+        return heapq.nlargest(k, (item for part in partial for item in part))
 
 
 class LetterFrequencyAnalyzer:
@@ -148,10 +1055,11 @@ class LetterFrequencyAnalyzer:
         """
         Analyzes the frequency of letters in the filtered word list.
         Each letter is only counted once per word (i.e., no double-counting within a word).
-        Stores the result in self.frequencies.
+        Stores the result in self.frequencies; the full table is only logged
+        when DEBUG is enabled on the ``solver`` logger.
         """
         if not os.path.exists(self.input_path):
-            print(f"File {self.input_path} not found!")
+            logger.error("File %s not found!", self.input_path)
             return
 
         with open(self.input_path, "r", encoding="utf-8") as file:
@@ -160,11 +1068,14 @@ class LetterFrequencyAnalyzer:
                 unique_letters = set(word)
                 self.frequencies.update(unique_letters)
 
+        metrics.record("analyzed_letters", len(self.frequencies))
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
         total = sum(self.frequencies.values())
-        print(f"\nLetter Frequencies (each letter counted once per word):")
+        logger.debug("Letter Frequencies (each letter counted once per word):")
         for letter, count in self.frequencies.most_common():
-            weight = count / total * 100
-            print(f"{letter}: {count} ({weight:.2f}%)")
+            logger.debug("%s: %d (%.2f%%)", letter, count, count / total * 100)
 
     def suggest_best_words(self, word_list=None, top_n=20):
         """
@@ -182,29 +1093,647 @@ class LetterFrequencyAnalyzer:
         # If no word list provided, read from input file
         if word_list is None:
             if not os.path.exists(self.input_path):
-                print(f"File {self.input_path} not found!")
+                logger.error("File %s not found!", self.input_path)
                 return []
             with open(self.input_path, "r", encoding="utf-8") as f:
                 word_list = [line.strip() for line in f if line.strip()]
 
-        # Compute score of each word based on letter frequency
-        scored_words = []
-        for word in word_list:
-            unique_letters = set(word)
-            score = sum(self.frequencies.get(ch, 0) for ch in unique_letters)
-            scored_words.append((word, score))
+        # Compute score of each word based on letter frequency; nlargest keeps
+        # only top_n entries alive and breaks ties in list order like a stable sort
+        frequency = self.frequencies.get
+
+        def scored(word):
+            return word, sum(frequency(ch, 0) for ch in set(word))
+
+        return heapq.nlargest(top_n, map(scored, word_list), key=lambda x: x[1])
+
+
+def file_signature(path):
+    """``(mtime_ns, size)`` of ``path``, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class SolverResources:
+    """
+    Everything a solve needs for one dictionary file: the word list, the
+    analyzer with its frequencies, the shared WordIndex (filter bitsets
+    built) and a WordleSolver on top of it.
+    """
+
+    def __init__(self, path, length=DEFAULT_LENGTH):
+        self.path = path
+        self.length = length
+        # Taken before reading, so a file changed mid-load is reloaded next time
+        self.signature = file_signature(path)
+        self.words = load_words(length, path)
+        self.analyzer = LetterFrequencyAnalyzer(path)
+        self.analyzer.analyze()
+        self.index = WordIndex(self.words)
+        self.index.warm()
+        self.solver = WordleSolver(self.words, index=self.index)
+
+
+class ResourcePreloader:
+    """
+    Loads SolverResources on a background thread and hands out the same
+    instance until the dictionary file changes (mtime or size).
+
+    Parameters:
+        path (str): Dictionary file.
+        length (int): Word length.
+    """
+
+    def __init__(self, path, length=DEFAULT_LENGTH):
+        self.path = path
+        self.length = length
+        self.loads = 0
+        self._future = None
+        self._lock = threading.Lock()
+
+    def _load(self, future):
+        start = time.perf_counter()
+        try:
+            resources = SolverResources(self.path, self.length)
+        except Exception as e:
+            logger.error("Could not load solver resources from %s: %s", self.path, e)
+            future.set_exception(e)
+            return
+        self.loads += 1
+        logger.info("Solver resources loaded in %.0f ms", (time.perf_counter() - start) * 1e3)
+        future.set_result(resources)
+
+    def _stale(self):
+        future = self._future
+        if future is None:
+            return True
+        if not future.done():
+            return False  # a load is already in flight
+        if future.exception() is not None:
+            return True  # retry failed loads
+        try:
+            return future.result().signature != file_signature(self.path)
+        except OSError:
+            return True  # the reload reports the problem through its future
+
+    def start(self):
+        """
+        Start loading unless current resources are loaded or loading.
+
+        Returns:
+            concurrent.futures.Future: Resolves to SolverResources.
+        """
+        with self._lock:
+            if self._stale():
+                self._future = Future()
+                threading.Thread(target=self._load, args=(self._future,), name="solver-preload", daemon=True).start()
+            return self._future
+
+    def get(self, timeout=None):
+        """Wait for and return current SolverResources (reloading if the file changed)."""
+        return self.start().result(timeout)
+
+
+def hard_mode_mask(index, guess, code):
+    """
+    Bitset of the words Hard Mode still allows after ``guess`` got ``code``.
+
+    Every green must be played in its place again and every revealed letter
+    reused, as many times as the row showed it green or yellow.
+    """
+    digits = []
+    for _ in range(len(guess)):
+        code, digit = divmod(code, 3)
+        digits.append(digit)
+    digits.reverse()
+    mask = index.full_mask
+    revealed = Counter()
+    for i, (ch, digit) in enumerate(zip(guess, digits)):
+        if digit == 2:
+            mask &= index.position_mask(i, ch)
+        if digit:
+            revealed[ch] += 1
+    for ch, n in revealed.items():
+        mask &= index.count_mask(ch, n)
+    return mask
+
+
+class HardModeGuesses:
+    """
+    The guesses still legal in Hard Mode, kept as a bitset over a WordIndex.
+
+    The set starts as the whole index and every played row ANDs in its
+    hard_mode_mask, so it is maintained incrementally from the same
+    precomputed bitsets the candidate filter uses.
+
+    Parameters:
+        index (WordIndex): Index the guesses (and candidates) come from.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.mask = index.full_mask
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def apply(self, guess, code):
+        """Narrow the set with one played row."""
+        self.mask &= hard_mode_mask(self.index, guess, code)
+
+    def update(self, results):
+        """
+        Narrow the set with one row of ``{"letter", "state"}`` tiles, as GameState.update takes.
+
+        Tiles whose letter or state could not be read add no constraint.
+        """
+        guess, code = "", 0
+        for item in results[: self.index.length]:
+            letter, digit = item["letter"], FEEDBACK_DIGITS.get(item["state"], 0)
+            guess += letter or "?"
+            code = code * 3 + (digit if letter else 0)
+        self.apply(guess, code)
+
+    def allows(self, word):
+        """True if ``word`` is in the index and may be played now."""
+        i = self.index.position.get(word)
+        return i is not None and self.mask >> i & 1 == 1
+
+    def words(self):
+        """Return the allowed guesses, in index order."""
+        return self.index.words_of(self.mask)
+
+
+def choose_guess(candidates, analyzer, search=None, hard_mode=None):
+    """
+    Pick the next guess from the remaining candidates.
+
+    Uses the letter-frequency heuristic, or the lookahead search when one is
+    given (falling back to the heuristic for words outside its index).
+
+    Parameters:
+        hard_mode (HardModeGuesses, optional): Only play guesses it allows.
+    """
+    if search is not None:
+        allowed = None if hard_mode is None else hard_mode.mask
+        guess = search.best_guess(search.index.mask_of_words(candidates), allowed)
+        if guess is not None:
+            return guess
+    if hard_mode is not None:
+        # The clue filter keeps a few words the rows rule out; never play those
+        candidates = [w for w in candidates if hard_mode.allows(w)] or candidates
+    top = analyzer.suggest_best_words(word_list=candidates, top_n=1)
+    return top[0][0] if top else None
+
+
+def play_game(answer, solver, analyzer, max_attempts=6, search=None, hard_mode=False):
+    """
+    Play one game offline with the same strategy as the GUI solver loop.
+
+    Parameters:
+        answer (str): Hidden word.
+        solver (WordleSolver): Solver over the dictionary for answer's length.
+        analyzer (LetterFrequencyAnalyzer): Analyzer with frequencies loaded.
+        max_attempts (int): Guess limit.
+        search (LookaheadSearch, optional): Lookahead strategy to use instead
+            of the letter-frequency heuristic.
+        hard_mode (bool): Follow the Hard Mode rules.
+
+    Returns:
+        list[str]: The guesses played; the game was won if the last one is ``answer``.
+    """
+    state = GameState(len(answer))
+    allowed = HardModeGuesses(solver.index) if hard_mode else None
+    candidates = solver.words
+    guesses = []
+    for _ in range(max_attempts):
+        guess = choose_guess(candidates, analyzer, search, allowed)
+        if guess is None:
+            break
+        guesses.append(guess)
+        if guess == answer:
+            break
+        code = score_feedback(guess, answer)
+        state.update_from_feedback(guess, code)
+        if allowed is not None:
+            allowed.apply(guess, code)
+        candidates = solver.candidates_for(state)
+    return guesses
+
+
+class MultiBoardSolver:
+    """
+    Solve several hidden words at once (Quordle/Octordle-style) on a shared index.
+
+    Every guess is played on all unsolved boards. Feedback for a guess is
+    computed once over the union of the boards' candidates and then split
+    per board, and guesses are ranked by the expected information summed
+    across boards.
+
+    Parameters:
+        index (WordIndex): Shared word index.
+        boards (int): Number of simultaneous boards.
+        pool_size (int): Number of guesses evaluated per move.
+        eval_budget (int): Upper bound on feedback computations per move; the
+            per-board candidate samples shrink to stay within it.
+    """
+
+    def __init__(self, index, boards=4, pool_size=40, eval_budget=24000):
+        self.index = index
+        self.boards = boards
+        self.pool_size = pool_size
+        self.eval_budget = eval_budget
+        self.masks = [index.full_mask] * boards
+        self.solved = [False] * boards
+        self._suggestions = index.memo.setdefault(("multiboard", pool_size, eval_budget), {})
+
+    def unsolved(self):
+        """Return the positions of the boards that are still open."""
+        return [b for b in range(self.boards) if not self.solved[b]]
+
+    def candidates(self, board):
+        """Return the remaining candidate words for ``board``."""
+        return self.index.words_of(self.masks[board])
+
+    def apply_feedback(self, guess, codes):
+        """
+        Narrow every open board with the feedback it gave for ``guess``.
+
+        Parameters:
+            guess (str): The word that was played.
+            codes (list[int]): One feedback code per board (entries for
+                already-solved boards are ignored).
+        """
+        index = self.index
+        open_boards = self.unsolved()
+        union = 0
+        for b in open_boards:
+            union |= self.masks[b]
+
+        # One feedback pass over the union, shared by all boards
+        buckets = index.partition(guess, index.indices(union))
+        bucket_masks = {}
+        win = solved_code(index.length)
+        for b in open_boards:
+            code = codes[b]
+            if code == win:
+                self.solved[b] = True
+                self.masks[b] = 1 << index.position[guess] if guess in index.position else 0
+                continue
+            if code not in bucket_masks:
+                bucket_masks[code] = index.mask_of(buckets.get(code, ()))
+            self.masks[b] &= bucket_masks[code]
+
+    def _guess_pool(self, union_indices):
+        """Pick the guesses worth scoring: strong probes plus likely answers."""
+        index = self.index
+        half = self.pool_size // 2
+        probes = index.rank_by_frequency(union_indices, half)
+        answers = index.rank_by_frequency(union_indices, self.pool_size - half, among=union_indices)
+        return [index.words[i] for i in dict.fromkeys(probes + answers)]
+
+    def suggest(self):
+        """
+        Return the next guess, or None if every board is solved or empty.
+
+        A board with a single candidate left is finished first; otherwise the
+        guess with the highest summed expected information wins, with a small
+        bonus for the chance of solving a board outright.
+        """
+        open_boards = [b for b in self.unsolved() if self.masks[b]]
+        if not open_boards:
+            return None
+
+        key = tuple(self.masks[b] for b in open_boards)
+        if key in self._suggestions:
+            return self._suggestions[key]
+
+        index = self.index
+        per_board = [index.indices(self.masks[b]) for b in open_boards]
+        for positions in per_board:
+            if len(positions) == 1:
+                guess = index.words[positions[0]]
+                self._suggestions[key] = guess
+                return guess
+
+        # Deterministic strided samples keep the move inside the eval budget
+        sample_size = max(8, self.eval_budget // (self.pool_size * len(open_boards)))
+        samples = []
+        for positions in per_board:
+            step = max(1, len(positions) // sample_size)
+            samples.append(positions[::step][:sample_size])
+        union_sample = sorted(set().union(*samples))
+        union_all = sorted(set().union(*per_board))
+
+        words = index.words
+        best_guess, best_score = None, -1.0
+        for guess in self._guess_pool(union_all):
+            codes = {i: score_feedback(guess, words[i]) for i in union_sample}
+            score = 0.0
+            for positions, sample in zip(per_board, samples):
+                buckets = Counter(codes[i] for i in sample)
+                score += entropy(buckets.values(), len(sample))
+                if index.position.get(guess, -1) in positions:
+                    score += 1.0 / len(positions)
+            if score > best_score:
+                best_guess, best_score = guess, score
+
+        self._suggestions[key] = best_guess
+        return best_guess
+
+
+class SearchTimeout(Exception):
+    """Raised inside LookaheadSearch when the wall-clock budget is spent."""
+
+
+class LookaheadSearch:
+    """
+    Multi-step lookahead over guesses with branch-and-bound pruning.
+
+    The cost of a candidate set is the number of guesses still needed to
+    solve it, either on average (``objective="expected"``) or in the worst
+    case (``objective="worst"``). Guesses are searched ``depth`` moves deep
+    with iterative deepening; buckets below the horizon are scored with a
+    size-based estimate. Results are memoized per candidate bitset, so
+    subtrees shared between guesses or moves are only searched once.
+
+    The search is anytime: when ``time_budget`` seconds run out, the best
+    guess of the deepest completed iteration is returned.
+
+    In Hard Mode (``best_guess(mask, allowed)``) every node carries its own
+    allowed-guess bitset, narrowed per feedback with hard_mode_mask, and only
+    allowed words are expanded. Small buckets below the horizon are then
+    priced by playing them out greedily rather than by their size, because
+    Hard Mode's traps (e.g. _IGHT words with only those words playable)
+    cost about one guess per word, far more than the size-based estimate.
+
+    Parameters:
+        index (WordIndex): Shared word index.
+        objective (str): "expected" or "worst".
+        depth (int): Maximum lookahead depth in guesses.
+        breadth (int): Guesses expanded per node, best-entropy first.
+        probes (int): Non-candidate words added to every node's guess pool.
+        time_budget (float): Wall-clock limit per call, in seconds.
+        max_candidates (int): Above this many candidates only a one-step
+            entropy ranking is done.
+        workers (int, optional): Threads used by the GuessScorer.
+    """
+
+    LEAF_BRANCHING = 6.0
+    PROBE_SHORTLIST = 150
+    # Hard Mode: largest bucket played out below the horizon, and guesses tried per playout step
+    TRAP_MAX = 24
+    TRAP_POOL = 6
+
+    def __init__(
+        self,
+        index,
+        objective="expected",
+        depth=3,
+        breadth=10,
+        probes=20,
+        time_budget=1.0,
+        max_candidates=600,
+        workers=None,
+    ):
+        if objective not in ("expected", "worst"):
+            raise ValueError(f"Unknown objective: {objective}")
+        self.index = index
+        self.objective = objective
+        self.depth = depth
+        self.breadth = breadth
+        self.probes = probes
+        self.time_budget = time_budget
+        self.max_candidates = max_candidates
+        self.scorer = GuessScorer(index, workers=workers)
+        self.stats = Counter()
+        self._memo = {}
+        self._rows = {}
+        self._deadline = None
+        self._shortlist = []
+
+    def _lower_bound(self, n):
+        """Cheapest possible cost of a bucket of ``n`` candidates."""
+        if n <= 1:
+            return 1.0
+        return 2.0 if self.objective == "worst" else (2 * n - 1) / n
+
+    def _estimate(self, n):
+        """Cost estimate for a bucket below the search horizon."""
+        if n <= 2:
+            return self._lower_bound(n)
+        guesses = math.log(n) / math.log(self.LEAF_BRANCHING)
+        guesses = math.ceil(guesses) + 1 if self.objective == "worst" else guesses + 1
+        return max(self._lower_bound(n), guesses)
+
+    def _allowed_after(self, allowed, guess, code):
+        """Hard Mode: the allowed-guess bitset below ``guess`` answered with ``code``."""
+        if allowed is None:
+            return None
+        key = (guess, code)
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = hard_mode_mask(self.index, guess, code)
+        return allowed & row
+
+    def _trap_cost(self, positions, allowed):
+        """
+        Hard Mode cost of a bucket below the horizon.
+
+        Buckets up to TRAP_MAX words are played out: each step plays the
+        allowed candidate that splits the rest into the most buckets.
+        """
+        n = len(positions)
+        if n <= 2:
+            return self._lower_bound(n)
+        if n > self.TRAP_MAX:
+            return self._estimate(n)
+        index = self.index
+        key = ("trap", index.mask_of(positions), allowed)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+        if time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        self.stats["playouts"] += 1
+
+        words = index.words
+        pool = [p for p in positions if allowed >> p & 1] or positions
+        if len(pool) > self.TRAP_POOL:
+            pool = index.rank_by_frequency(positions, self.TRAP_POOL, among=pool, split=True)
+        best_buckets, guess = None, None
+        for g in pool:
+            buckets = index.partition(words[g], positions)
+            if best_buckets is None or len(buckets) > len(best_buckets):
+                best_buckets, guess = buckets, words[g]
+                if len(buckets) == n:
+                    break
+
+        win = solved_code(index.length)
+        children = [
+            (len(b), self._trap_cost(b, self._allowed_after(allowed, guess, code)))
+            for code, b in best_buckets.items()
+            if code != win
+        ]
+        if self.objective == "worst":
+            cost = 1 + max((c for _, c in children), default=0.0)
+        else:
+            cost = 1 + sum(size * c for size, c in children) / n
+        self._memo[key] = cost
+        return cost
+
+    def _ranked_guesses(self, positions, limit, allowed=None):
+        """Order a node's guess pool (only allowed words in Hard Mode) by one-step expected information."""
+        index = self.index
+        candidates, shortlist = positions, self._shortlist
+        if allowed is not None:
+            # Answers always satisfy the rows; the filter may still keep a stray word
+            candidates = [p for p in positions if allowed >> p & 1] or positions
+            shortlist = [p for p in shortlist if allowed >> p & 1]
+        if len(candidates) > self.probes:
+            candidates = index.rank_by_frequency(positions, self.probes, among=candidates)
+        probes = index.rank_by_frequency(positions, self.probes, among=shortlist, split=True)
+        pool = list(dict.fromkeys(candidates + probes))
+        return [index.words[g] for _, g in self.scorer.top(pool, positions, limit)]
+
+    def _evaluate(self, guess, positions, depth, bound, allowed=None):
+        """Cost of playing ``guess`` now; math.inf if it cannot beat ``bound``."""
+        index = self.index
+        n = len(positions)
+        win = solved_code(index.length)
+        buckets = sorted(index.partition(guess, positions).items(), key=lambda kv: -len(kv[1]))
+        lower = {code: 0.0 if code == win else self._lower_bound(len(b)) for code, b in buckets}
+
+        if self.objective == "worst":
+            acc = 1 + max(lower.values())
+            if acc >= bound:
+                return math.inf
+            for code, bucket in buckets:
+                if code == win:
+                    continue
+                child = self._cost(bucket, depth - 1, bound - 1, self._allowed_after(allowed, guess, code))
+                acc = max(acc, 1 + child)
+                if acc >= bound:
+                    self.stats["cuts"] += 1
+                    return math.inf
+            return acc
+
+        acc = 1 + sum(len(b) / n * lower[code] for code, b in buckets)
+        if acc >= bound:
+            return math.inf
+        for code, bucket in buckets:
+            if code == win or len(bucket) == 1:
+                continue
+            p = len(bucket) / n
+            child_bound = (bound - acc) / p + lower[code]
+            child = self._cost(bucket, depth - 1, child_bound, self._allowed_after(allowed, guess, code))
+            acc += p * (child - lower[code])
+            if acc >= bound:
+                self.stats["cuts"] += 1
+                return math.inf
+        return acc
+
+    def _cost(self, positions, depth, bound=math.inf, allowed=None):
+        """Best achievable cost for a candidate set, or math.inf if not below ``bound``."""
+        n = len(positions)
+        if n <= 2:
+            return self._lower_bound(n)
+        if depth <= 0:
+            return self._estimate(n) if allowed is None else self._trap_cost(positions, allowed)
+
+        key = (self.index.mask_of(positions), depth, allowed)
+        cached = self._memo.get(key)
+        if cached is not None:
+            self.stats["memo_hits"] += 1
+            return cached
+
+        if time.perf_counter() > self._deadline:
+            raise SearchTimeout()
+        self.stats["nodes"] += 1
+
+        best = math.inf
+        for guess in self._ranked_guesses(positions, self.breadth, allowed):
+            cost = self._evaluate(guess, positions, depth, min(bound, best), allowed)
+            if cost < best:
+                best = cost
+        if best < bound:
+            self._memo[key] = best
+        return best
+
+    def best_guess(self, mask, allowed=None):
+        """
+        Return the best guess for the candidates in ``mask``.
+
+        Parameters:
+            mask (int): Candidate bitset over ``self.index``.
+            allowed (int, optional): Hard Mode: bitset of the guesses still
+                allowed (HardModeGuesses.mask); None for normal play.
+
+        Returns:
+            str or None: The chosen guess, or None if ``mask`` is empty.
+        """
+        index = self.index
+        positions = index.indices(mask)
+        if not positions:
+            return None
+        if len(positions) <= 2:
+            if allowed is not None:
+                return next((index.words[p] for p in positions if allowed >> p & 1), index.words[positions[0]])
+            return index.words[positions[0]]
+
+        self.stats.clear()
+        self._deadline = time.perf_counter() + self.time_budget
+        among = None if allowed is None or allowed == index.full_mask else index.indices(allowed)
+        self._shortlist = index.rank_by_frequency(positions, self.PROBE_SHORTLIST, among=among, split=True)
+        if len(self._memo) > 200000:
+            self._memo.clear()
+            self._rows.clear()
+
+        if len(positions) > self.max_candidates:
+            # Too large to search: one-step ranking on a strided sample
+            key = ("sampled", mask, allowed)
+            if key not in self._memo:
+                step = len(positions) // self.max_candidates + 1
+                self._memo[key] = self._ranked_guesses(positions[::step], 1, allowed)[0]
+            return self._memo[key]
+
+        ranked = self._ranked_guesses(positions, self.breadth, allowed)
+        best_guess = ranked[0]
+
+        try:
+            for depth in range(1, self.depth + 1):
+                best_cost, depth_best = math.inf, None
+                for guess in [best_guess] + [g for g in ranked if g != best_guess]:
+                    cost = self._evaluate(guess, positions, depth, best_cost, allowed)
+                    if cost < best_cost:
+                        best_cost, depth_best = cost, guess
+                best_guess = depth_best
+                self.stats["depth"] = depth
+                self.stats["cost_milli"] = round(best_cost * 1000)
+        except SearchTimeout:
+            self.stats["timeouts"] += 1
 
-        scored_words.sort(key=lambda x: x[1], reverse=True)
-        return scored_words[:top_n]
+        metrics.record("lookahead_nodes", self.stats["nodes"])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Lookahead picked %s (%s)", best_guess, dict(self.stats))
+        return best_guess
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     dict_url = "https://github.com/TitanComputer/wordle-list/raw/refs/heads/main/words"
 
     downloader = DictionaryDownloader(dict_url)
     downloader.download()
     wf = WordFilter()
     wf.filter_and_save()
+    for length in SUPPORTED_LENGTHS:
+        if length != DEFAULT_LENGTH:
+            # Written where dictionary_path (and so load_index) looks for them
+            WordFilter(output_path=dictionary_path(length), length=length).filter_and_save()
     analyzer = LetterFrequencyAnalyzer()
     analyzer.analyze()
 
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import pytest
+
+from async_solver import GuessScheduler, offline_feedback, run_games
+from solver import LookaheadSearch, load_index
+
+
+def run(scheduler, answers):
+    # A hang would be the bug; fail fast instead of waiting forever
+    return asyncio.run(asyncio.wait_for(run_games(scheduler, [offline_feedback(a) for a in answers]), 30))
+
+
+def test_scorer_error_reaches_every_game(monkeypatch):
+    search = LookaheadSearch(load_index())
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("scorer failed")
+
+    monkeypatch.setattr(search.scorer, "top", broken)
+    with pytest.raises(RuntimeError, match="scorer failed"):
+        run(GuessScheduler(search=search), ["crane", "slate", "pious"])
+
+
+def test_narrow_error_reaches_the_caller(monkeypatch):
+    scheduler = GuessScheduler()
+
+    def broken(mask, guess):
+        raise RuntimeError("partition failed")
+
+    monkeypatch.setattr(scheduler.index, "partition_masks", broken)
+    with pytest.raises(RuntimeError, match="partition failed"):
+        run(scheduler, ["crane", "slate"])
+
+
+def test_games_still_finish():
+    scheduler = GuessScheduler()
+    results = run(scheduler, ["crane", "slate", "pious"])
+    assert all(won for _, won in results)
+
+
+def test_slow_batch_does_not_block_the_loop(monkeypatch):
+    search = LookaheadSearch(load_index())
+    top = search.scorer.top
+
+    def slow(*args, **kwargs):
+        time.sleep(0.3)
+        return top(*args, **kwargs)
+
+    monkeypatch.setattr(search.scorer, "top", slow)
+    scheduler = GuessScheduler(search=search)
+    ticks = []
+
+    async def main():
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        await asyncio.wait_for(scheduler.next_guess(scheduler.index.full_mask), 30)
+        task.cancel()
+
+    asyncio.run(main())
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.2
+
+
+def test_guess_cache_is_bounded():
+    scheduler = GuessScheduler(cache_size=4)
+    results = run(scheduler, ["crane", "slate", "pious", "mamma", "there", "eerie"])
+    assert all(won for _, won in results)
+    assert len(scheduler._guesses) == 4
@@ -0,0 +1,80 @@
+"""Batch solving over mock_site puzzles (needs Chrome)."""
+import pytest
+
+import mock_site
+from batch_solver import DriverPool, solve_many
+from solver import load_index
+
+
+class CountingPool(DriverPool):
+    def __init__(self):
+        super().__init__(headless=True)
+        self.started = 0
+        self.discarded = 0
+        self.dead_starts = 0  # this many drivers are handed out with their session already gone
+
+    def _start(self):
+        driver = super()._start()
+        self.started += 1
+        if self.dead_starts:
+            self.dead_starts -= 1
+            driver.quit()
+        return driver
+
+    def discard(self):
+        self.discarded += 1
+        super().discard()
+
+
+@pytest.fixture(scope="module")
+def site():
+    server, base_url = mock_site.start_in_background(third_party_delay=0.2)
+    yield base_url
+    server.shutdown()
+
+
+@pytest.fixture
+def pool():
+    from selenium.common.exceptions import WebDriverException
+
+    pool = CountingPool()
+    try:
+        pool.get()  # this thread's driver is only used to find out whether Chrome runs
+    except WebDriverException as e:
+        pytest.skip(f"Chrome not available: {e.msg}")
+    pool.discard()
+    pool.started = pool.discarded = 0
+    yield pool
+    pool.close()
+
+
+def test_timeout_only_costs_its_own_puzzle(site, pool):
+    answers = load_index().words[:4]
+    urls = [mock_site.page_url(site, answer, reveal_ms=50) for answer in answers]
+    # The tiles of this board never flip, so the game waits until its deadline
+    urls.insert(2, mock_site.page_url(site, "crane", reveal_ms=10**9))
+
+    results = solve_many(urls, pool, workers=2, timeout=5.0)
+
+    assert [r.url for r in results] == urls
+    stuck = results.pop(2)
+    assert not stuck.solved and stuck.error == "puzzle timed out"
+    assert 5.0 <= stuck.elapsed < 7.0
+    for answer, result in zip(answers, results):
+        assert result.solved and result.error is None
+        assert result.guesses[-1] == answer
+    # The stuck puzzle's driver was thrown away and its worker got a fresh one (if it had more work)
+    assert pool.discarded == 1
+    assert 2 <= pool.started <= 3
+
+
+def test_failing_driver_is_replaced(site, pool):
+    answers = load_index().words[10:12]
+    urls = [mock_site.page_url(site, answer, reveal_ms=50) for answer in answers]
+    pool.dead_starts = 1
+
+    first, second = solve_many(urls, pool, workers=1, timeout=10.0)
+
+    assert not first.solved and first.error
+    assert second.solved and second.guesses[-1] == answers[1]
+    assert pool.discarded == 1 and pool.started == 2
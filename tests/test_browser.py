@@ -0,0 +1,138 @@
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, NoSuchWindowException, TimeoutException
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError
+
+from browser import Cancelled, CancelToken, DriverMonitor
+
+# Stop must end a wait within about one poll interval
+LATENCY = 0.25
+
+
+def cancel_after(token, delay):
+    timer = threading.Timer(delay, token.cancel)
+    timer.start()
+    return timer
+
+
+def test_check():
+    token = CancelToken()
+    token.check()
+    token.cancel()
+    token.cancel()  # idempotent
+    assert token.cancelled and token.cancelled_at is not None
+    with pytest.raises(Cancelled):
+        token.check()
+
+
+def test_sleep_wakes_on_cancel():
+    token = CancelToken()
+    cancel_after(token, 0.05)
+    start = time.monotonic()
+    with pytest.raises(Cancelled):
+        token.sleep(10)
+    assert time.monotonic() - start < LATENCY
+
+
+def test_sleep_runs_out_when_not_cancelled():
+    token = CancelToken()
+    start = time.monotonic()
+    token.sleep(0.05)
+    assert time.monotonic() - start >= 0.04
+
+
+def test_until_returns_value():
+    calls = []
+
+    def condition(driver):
+        calls.append(driver)
+        if len(calls) == 1:
+            raise NoSuchElementException()  # counts as "not yet"
+        return "ready" if len(calls) >= 3 else None
+
+    assert CancelToken(poll_interval=0.01).until("driver", condition, 5) == "ready"
+    assert calls == ["driver"] * 3
+
+
+def test_until_times_out():
+    with pytest.raises(TimeoutException, match="never"):
+        CancelToken(poll_interval=0.01).until(None, lambda d: None, 0.05, "never")
+
+
+def test_until_stops_within_a_poll_interval():
+    token = CancelToken(poll_interval=0.1)
+    cancel_after(token, 0.05)
+    start = time.monotonic()
+    with pytest.raises(Cancelled):
+        token.until(None, lambda d: None, 30)
+    assert time.monotonic() - start < LATENCY
+
+
+def test_cancelled_is_not_an_exception():
+    # The run's many ``except Exception`` blocks must let a stop through
+    assert not issubclass(Cancelled, Exception)
+
+
+class FakeDriver:
+    """Stands in for a WebDriver; ``probe`` is what window_handles does."""
+
+    def __init__(self, probe):
+        self.probe = probe
+
+    @property
+    def window_handles(self):
+        return self.probe()
+
+
+def monitor(probe, slow_after=0.1):
+    return DriverMonitor(FakeDriver(probe), on_change=lambda state, detail: None, slow_after=slow_after)
+
+
+def raise_(error):
+    def probe():
+        raise error
+
+    return probe
+
+
+def test_monitor_alive():
+    assert monitor(lambda: ["window"]).check() == ("alive", None)
+
+
+def test_monitor_closed_when_browser_is_gone():
+    assert monitor(lambda: []).check()[0] == "closed"
+    assert monitor(raise_(NoSuchWindowException("window closed"))).check()[0] == "closed"
+    assert monitor(raise_(MaxRetryError(None, "/session", ConnectionRefusedError()))).check()[0] == "closed"
+    assert monitor(raise_(ConnectionRefusedError())).check()[0] == "closed"
+
+
+def test_monitor_timeouts_are_unresponsive():
+    read_timeout = ReadTimeoutError(None, "/session", "read timed out")
+    assert monitor(raise_(read_timeout)).check()[0] == "unresponsive"
+    assert monitor(raise_(MaxRetryError(None, "/session", read_timeout))).check()[0] == "unresponsive"
+    assert monitor(raise_(TimeoutError())).check()[0] == "unresponsive"
+    assert monitor(raise_(TimeoutException("slow"))).check()[0] == "unresponsive"
+
+
+def test_monitor_reports_a_hung_probe_without_blocking():
+    release = threading.Event()
+    calls = []
+
+    def probe():
+        calls.append(1)
+        release.wait(5)
+        return ["window"]
+
+    m = monitor(probe, slow_after=0.1)
+    start = time.monotonic()
+    assert m.check()[0] == "unresponsive"
+    assert m.check()[0] == "unresponsive"
+    assert time.monotonic() - start < 1.0
+    assert len(calls) == 1  # no second probe while the first is in flight
+    release.set()
+    time.sleep(0.05)
+    assert m.check()[0] == "unresponsive"  # it answered, but late
+    assert m.check() == ("alive", None)
+    assert len(calls) == 2
@@ -0,0 +1,52 @@
+import pytest
+
+from game_trace import GameTrace, Replayer, load_trace
+from solver import (
+    LetterFrequencyAnalyzer,
+    LookaheadSearch,
+    WordleSolver,
+    dictionary_path,
+    load_index,
+    play_game,
+    score_feedback,
+    states_from_feedback,
+)
+
+# A time budget the search never reaches, so replays are deterministic
+STRATEGY = {"name": "lookahead", "objective": "expected", "time_budget": 60.0}
+
+
+def record(answer, strategy):
+    """Play ``answer`` offline the way run_solver would and return its trace."""
+    index = load_index()
+    analyzer = LetterFrequencyAnalyzer(dictionary_path())
+    analyzer.analyze()
+    solver = WordleSolver(index.words, index=index)
+    search = LookaheadSearch(index, objective=strategy["objective"], time_budget=strategy["time_budget"])
+    trace = GameTrace(strategy=strategy)
+    guesses = play_game(answer, solver, analyzer, search=search, hard_mode=strategy.get("hard_mode", False))
+    for guess in guesses:
+        trace.add_row(guess, states_from_feedback(score_feedback(guess, answer)))
+    return trace
+
+
+@pytest.mark.parametrize("answer", ["scull", "souks"])
+def test_replay_hard_mode_trace(answer, tmp_path):
+    trace = record(answer, {**STRATEGY, "hard_mode": True})
+    trace = load_trace(trace.save(str(tmp_path)))
+    result = Replayer().replay(trace)
+    assert result["mismatches"] == []
+    assert result["rows"] == len(trace.rows)
+
+
+@pytest.mark.parametrize("answer", ["scull", "souks"])
+def test_replay_hard_mode_differs_from_normal(answer):
+    # Guard for the test above: these games only replay if Hard Mode is honoured
+    hard = record(answer, {**STRATEGY, "hard_mode": True})
+    hard.strategy = dict(STRATEGY)
+    assert Replayer().replay(hard)["mismatches"]
+
+
+def test_replay_normal_trace():
+    trace = record("scull", STRATEGY)
+    assert Replayer().replay(trace)["mismatches"] == []
@@ -0,0 +1,53 @@
+import time
+
+from game_trace import GameTrace
+from history import RunHistory, connect, insert_run
+
+
+def make_trace(started, solution="crane"):
+    trace = GameTrace(meta={"app_version": "test"})
+    trace.started = started
+    trace.add_row("arose", ["present", "present", "absent", "absent", "correct"], candidates=12)
+    trace.add_row(solution, ["correct"] * 5, candidates=1)
+    trace.mark("page_load")
+    trace.solution = solution
+    trace.solved = True
+    return trace
+
+
+def count(path, table):
+    conn = connect(path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_full_batches_are_written_at_once_and_the_rest_on_close(tmp_path):
+    path = str(tmp_path / "history.sqlite3")
+    history = RunHistory(path, batch_size=3, flush_interval=30)
+    for n in range(7):
+        history.record(make_trace(1000.0 + n))
+
+    deadline = time.monotonic() + 5
+    while history.written < 6 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Two full batches went out; the last run waits for more (or for the flush interval)
+    assert history.written == 6
+    assert count(path, "runs") == 6
+
+    history.close()
+    assert history.written == 7
+    assert count(path, "runs") == 7
+    assert count(path, "guesses") == 14
+
+
+def test_insert_run_ignores_a_run_already_stored(tmp_path):
+    conn = connect(str(tmp_path / "history.sqlite3"))
+    run = make_trace(1234.5).to_dict()
+    assert insert_run(conn, run) is not None
+    assert insert_run(conn, run) is None
+    assert conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM guesses").fetchone()[0] == 2
+    assert conn.execute("SELECT COUNT(*) FROM phases WHERE row IS NULL").fetchone()[0] == 1
+    conn.close()
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from solver import ResourcePreloader
+
+WORDS = ["crane", "slate", "pious", "madam", "there"]
+
+
+def write_words(path, words, bump=0):
+    path.write_text("\n".join(words) + "\n", encoding="utf-8")
+    if bump:  # make the change visible even on coarse mtime clocks
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump * 10**9))
+
+
+def test_resources_are_reused_until_the_file_changes(tmp_path):
+    path = tmp_path / "words.txt"
+    write_words(path, WORDS)
+    preloader = ResourcePreloader(str(path))
+
+    first = preloader.get(timeout=10)
+    assert preloader.get(timeout=10) is first
+    assert preloader.start() is preloader.start()
+    assert preloader.loads == 1
+    assert first.words == WORDS and first.solver.index is first.index
+
+    write_words(path, WORDS + ["eerie"], bump=1)
+    second = preloader.get(timeout=10)
+    assert second is not first
+    assert preloader.loads == 2
+    assert "eerie" in second.words
+
+
+def test_failed_load_is_retried(tmp_path):
+    path = tmp_path / "words.txt"
+    preloader = ResourcePreloader(str(path))
+    with pytest.raises(FileNotFoundError):
+        preloader.get(timeout=10)
+
+    write_words(path, WORDS)
+    assert preloader.get(timeout=10).words == WORDS
+    assert preloader.loads == 1
+
+
+def test_deleted_file_fails_the_reload_not_the_caller(tmp_path):
+    path = tmp_path / "words.txt"
+    write_words(path, WORDS)
+    preloader = ResourcePreloader(str(path))
+    preloader.get(timeout=10)
+
+    os.remove(path)
+    future = preloader.start()  # must not raise
+    assert isinstance(future.exception(timeout=10), FileNotFoundError)
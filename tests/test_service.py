@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+import requests
+
+from service import SolverClient, SolverService, make_server, parse_rows
+from solver import LetterFrequencyAnalyzer, choose_guess, dictionary_path, load_index
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = SolverService(lengths=(5,))
+    yield service
+    service.close()
+
+
+@pytest.fixture(scope="module")
+def url(service):
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_next_guess_matches_direct_solve(url):
+    index = load_index()
+    analyzer = LetterFrequencyAnalyzer(dictionary_path())
+    analyzer.analyze()
+    rows = [{"guess": "arose", "feedback": "bybbg"}]
+    (row,) = parse_rows(rows)
+    mask = index.consistent_mask(index.full_mask, row.guess, row.code)
+    expected = choose_guess(index.words_of(mask), analyzer)
+
+    client = SolverClient(url)
+    first = client.next_guess(rows)
+    assert first == {"guess": expected, "candidates": mask.bit_count(), "cached": False}
+    assert client.next_guess(rows)["cached"]
+
+
+def test_concurrent_requests_are_batched(service, url):
+    rows = [[{"guess": "crane", "feedback": fb}] for fb in ("bbbbb", "gbbbb", "bybbb", "bbgbb", "bbbyb", "bbbbg")]
+    barrier = threading.Barrier(len(rows))
+    replies = [None] * len(rows)
+
+    def ask(i):
+        client = SolverClient(url)
+        barrier.wait()
+        replies[i] = client.next_guess(rows[i])
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in range(len(rows))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(30)
+    assert all(reply and "guess" in reply for reply in replies)
+    stats = SolverClient(url).stats()
+    assert stats["batches"] >= 1 and stats["latency_ms"]["p50"] > 0
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"rows": [{"guess": "abc", "feedback": "bbb"}]},
+        {"rows": [{"guess": "arose", "feedback": "bzbbg"}]},
+        {"rows": [{"guess": "arose", "feedback": "byb"}]},
+        {"rows": [], "strategy": "random"},
+        {"rows": [], "length": "five"},
+        {"rows": [], "length": 7},
+        {"rows": "arose"},
+    ],
+)
+def test_malformed_request_is_rejected(url, payload):
+    response = requests.post(f"{url}/next-guess", json=payload, timeout=10)
+    assert response.status_code == 400
+    assert response.json()["error"]
+
+
+def test_invalid_json_is_rejected(url):
+    response = requests.post(f"{url}/next-guess", data=b"{not json", timeout=10)
+    assert response.status_code == 400
@@ -0,0 +1,55 @@
+import socket
+import threading
+
+import pytest
+
+from single_instance import SingleInstance
+
+
+@pytest.fixture
+def port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_second_launch_shows_the_first(port):
+    first = SingleInstance("test-app", port)
+    assert first.acquire()
+    shown = threading.Event()
+    first.serve(shown.set)
+    try:
+        second = SingleInstance("test-app", port)
+        assert not second.acquire()
+        assert second.notify_running()
+        assert shown.wait(2)
+    finally:
+        first.release()
+    # The port is free again once the first instance lets go
+    third = SingleInstance("test-app", port)
+    assert third.acquire()
+    third.release()
+
+
+def test_nothing_listening(port):
+    assert not SingleInstance("test-app", port).notify_running(timeout=0.5)
+
+
+def test_foreign_listener_is_not_mistaken_for_an_instance(port):
+    server = socket.create_server(("127.0.0.1", port))
+
+    def answer():
+        conn, _ = server.accept()
+        with conn:
+            conn.makefile("rb").readline()
+            conn.sendall(b"something-else\n")
+
+    thread = threading.Thread(target=answer, daemon=True)
+    thread.start()
+    try:
+        instance = SingleInstance("test-app", port)
+        assert not instance.acquire()
+        assert not instance.notify_running()
+    finally:
+        thread.join(2)
+        server.close()
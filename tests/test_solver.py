@@ -0,0 +1,105 @@
+import os
+import random
+import threading
+
+import pytest
+
+from solver import (
+    FILTER_BACKENDS,
+    FilterConstraints,
+    GameState,
+    TrieFilter,
+    WordFilter,
+    dictionary_path,
+    load_index,
+    load_words,
+    metrics,
+    score_feedback,
+)
+
+
+def test_word_filter_writes_where_the_loader_reads(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text("crane\nPlanet\nbridge\nabc\n", encoding="utf-8")
+    WordFilter(str(source), dictionary_path(6, str(tmp_path)), length=6).filter_and_save()
+    assert load_words(6, dictionary_path(6, str(tmp_path))) == ["bridge", "planet"]
+
+
+def test_word_filter_keeps_existing_list_without_matches(tmp_path):
+    source = tmp_path / "words.txt"
+    source.write_text("crane\n", encoding="utf-8")
+    target = dictionary_path(7, str(tmp_path))
+    with open(target, "w", encoding="utf-8") as f:
+        f.write("example\n")
+    WordFilter(str(source), target, length=7).filter_and_save()
+    assert load_words(7, target) == ["example"]
+
+
+def test_shipped_six_letter_list():
+    assert os.path.exists(dictionary_path(6))
+    index = load_index(6)
+    assert len(index) > 500
+    assert all(len(w) == 6 for w in index.words)
+
+
+STAGES = ("known_positions", "unknown_positions", "excluded_letters")
+
+
+def stage_counts(backend, constraints, among=None):
+    metrics.reset()
+    backend.filter(constraints, among)
+    return {stage: metrics.last.get(stage) for stage in STAGES}
+
+
+@pytest.mark.parametrize(
+    "guess, answer",
+    [("crane", "slate"), ("eerie", "there"), ("lares", "pious"), ("mamma", "madam")],
+)
+def test_every_backend_records_the_same_stages(guess, answer):
+    index = load_index()
+    state = GameState()
+    state.update_from_feedback(guess, score_feedback(guess, answer))
+    constraints = FilterConstraints.from_clues(state.known_pattern, state.unknowns, state.excluded_letters)
+    among = index.words[::7]
+    metrics.detailed = True
+    try:
+        for subset in (None, among):
+            counts = [stage_counts(cls(index), constraints, subset) for cls in FILTER_BACKENDS.values()]
+            assert counts[0]["known_positions"] is not None
+            assert all(c == counts[0] for c in counts)
+    finally:
+        metrics.detailed = False
+
+
+def test_trie_skips_stage_sizes_by_default():
+    index = load_index()
+    constraints = FilterConstraints.from_clues(["c", None, None, None, None], [], ["z"])
+    assert stage_counts(TrieFilter(index), constraints) == dict.fromkeys(STAGES)
+
+
+def test_metrics_record_is_thread_safe():
+    metrics.reset()
+
+    def work():
+        for _ in range(10000):
+            metrics.record("threads", 1)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert metrics.snapshot()["totals"]["threads"] == 40000
+
+
+def test_backends_return_index_order_for_a_shuffled_subset():
+    index = load_index()
+    state = GameState()
+    state.update_from_feedback("crane", score_feedback("crane", "slate"))
+    constraints = FilterConstraints.from_clues(state.known_pattern, state.unknowns, state.excluded_letters)
+    among = index.words[::3]
+    random.Random(1).shuffle(among)
+    among.append("zzzzz" if "zzzzz" not in index.position else "qqqqq")  # not in the index: ignored
+    results = [cls(index).filter(constraints, among) for cls in FILTER_BACKENDS.values()]
+    assert results[0] == sorted(results[0], key=index.position.__getitem__)
+    assert all(r == results[0] for r in results)
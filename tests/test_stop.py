@@ -0,0 +1,96 @@
+"""Stop button latency against the mock page (needs Chrome and the GUI's dependencies)."""
+import queue
+import random
+import threading
+import time
+import types
+
+import pytest
+
+# Stop must take the solver thread back to idle in about 100 ms
+LATENCY = 0.1
+
+
+@pytest.fixture(scope="module")
+def site():
+    import mock_site
+
+    server, base_url = mock_site.start_in_background()
+    yield base_url
+    server.shutdown()
+
+
+def start_chrome():
+    from selenium import webdriver
+    from selenium.common.exceptions import WebDriverException
+
+    from browser import block_urls, chrome_options, install_overlay_watcher
+
+    try:
+        driver = webdriver.Chrome(options=chrome_options(lean=True, headless=True))
+    except WebDriverException as e:
+        pytest.skip(f"Chrome not available: {e.msg}")
+    block_urls(driver)
+    install_overlay_watcher(driver)
+    return driver
+
+
+class Button:
+    def __init__(self):
+        self.options = {}
+
+    def config(self, options=None, **kw):
+        self.options.update(options or {}, **kw)
+
+
+def fake_app(main, driver, token, thread):
+    """The attributes WordleApp.stop_solver and _finish_stop use, with the real methods bound."""
+    app = types.SimpleNamespace(
+        running=True,
+        driver=driver,
+        driver_monitor=None,
+        cancel_token=token,
+        thread=thread,
+        start_button=Button(),
+        ui_queue=queue.Queue(),
+        logs=[],
+    )
+    app.add_log = lambda message, debug_message=False: app.logs.append(message)
+    app.post_to_ui = lambda func, *args: app.ui_queue.put((func, args))
+    for name in ("stop_solver", "_finish_stop", "_quit_driver", "stop_driver_monitor"):
+        setattr(app, name, types.MethodType(getattr(main.WordleApp, name), app))
+    return app
+
+
+def test_stop_returns_to_idle_quickly(site):
+    import mock_site
+    from batch_solver import play_page
+    from browser import CancelToken
+    from solver import LetterFrequencyAnalyzer, WordleSolver, dictionary_path, load_index
+
+    driver = start_chrome()
+    main = pytest.importorskip("main")
+    index = load_index()
+    solver = WordleSolver(index.words, index=index)
+    analyzer = LetterFrequencyAnalyzer(dictionary_path())
+    analyzer.analyze()
+
+    token = CancelToken()
+    url = mock_site.page_url(site, random.Random(1).choice(index.words), reveal_ms=2000)
+    worker = threading.Thread(target=play_page, args=(driver, url, solver, analyzer, 30, 6, token))
+    app = fake_app(main, driver, token, worker)
+    worker.start()
+    worker.join(1.0)
+    assert worker.is_alive(), "game ended before Stop was pressed"
+
+    app.stop_solver()
+    assert app.start_button.options == {"text": "Stopping...", "state": "disabled"}
+    worker.join(main.STOP_TIMEOUT)
+    assert not worker.is_alive()
+    assert time.monotonic() - token.cancelled_at < LATENCY
+
+    # _finish_stop quits the driver, then hands the Start button back to the Tk thread
+    func, args = app.ui_queue.get(timeout=main.STOP_GRACE + main.STOP_TIMEOUT)
+    func(*args)
+    assert app.start_button.options == {"text": "Start", "state": "normal"}
+    assert app.driver is None and app.thread is None